@@ -1,11 +1,50 @@
+import json
+import math
 import os
 import requests
-from flask import Flask, request, jsonify, render_template
+from pathlib import Path
+from flask import Flask, Response, request, jsonify, render_template
 from flask_cors import CORS
+from werkzeug.formparser import parse_form_data
+from werkzeug.utils import secure_filename
+from bulk import BulkError, BulkScorer, load_codebook
+from tracing import Tracer
+from upstream import CircuitBreaker, CircuitOpen, UpstreamClient
 
 # FastAPI inference endpoint
 MODEL_ENDPOINT = os.environ.get("MODEL_ENDPOINT", "http://localhost:8080/predict")
 
+# Upstream client: keep-alive connections per worker process (match the worker's threads),
+# timeouts in seconds, extra attempts after a connection error or 502/504, and the circuit breaker
+upstream = UpstreamClient(
+    pool_size=int(os.environ.get("UPSTREAM_POOL_SIZE", os.environ.get("FRONTEND_THREADS", "64"))),
+    connect_timeout=float(os.environ.get("UPSTREAM_CONNECT_TIMEOUT_S", "0.5")),
+    read_timeout=float(os.environ.get("UPSTREAM_READ_TIMEOUT_S", "5")),
+    retries=int(os.environ.get("UPSTREAM_RETRIES", "2")),
+    backoff=float(os.environ.get("UPSTREAM_RETRY_BACKOFF_S", "0.05")),
+    breaker=CircuitBreaker(
+        failure_threshold=int(os.environ.get("BREAKER_FAILURE_THRESHOLD", "5")),
+        reset_timeout=float(os.environ.get("BREAKER_RESET_TIMEOUT_S", "5")),
+    ),
+)
+
+# CSV upload: rows per upstream call, the V2 infer endpoint it calls, the longest record, and the directory
+# holding the training pipeline's codebook.py (phase-1-local-dev/src; copied into the image)
+bulk = BulkScorer(
+    load_codebook(Path(os.environ.get("PIPELINE_SRC_DIR", Path(__file__).resolve().parents[1] / "src")) / "codebook.py"),
+    upstream,
+    os.environ.get("BULK_ENDPOINT", MODEL_ENDPOINT.rsplit("/predict", 1)[0] + "/v2/models/employee-attrition/infer"),
+    chunk_rows=int(os.environ.get("BULK_CHUNK_ROWS", "10000")),
+    max_record_bytes=int(os.environ.get("BULK_MAX_RECORD_BYTES", "65536")),
+)
+
+# Tracing: console (stderr), file:<path> or none
+tracer = Tracer(
+    "frontend",
+    os.environ.get("TRACE_EXPORTER", "console"),
+    float(os.environ.get("TRACE_SAMPLE_RATE", "1.0")),
+)
+
 app = Flask(__name__)
 CORS(app)
 
@@ -17,42 +56,100 @@ def index():
 
 @app.route('/predict', methods=['POST'])
 def predict():
-    data = request.get_json(force=True)
-    print('incoming-data: ', data)
+    with tracer.start_span("POST /predict", request.headers.get("traceparent")) as span:
+        try:
+            with span.child("parse"):
+                data = request.get_json(force=True)
+                app.logger.debug('incoming-data: %s', data)
+
+                payload = {
+                    "years_at_company":     float(data["Years at Company"]),
+                    "performance_rating":   float(data["Performance Rating"]),
+                    "no_of_promotions":     int(data["Number of Promotions"]),
+                    "overtime":             int(data["Overtime"]),
+                    "edu_level":            int(data["Education Level"]),
+                    "no_of_dependents":     int(data["Number of Dependents"]),
+                    "job_level":            int(data["Job Level"]),
+                    "company_size":         int(data["Company Size"]),
+                    "company_tenure":       float(data["Company Tenure"]),
+                    "remote_work":          int(data["Remote Work"]),
+                    "company_reputation":   float(data["Company Reputation"]),
+                    "overall_satisfaction": float(data["OverallSatisfaction"]),
+                    "opportunities":        float(data["Opportunities"]),
+                    "annual_income":        int(data["AnnualIncome"]),
+                    "age_group":            int(data["AgeGroup"]),
+                }
+
+            # the inference service continues this trace from the traceparent header
+            with span.child("upstream", **{"http.url": MODEL_ENDPOINT}) as child:
+                headers = {"Content-Type": "application/json"}
+                traceparent = child.traceparent()
+                if traceparent:
+                    headers["traceparent"] = traceparent
+                resp = upstream.post(MODEL_ENDPOINT, json.dumps(payload).encode(), headers)
+                child.attributes["http.status_code"] = resp.status_code
+
+            # inference service is shedding load: ask the browser to retry later
+            if resp.status_code in (429, 503):
+                span.attributes["error"] = "upstream overloaded"
+                return jsonify({"error": "Prediction service is busy, please retry shortly"}), 503, \
+                    {"Retry-After": resp.headers.get("Retry-After", "1")}
+            resp.raise_for_status()
+
+            # FastAPI returns the final shape — relay its bytes without decoding them
+            with span.child("respond"):
+                return Response(resp.content, status=resp.status_code, mimetype="application/json")
+
+        except CircuitOpen as e:
+            span.attributes["error"] = "circuit open"
+            return jsonify({"error": "Prediction service is unavailable, please retry shortly"}), 503, \
+                {"Retry-After": str(math.ceil(e.retry_after))}
+        except requests.Timeout:
+            span.attributes["error"] = "upstream timeout"
+            return jsonify({"error": "Prediction service timed out"}), 504
+        except requests.ConnectionError as e:
+            span.attributes["error"] = str(e)
+            return jsonify({"error": "Prediction service is unreachable"}), 502
+        except Exception as e:
+            span.attributes["error"] = str(e)
+            return jsonify({"error": str(e)}), 400
 
+
+@app.route('/predict/bulk', methods=['POST'])
+def predict_bulk():
+    """Score a CSV in the raw dataset schema, sent as the body or as the multipart field 'file'.
+
+    The scored CSV is streamed back chunk by chunk while the upload is still being read.
+    """
+    if request.mimetype == "multipart/form-data":
+        # parsed apart from request.files, which are closed as soon as this view returns
+        _, _, files = parse_form_data(request.environ)
+        upload = files.get("file")
+        if upload is None:
+            return jsonify({"error": "no 'file' field in the upload"}), 400
+        filename = Path(secure_filename(upload.filename or "") or "upload.csv").stem + "-scored.csv"
+    else:
+        upload, filename = request.stream, "scored.csv"
+
+    span = tracer.start_span("POST /predict/bulk", request.headers.get("traceparent"))
     try:
-        # Compute derived features
-        yac = float(data["Years at Company"])
-        ct  = float(data["Company Tenure"])
-        jl  = int(data["Job Level"])
-
-        payload = {
-            "years_at_company":     yac,
-            "performance_rating":   float(data["Performance Rating"]),
-            "no_of_promotions":     int(data["Number of Promotions"]),
-            "overtime":             int(data["Overtime"]),
-            "edu_level":            int(data["Education Level"]),
-            "no_of_dependents":     int(data["Number of Dependents"]),
-            "job_level":            jl,
-            "company_size":         int(data["Company Size"]),
-            "company_tenure":       ct,
-            "remote_work":          int(data["Remote Work"]),
-            "company_reputation":   float(data["Company Reputation"]),
-            "overall_satisfaction": float(data["OverallSatisfaction"]),
-            "opportunities":        float(data["Opportunities"]),
-            "annual_income":        int(data["AnnualIncome"]),
-            "age_group":            int(data["AgeGroup"]),
-        }
-
-        resp = requests.post(MODEL_ENDPOINT, json=payload, timeout=10)
-        resp.raise_for_status()
-
-        # FastAPI returns the final shape — pass through directly
-        return jsonify(resp.json())
-
-    except Exception as e:
+        chunks = bulk.score_csv(upload, span)
+    except BulkError as e:
         return jsonify({"error": str(e)}), 400
+    return Response(chunks, mimetype="text/csv",
+                    headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+@app.route('/stats/upstream')
+def upstream_stats():
+    return jsonify(upstream.stats())
+
+
+@app.route('/stats/bulk')
+def bulk_stats():
+    return jsonify(bulk.stats())
 
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=False)
\ No newline at end of file
+    # development only; the image runs gunicorn (gunicorn.conf.py)
+    app.run(host="0.0.0.0", port=5000, debug=False, threaded=True)
\ No newline at end of file
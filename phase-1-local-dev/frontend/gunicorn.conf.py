@@ -0,0 +1,17 @@
+# Frontend server: gunicorn with threaded workers.
+#
+#   gunicorn -c gunicorn.conf.py app:app
+#
+# A request spends nearly all its time waiting on the inference service, so
+# each worker serves up to FRONTEND_THREADS requests at once on threads; a slow
+# inference call holds one thread, not the worker. Each worker process has its
+# own upstream connection pool, sized to its threads (UPSTREAM_POOL_SIZE).
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+worker_class = "gthread"
+threads = int(os.environ.get("FRONTEND_THREADS", "64"))
+timeout = int(os.environ.get("WORKER_TIMEOUT", "30"))
+graceful_timeout = int(os.environ.get("WORKER_GRACEFUL_TIMEOUT", "20"))
+keepalive = 5
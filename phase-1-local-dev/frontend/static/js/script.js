@@ -6,13 +6,7 @@ document.getElementById('prediction-form').addEventListener('submit', async (e)
 
     formData.forEach((val, key) => data[key] = Number(val));
 
-    const yearsAtCompany = data['Years at Company'];
-    const companyTenure = data['Company Tenure'];
-
-    data["RoleStagnationRatio"] = Number((yearsAtCompany / (companyTenure + 1)).toFixed(3));
-    data["TenureGap"] = Number((companyTenure - yearsAtCompany).toFixed(2));
-    data["EarlyCompanyTenureRisk"] = yearsAtCompany <= 2 ? 1 : 0;
-    data["LongTenureLowRoleRisk"] = (companyTenure > 5 && data["Job Level"] <= 2) ? 1 : 0;
+    // derived features are computed by the inference service
 
     const showResult = document.getElementById("result");
 
@@ -68,3 +62,58 @@ document.getElementById('prediction-form').addEventListener('submit', async (e)
         showResult.innerHTML = `<p class="text-danger text-center">Prediction failed: ${error.message}</p>`;
     }
 });
+
+// Bulk scoring: the scored CSV streams back while the file uploads, one line per row
+document.getElementById('bulk-form').addEventListener('submit', async (e) => {
+    e.preventDefault();
+
+    const file = document.getElementById('bulkFile').files[0];
+    const progress = document.getElementById('bulk-progress');
+    const bar = progress.querySelector('.progress-bar');
+    const status = document.getElementById('bulk-status');
+
+    // estimate the row count from the line length of the first 64 KB
+    const sample = new Uint8Array(await file.slice(0, 65536).arrayBuffer());
+    const sampleLines = sample.reduce((n, b) => n + (b === 10), 0) || 1;
+    const estimatedRows = Math.max(1, Math.round(file.size * sampleLines / sample.length) - 1);
+
+    progress.style.display = 'flex';
+    bar.style.width = '0%';
+    status.innerHTML = '';
+
+    try {
+        const response = await fetch('/predict/bulk', {
+            method: 'POST',
+            headers: {'Content-Type': 'text/csv'},
+            body: file
+        });
+
+        if (!response.ok) {
+            const result = await response.json();
+            throw new Error(result.error || response.statusText);
+        }
+
+        const reader = response.body.getReader();
+        const parts = [];
+        let lines = 0;
+        while (true) {
+            const {done, value} = await reader.read();
+            if (done) break;
+            parts.push(value);
+            lines += value.reduce((n, b) => n + (b === 10), 0);
+            const rows = Math.max(0, lines - 1);
+            bar.style.width = `${Math.min(100, 100 * rows / estimatedRows).toFixed(1)}%`;
+            status.innerHTML = `<small>${rows.toLocaleString()} rows scored</small>`;
+        }
+        bar.style.width = '100%';
+
+        const url = URL.createObjectURL(new Blob(parts, {type: 'text/csv'}));
+        const name = file.name.replace(/\.csv$/i, '') + '-scored.csv';
+        status.innerHTML = `<small>${Math.max(0, lines - 1).toLocaleString()} rows scored.</small>
+            <a class="btn btn-success btn-sm ms-2" href="${url}" download="${name}">Download ${name}</a>`;
+    } catch (error) {
+        console.error("Bulk scoring error:", error);
+        progress.style.display = 'none';
+        status.innerHTML = `<p class="text-danger">Scoring failed: ${error.message}</p>`;
+    }
+});
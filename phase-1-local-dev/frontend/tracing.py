@@ -0,0 +1,115 @@
+"""Request spans for the frontend, exported as JSON lines.
+
+The frontend side of the inference service's ``src/tracing.py``. It writes
+the same JSON fields and uses the same ``TRACE_EXPORTER`` values. The
+``upstream`` span is passed to the inference service as a W3C
+``traceparent`` header, so both services' spans join into one trace.
+"""
+import json
+import random
+import sys
+import threading
+import time
+
+_EPOCH_OFFSET = time.time() - time.perf_counter()
+
+
+class Span:
+    def __init__(self, tracer, name, trace_id, parent_id=None, attributes=None):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.attributes = attributes or {}
+        self.start = None
+
+    def child(self, name, **attributes):
+        return Span(self.tracer, name, self.trace_id, self.span_id, attributes)
+
+    def traceparent(self):
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        if exc is not None:
+            self.attributes["error"] = repr(exc)
+        self.tracer.export({
+            "service":        self.tracer.service,
+            "name":           self.name,
+            "trace_id":       self.trace_id,
+            "span_id":        self.span_id,
+            "parent_span_id": self.parent_id,
+            "start_time":     round(self.start + _EPOCH_OFFSET, 6),
+            "duration_ms":    round((end - self.start) * 1000, 3),
+            "attributes":     self.attributes,
+        })
+
+
+class _NoopSpan:
+    """Returned for unsampled requests so call sites need no branches."""
+
+    @property
+    def attributes(self):
+        # a fresh dict each time: NOOP_SPAN is shared, so writes must not accumulate
+        return {}
+
+    def child(self, name, **attributes):
+        return self
+
+    def traceparent(self):
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    def __init__(self, service, exporter="console", sample_rate=1.0):
+        self.service = service
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        if exporter == "none":
+            self._out = None
+        elif exporter == "console":
+            self._out = sys.stderr
+        elif exporter.startswith("file:"):
+            self._out = open(exporter[len("file:"):], "a", buffering=1)
+        else:
+            raise ValueError(f"TRACE_EXPORTER must be console, file:<path> or none, got {exporter!r}")
+
+    def start_span(self, name, traceparent=None):
+        """Continue an incoming ``traceparent`` or start a new sampled trace."""
+        if self._out is None:
+            return NOOP_SPAN
+        parts = (traceparent or "").strip().split("-")
+        if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16 and len(parts[3]) == 2:
+            try:
+                sampled = int(parts[3], 16) & 1
+            except ValueError:
+                sampled = None
+            if sampled is not None:
+                return Span(self, name, parts[1], parts[2]) if sampled else NOOP_SPAN
+        if random.random() < self.sample_rate:
+            return Span(self, name, _new_id(16))
+        return NOOP_SPAN
+
+    def export(self, span):
+        line = json.dumps(span, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._out.write(line)
+            self._out.flush()
+
+
+def _new_id(n_bytes):
+    return f"{random.getrandbits(n_bytes * 8):0{n_bytes * 2}x}"
@@ -0,0 +1,143 @@
+"""Pooled HTTP client for the inference service, with retries and a circuit breaker.
+
+One ``requests.Session`` per process keeps up to ``pool_size`` keep-alive
+connections, so a click reuses an open connection instead of doing a TCP
+handshake each time. On top of it:
+
+- separate connect and read timeouts;
+- at most ``retries`` extra attempts, after a connection error or a 502/504
+  only, with full-jitter exponential backoff. Read timeouts and the
+  service's own 429/503 load shedding are not retried, because retrying
+  would add load to a service that is already slow;
+- a circuit breaker that, after ``failure_threshold`` consecutive failures,
+  fails calls at once for ``reset_timeout`` seconds and then lets one trial
+  call through.
+"""
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = {502, 504}
+
+
+class CircuitOpen(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"inference service unavailable, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """closed -> (failure_threshold consecutive failures) -> open -> (reset_timeout) -> half-open -> closed/open."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 5.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False   # a half-open trial call is in flight
+        self.opened = 0       # times the breaker has opened
+        self.rejected = 0     # calls failed fast while open
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def before_call(self):
+        """Raise CircuitOpen unless the call may go ahead."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining <= 0 and not self._trial:
+                self._trial = True
+                return
+            self.rejected += 1
+            raise CircuitOpen(max(remaining, 0.1))
+
+    def record(self, ok: bool):
+        with self._lock:
+            self._trial = False
+            if ok:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    self.opened += 1
+                self._opened_at = time.monotonic()
+
+
+class UpstreamClient:
+    def __init__(self, pool_size: int = 64, connect_timeout: float = 0.5, read_timeout: float = 5.0,
+                 retries: int = 2, backoff: float = 0.05, breaker: CircuitBreaker = None):
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # stats
+        self.calls = 0
+        self.retried = 0
+        self.failures = 0
+
+    def post(self, url: str, data: bytes, headers: dict = None) -> requests.Response:
+        """POST with retries; raises CircuitOpen, or the last requests exception."""
+        self.breaker.before_call()
+        self.calls += 1
+        ok = False
+        try:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    self.retried += 1
+                    # full jitter: uniform in [0, backoff * 2^(attempt-1)]
+                    time.sleep(random.uniform(0, self.backoff * 2 ** (attempt - 1)))
+                try:
+                    resp = self.session.post(url, data=data, headers=headers, timeout=self.timeout)
+                except requests.ConnectionError:
+                    # refused, reset, connect timeout, or a pooled connection the server had closed;
+                    # the request did not complete, and scoring is idempotent
+                    if attempt < self.retries:
+                        continue
+                    raise
+                # a read timeout (the service may still be working on it) or any other error is not retried
+
+                if resp.status_code in RETRY_STATUSES and attempt < self.retries:
+                    resp.close()
+                    continue
+                # 429/503 are the service shedding load: it is up, so they do not trip the breaker
+                ok = resp.status_code < 500 or resp.status_code == 503
+                return resp
+        finally:
+            # every exit resolves the call, so a half-open trial never stays in flight
+            if not ok:
+                self.failures += 1
+            self.breaker.record(ok)
+
+    def stats(self) -> dict:
+        return {
+            "pool_size":        self.pool_size,
+            "connect_timeout":  self.timeout[0],
+            "read_timeout":     self.timeout[1],
+            "max_retries":      self.retries,
+            "calls":            self.calls,
+            "retried":          self.retried,
+            "failures":         self.failures,
+            "breaker_state":    self.breaker.state,
+            "breaker_opened":   self.breaker.opened,
+            "breaker_rejected": self.breaker.rejected,
+        }
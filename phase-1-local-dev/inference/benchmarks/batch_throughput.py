@@ -0,0 +1,38 @@
+"""Compare looping POST /predict against a single POST /predict/batch.
+
+Run from the inference/ directory:
+    python -m benchmarks.batch_throughput --rows 10000
+"""
+import argparse
+import random
+import time
+
+from fastapi.testclient import TestClient
+from benchmarks.data import random_record
+from src.app import app
+
+
+def run(rows: int):
+    rng = random.Random(42)
+    records = [random_record(rng) for _ in range(rows)]
+    client = TestClient(app)
+
+    start = time.perf_counter()
+    for r in records:
+        client.post("/predict", json=r).raise_for_status()
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    client.post("/predict/batch", json={"instances": records}).raise_for_status()
+    batch_s = time.perf_counter() - start
+
+    print(f"Rows:           {rows}")
+    print(f"Loop /predict:  {loop_s:.3f} s  ({rows / loop_s:,.0f} rows/s)")
+    print(f"/predict/batch: {batch_s:.3f} s  ({rows / batch_s:,.0f} rows/s)")
+    print(f"Speedup:        {loop_s / batch_s:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    run(parser.parse_args().rows)
@@ -0,0 +1,89 @@
+"""Cold-start profile: import-time breakdown, time to /ready and time to first prediction.
+
+Run from the inference/ directory:
+    python -m benchmarks.cold_start --runs 5
+    python -m benchmarks.cold_start --imports 20     # top cumulative imports only
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PORT = 8098
+RECORD = {
+    "years_at_company": 3.0, "performance_rating": 3.0, "no_of_promotions": 1, "overtime": 0,
+    "edu_level": 2, "no_of_dependents": 0, "job_level": 2, "company_size": 2, "company_tenure": 5.0,
+    "remote_work": 0, "company_reputation": 3.0, "overall_satisfaction": 3.0, "opportunities": 2.0,
+    "annual_income": 2, "age_group": 2,
+}
+
+
+def import_breakdown(top: int):
+    """Top modules by cumulative import time from ``python -X importtime``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.app"],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = [p.strip() for p in line.replace("import time:", "").split("|")]
+        rows.append((int(cumulative_us), int(self_us), name))
+    total = max(r[0] for r in rows)
+    print(f"import src.app: {total / 1000:.0f} ms")
+    for cumulative, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:8.1f} ms  {self_us / 1000:7.1f} ms self  {name}")
+
+
+def request(method: str, path: str, body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=2)
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+    resp = conn.getresponse()
+    resp.read()
+    return resp.status
+
+
+def one_start() -> tuple:
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.app:app", "--port", str(PORT), "--log-level", "warning"],
+        env=dict(os.environ), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                if request("GET", "/ready") == 200:
+                    break
+            except OSError:
+                pass
+            time.sleep(0.005)
+        ready = time.perf_counter() - start
+        status = request("POST", "/predict", RECORD)
+        first = time.perf_counter() - start
+        if status != 200:
+            raise RuntimeError(f"first prediction failed: HTTP {status}")
+        return ready, first
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--imports", type=int, default=0, help="only print the N slowest imports")
+    args = parser.parse_args()
+
+    if args.imports:
+        import_breakdown(args.imports)
+        sys.exit(0)
+
+    results = [one_start() for _ in range(args.runs)]
+    print(f"time to /ready 200:          median {statistics.median(r[0] for r in results) * 1000:7.0f} ms")
+    print(f"time to first prediction:    median {statistics.median(r[1] for r in results) * 1000:7.0f} ms")
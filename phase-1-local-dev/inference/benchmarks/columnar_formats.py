@@ -0,0 +1,55 @@
+"""Payload size and end-to-end time of JSON vs .npy vs Arrow IPC bulk scoring.
+
+Run from the inference/ directory:
+    python -m benchmarks.columnar_formats --rows 10000
+"""
+import argparse
+import io
+import json
+import random
+import time
+
+import numpy as np
+import pyarrow as pa
+from fastapi.testclient import TestClient
+from benchmarks.data import random_record
+from src.app import app
+from src.columnar import ARROW_TYPE, NPY_TYPE, RAW_FIELDS
+
+
+def encode(records):
+    json_body = json.dumps({"instances": records}).encode()
+
+    npy = io.BytesIO()
+    np.save(npy, np.array([[r[f] for f in RAW_FIELDS] for r in records], dtype=np.float64))
+
+    table = pa.table({f: [r[f] for r in records] for f in RAW_FIELDS})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    return {
+        "json":  ("/predict/batch", "application/json", json_body),
+        "npy":   ("/predict/columnar", NPY_TYPE, npy.getvalue()),
+        "arrow": ("/predict/columnar", ARROW_TYPE, sink.getvalue().to_pybytes()),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    records = [random_record(rng) for _ in range(args.rows)]
+    client = TestClient(app)
+
+    print(f"{'format':6s} {'request':>10s} {'response':>10s} {'time':>10s}")
+    for name, (path, content_type, body) in encode(records).items():
+        client.post(path, content=body, headers={"content-type": content_type}).raise_for_status()
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            resp = client.post(path, content=body, headers={"content-type": content_type})
+        elapsed = (time.perf_counter() - start) / args.repeat
+        print(f"{name:6s} {len(body) / 1024:8.0f}KB {len(resp.content) / 1024:8.0f}KB {elapsed * 1000:8.1f}ms")
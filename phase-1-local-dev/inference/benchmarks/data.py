@@ -0,0 +1,22 @@
+import random
+
+
+def random_record(rng: random.Random) -> dict:
+    yac = round(rng.uniform(0, 10), 2)
+    return {
+        "years_at_company":     yac,
+        "performance_rating":   rng.randint(1, 4),
+        "no_of_promotions":     rng.randint(0, 4),
+        "overtime":             rng.randint(0, 1),
+        "edu_level":            rng.randint(1, 5),
+        "no_of_dependents":     rng.randint(0, 6),
+        "job_level":            rng.randint(1, 3),
+        "company_size":         rng.randint(1, 3),
+        "company_tenure":       round(yac + rng.uniform(0, 10), 2),
+        "remote_work":          rng.randint(0, 1),
+        "company_reputation":   rng.randint(1, 4),
+        "overall_satisfaction": rng.randint(1, 4),
+        "opportunities":        rng.randint(0, 2),
+        "annual_income":        rng.randint(0, 4),
+        "age_group":            rng.randint(1, 5),
+    }
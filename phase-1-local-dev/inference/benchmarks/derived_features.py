@@ -0,0 +1,60 @@
+"""Parity and speed of src.features.build_matrix vs the old per-record derivation.
+
+The old code built one dict per record with Python arithmetic (schemas.py,
+model_testing/predict.py); training used pandas column arithmetic without
+rounding TenureGap. Run from the inference/ directory:
+    python -m benchmarks.derived_features --rows 1000000
+
+The differences it prints are expected. The asserting check that serving
+matches training is src/model_testing/feature_parity.py in the training tree.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+from benchmarks.data import random_record
+from src.features import FEATURE_ORDER, RAW_FIELDS, DERIVED_FEATURES, build_matrix
+
+
+def legacy_row(r: dict) -> list:
+    yac, ct, jl = r["years_at_company"], r["company_tenure"], r["job_level"]
+    return [r[f] for f in RAW_FIELDS] + [
+        round(yac / (ct + 1), 3),
+        round(ct - yac, 2),
+        1 if yac <= 2 else 0,
+        1 if (ct > 5 and jl <= 2) else 0,
+    ]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    records = [random_record(rng) for _ in range(args.rows)]
+    raw = np.array([[r[f] for f in RAW_FIELDS] for r in records], dtype=np.float64)
+
+    legacy, t_legacy = timed(lambda: np.array([legacy_row(r) for r in records], dtype=np.float64))
+    X, t_vector = timed(build_matrix, raw)
+
+    print(f"{args.rows:,} rows")
+    for name in DERIVED_FEATURES:
+        i = FEATURE_ORDER.index(name)
+        diff = np.abs(X[:, i] - legacy[:, i])
+        print(f"  {name:24s} rows differing {np.count_nonzero(diff > 1e-9):7,d}   max |diff| {diff.max():.1e}")
+    print(f"  per-record dicts {t_legacy * 1000:9.1f} ms")
+    print(f"  build_matrix     {t_vector * 1000:9.1f} ms   ({t_legacy / t_vector:.0f}x)")
+
+    one = raw[:1]
+    n = 20000
+    _, t = timed(lambda: [build_matrix(one) for _ in range(n)])
+    _, t_old = timed(lambda: [legacy_row(records[0]) for _ in range(n)])
+    print(f"1 row: build_matrix {t / n * 1e6:.1f} us, per-record {t_old / n * 1e6:.1f} us")
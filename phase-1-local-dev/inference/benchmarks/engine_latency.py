@@ -0,0 +1,61 @@
+"""Single-row and batch latency of the scoring backends: sklearn pickle, NumPy and ONNX Runtime.
+
+Also checks that each backend's probabilities match the sklearn pipeline.
+Run from the inference/ directory (the pickle needs scikit-learn, the
+ONNX model onnxruntime; a backend whose artifact or package is missing is
+skipped):
+    python -m benchmarks.engine_latency
+"""
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+from src.linear_model import LinearModel
+from src.predictor import FEATURE_ORDER
+
+warnings.filterwarnings("ignore")
+
+
+def timeit(fn, X, repeat: int) -> float:
+    fn(X)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(X)
+    return (time.perf_counter() - start) / repeat
+
+
+def load_engines() -> dict:
+    engines = {}
+    try:
+        import joblib
+        engines["sklearn pickle"] = joblib.load("artifacts/model.pkl").predict
+    except ImportError as e:
+        print(f"skipping sklearn pickle: {e}")
+    engines["numpy linear"] = LinearModel.load("artifacts/model.json").predict_proba
+    if Path("artifacts/model.onnx").exists():
+        try:
+            from src.onnx_model import OnnxModel
+            engines["onnxruntime"] = OnnxModel.load(Path("artifacts/model.onnx")).predict_proba
+        except ImportError as e:
+            print(f"skipping onnxruntime: {e}")
+    return engines
+
+
+if __name__ == "__main__":
+    engines = load_engines()
+    rng = np.random.default_rng(42)
+
+    X = rng.uniform(0, 10, size=(10000, len(FEATURE_ORDER)))
+    reference_name, reference = next(iter(engines.items()))
+    expected = reference(X)
+    print(f"--- parity with {reference_name} on 10000 random rows ---")
+    for name, fn in engines.items():
+        print(f"{name:15s} max |dp| {np.abs(fn(X) - expected).max():.2e}")
+
+    for rows, repeat in [(1, 2000), (64, 1000), (1000, 200), (100000, 5)]:
+        X = rng.uniform(0, 10, size=(rows, len(FEATURE_ORDER)))
+        print(f"--- batch of {rows} ---")
+        for name, fn in engines.items():
+            t = timeit(fn, X, repeat)
+            print(f"{name:15s} {t * 1e6:10.1f} us  {t * 1e9 / rows:8.1f} ns/row")
@@ -0,0 +1,50 @@
+"""Cost of explain=true: scoring with and without the top-k contributions.
+
+Times ``Predictor.predict_raw`` (derive + score + result dicts) on random
+rows, plain and with ``top_k`` contributions, and checks that the
+contributions add up to each row's log-odds.
+
+Run from the inference/ directory:
+    python -m benchmarks.explain --top-k 5
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+from benchmarks.data import random_record
+from src.features import build_matrix
+from src.predictor import Predictor
+from src.schemas import EmployeeFeatures
+
+
+def timeit(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    predictor = Predictor()
+    model = predictor.model
+    rng = random.Random(42)
+    rows = [EmployeeFeatures(**random_record(rng)).to_row() for _ in range(10000)]
+
+    X = build_matrix(rows)
+    probs, C = model.explain_fn(X)
+    z = C.sum(axis=1) + model.base_log_odds
+    p_leave = model.predict_fn(X)[:, 1]
+    print(f"max |sigmoid(base + sum(C)) - p_leave|: {np.abs(1 / (1 + np.exp(-z)) - p_leave).max():.2e}")
+
+    print(f"{'rows':>6s} {'plain':>12s} {'explain':>12s} {'overhead':>10s}")
+    for n, repeat in [(1, 2000), (64, 500), (1000, 50), (10000, 5)]:
+        batch = rows[:n]
+        plain = timeit(lambda: predictor.predict_raw(batch), repeat)
+        explained = timeit(lambda: predictor.predict_raw(batch, args.top_k), repeat)
+        print(f"{n:6d} {plain * 1e6:10.1f}us {explained * 1e6:10.1f}us {explained / plain - 1:9.0%}")
@@ -0,0 +1,73 @@
+"""Per-request CPU of JSON handling: FastAPI's generic path vs src/fastjson.py.
+
+For a single /predict body and /predict/batch bodies of 64 and 1000 rows,
+times each step both ways:
+
+- decode:   ``json.loads`` + model validation (what FastAPI does for a
+            declared body) vs ``model_validate_json`` (``json_body``)
+- encode:   response_model validation + pydantic ``dump_json`` vs
+            ``fastjson.dumps`` of the result dicts (``FastJSONResponse``)
+- frontend: ``resp.json()`` + ``jsonify`` (stdlib decode + encode) vs
+            relaying the bytes (nothing to time)
+
+Run from the inference/ directory:
+    python -m benchmarks.json_path
+"""
+import json
+import random
+import time
+
+from pydantic import TypeAdapter
+from benchmarks.data import random_record
+from src import fastjson
+from src.predictor import Predictor
+from src.schemas import BatchPredictionRequest, BatchPredictionResponse, EmployeeFeatures, PredictionResponse
+
+
+def timeit(fn, repeat: int) -> float:
+    fn()
+    start = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - start) / repeat
+
+
+if __name__ == "__main__":
+    print(f"fastjson backend: {'orjson' if fastjson.orjson is not None else 'stdlib'}")
+    predictor = Predictor()
+    rng = random.Random(42)
+
+    print(f"{'rows':>5s} {'step':9s} {'FastAPI':>11s} {'fast path':>11s} {'saved':>11s}")
+    for n in (1, 64, 1000):
+        records = [random_record(rng) for _ in range(n)]
+        results = predictor.predict_raw([EmployeeFeatures(**r).to_row() for r in records])
+        if n == 1:
+            request_model, response_model = EmployeeFeatures, PredictionResponse
+            body, result = json.dumps(records[0]).encode(), results[0]
+        else:
+            request_model, response_model = BatchPredictionRequest, BatchPredictionResponse
+            body, result = json.dumps({"instances": records}).encode(), {"predictions": results}
+        adapter = TypeAdapter(response_model)
+        wire = fastjson.dumps(result)
+        repeat = max(20, 20000 // n)
+
+        steps = [
+            ("decode",
+             lambda: request_model.model_validate(json.loads(body)),
+             lambda: request_model.model_validate_json(body)),
+            ("encode",
+             lambda: adapter.dump_json(adapter.validate_python(result), exclude_none=True),
+             lambda: fastjson.dumps(result)),
+            ("frontend",
+             lambda: json.dumps(json.loads(wire)).encode(),
+             None),
+        ]
+        total_slow = total_fast = 0.0
+        for step, slow, fast in steps:
+            t_slow = timeit(slow, repeat)
+            t_fast = timeit(fast, repeat) if fast is not None else 0.0
+            total_slow += t_slow
+            total_fast += t_fast
+            print(f"{n:5d} {step:9s} {t_slow * 1e6:9.1f}us {t_fast * 1e6:9.1f}us {(t_slow - t_fast) * 1e6:9.1f}us")
+        print(f"{n:5d} {'total':9s} {total_slow * 1e6:9.1f}us {total_fast * 1e6:9.1f}us "
+              f"{(total_slow - total_fast) * 1e6:9.1f}us ({1 - total_fast / total_slow:.0%})")
@@ -0,0 +1,63 @@
+"""Throughput and latency of concurrent single predictions, with and without micro-batching.
+
+Run from the inference/ directory:
+    python -m benchmarks.micro_batching --concurrency 64 --requests 20000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from benchmarks.data import random_record
+from src.batcher import MicroBatcher
+from src.predictor import Predictor
+from src.schemas import EmployeeFeatures
+
+
+async def drive(call, records, concurrency: int):
+    latencies = []
+    it = iter(records)
+
+    async def worker():
+        for record in it:
+            start = time.perf_counter()
+            await call(record)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def report(name, elapsed, latencies):
+    n = len(latencies)
+    print(f"{name:28s} {n / elapsed:9,.0f} req/s   "
+          f"p50 {statistics.median(latencies) * 1000:6.2f} ms   "
+          f"p99 {latencies[int(n * 0.99)] * 1000:6.2f} ms")
+
+
+async def main(concurrency: int, requests: int, window_ms: float, max_size: int):
+    rng = random.Random(42)
+    predictor = Predictor()
+    records = [EmployeeFeatures(**random_record(rng)).to_row() for _ in range(requests)]
+
+    async def unbatched(record):
+        return (await asyncio.to_thread(predictor.predict_raw, [record]))[0]
+
+    report("thread per request", *await drive(unbatched, records, concurrency))
+
+    batcher = MicroBatcher(predictor.predict_raw, window_ms, max_size)
+    report(f"micro-batch ({window_ms} ms, {max_size})", *await drive(batcher.submit, records, concurrency))
+    await batcher.close()
+    print(batcher.stats())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--max-size", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.requests, args.window_ms, args.max_size))
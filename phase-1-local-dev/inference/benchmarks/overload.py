@@ -0,0 +1,99 @@
+"""Latency of POST /predict under overload, with and without admission control.
+
+Drives the ASGI app in-process (no sockets, so the client costs little) with
+an open-loop arrival schedule. Latency is measured from each request's
+scheduled start, so queueing inside the app counts. Without admission
+control the backlog, and with it the latency, grows for the whole run; with
+it, excess requests are shed and the accepted ones stay near the queue timeout.
+
+Run from the inference/ directory:
+    TRACE_EXPORTER=none python -m benchmarks.overload --rate 8000 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+
+from benchmarks.data import random_record
+from src.admission import ADMISSION
+from src.app import app, lifespan
+
+
+async def call(body: bytes) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/predict", "raw_path": b"/predict", "query_string": b"",
+        "root_path": "", "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 8080),
+    }
+    sent = False
+    status = None
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def run(rate: float, duration: float, bodies: list) -> dict:
+    latencies, statuses, tasks = [], Counter(), []
+
+    async def one(body, scheduled):
+        status = await call(body)
+        statuses[status] += 1
+        if status == 200:
+            latencies.append(time.perf_counter() - scheduled)
+
+    start = time.perf_counter()
+    n = int(rate * duration)
+    for i in range(n):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(bodies[i % len(bodies)], scheduled)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    pct = lambda p: round(latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000, 1)
+    return {
+        "offered":   f"{rate:,.0f} req/s",
+        "served":    f"{len(latencies) / elapsed:,.0f} req/s",
+        "statuses":  dict(statuses),
+        "p50_ms":    pct(50),
+        "p99_ms":    pct(99),
+        "max_ms":    round(latencies[-1] * 1000, 1),
+    }
+
+
+async def main(rate: float, duration: float, max_concurrency: int):
+    rng = random.Random(42)
+    bodies = [json.dumps(random_record(rng)).encode() for _ in range(1000)]
+    async with lifespan(app):
+        ADMISSION.max_concurrency = 0
+        print("no admission control:", await run(rate, duration, bodies))
+        ADMISSION.max_concurrency = max_concurrency
+        print(f"admission control:    ", await run(rate, duration, bodies))
+        print(ADMISSION.stats())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=float, default=8000, help="arrivals per second; set above capacity")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--max-concurrency", type=int, default=ADMISSION.max_concurrency or 64)
+    args = parser.parse_args()
+    asyncio.run(main(args.rate, args.duration, args.max_concurrency))
@@ -0,0 +1,97 @@
+"""Memory and lookup cost of serving many models from one ModelRegistry.
+
+Writes ``--models`` perturbed copies of artifacts/model.json (distinct
+content hashes) and ``--duplicates`` byte-identical ones to a temp dir,
+loads them all through a registry, and reports process RSS per loaded
+model, how many loads were deduplicated, what an artifact-size budget of
+half the models evicts, and the per-request resolve + lookup overhead.
+
+Run from the inference/ directory:
+    python -m benchmarks.registry_memory --models 200 --duplicates 50
+"""
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from src.predictor import Predictor
+from src.registry import ModelRegistry
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def write_variant(artifact: dict, path: Path, rng: np.random.Generator):
+    """A copy of the artifact with jittered coefficients and a matching content hash."""
+    variant = dict(artifact)
+    variant["coef"] = (np.asarray(artifact["coef"]) * rng.uniform(0.9, 1.1, len(artifact["coef"]))).tolist()
+    keys = ("feature_order", "coef", "intercept", "baseline")
+    payload = json.dumps({k: variant[k] for k in keys}, sort_keys=True)
+    variant["sha256"] = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    path.write_text(json.dumps(variant))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", type=int, default=200)
+    parser.add_argument("--duplicates", type=int, default=50)
+    args = parser.parse_args()
+
+    predictor = Predictor()
+    artifact = json.loads(Path("artifacts/model.json").read_text())
+    rng = np.random.default_rng(42)
+    X = rng.uniform(0, 10, size=(1, len(artifact["feature_order"])))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        models = {}
+        for i in range(args.models):
+            models[f"m{i}"] = f"m{i}.json"
+            write_variant(artifact, Path(tmp, f"m{i}.json"), rng)
+        for i in range(args.duplicates):
+            models[f"dup{i}"] = "m0.json"
+        config = {"models": models}
+        size = Path(tmp, "m0.json").stat().st_size
+
+        registry = ModelRegistry(predictor, "employee-attrition", memory_budget_mb=1024)
+        registry.configure(config, Path(tmp))
+        before = rss_bytes()
+        start = time.perf_counter()
+        for name in models:
+            registry.get(name)
+        elapsed = time.perf_counter() - start
+        after = rss_bytes()
+        stats = registry.stats()
+        print(f"{len(models)} names -> {stats['resident']} resident models "
+              f"({stats['loads']} loaded, {stats['deduplicated']} deduplicated)")
+        print(f"load + warm-up: {elapsed / len(models) * 1e3:.2f} ms per name")
+        print(f"RSS: +{(after - before) / 1024:.0f} KiB, {(after - before) / stats['resident'] / 1024:.1f} KiB "
+              f"per resident model (artifact {size / 1024:.1f} KiB)")
+
+        budget_mb = args.models // 2 * size / 1024 / 1024
+        small = ModelRegistry(predictor, "employee-attrition", memory_budget_mb=budget_mb)
+        small.configure(config, Path(tmp))
+        for name in models:
+            small.get(name)
+        stats = small.stats()
+        print(f"budget {budget_mb * 1024:.0f} KiB: {stats['resident']} resident, {stats['evictions']} evicted")
+
+        names = list(models)[:100]
+        for name in names:
+            small.get(name)
+        repeat = 100000
+        start = time.perf_counter()
+        for i in range(repeat):
+            small.peek(small.resolve(names[i % len(names)]))
+        per_call = (time.perf_counter() - start) / repeat
+        print(f"resolve + peek of a resident model: {per_call * 1e6:.2f} us")
+        start = time.perf_counter()
+        model = small.get(names[-1])
+        for _ in range(1000):
+            model.predict_fn(X)
+        print(f"single-row predict_fn for comparison: {(time.perf_counter() - start) / 1000 * 1e6:.2f} us")
@@ -0,0 +1,52 @@
+"""Per-hop and per-stage latency from exported trace files.
+
+Reads the JSON-lines span files of the frontend and the inference service
+(TRACE_EXPORTER=file:...), joins spans by trace id, and prints percentiles
+per span. For traces that cross both services it also prints the time
+between the frontend's upstream call and the inference service's request
+span: network, connection setup and server queueing.
+
+    python -m benchmarks.trace_report /tmp/frontend.jsonl /tmp/inference.jsonl
+"""
+import argparse
+import json
+import statistics
+from collections import defaultdict
+
+
+def percentile(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def load(paths: list) -> list:
+    spans = []
+    for path in paths:
+        with open(path) as f:
+            spans.extend(json.loads(line) for line in f if line.strip())
+    return spans
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="+")
+    args = parser.parse_args()
+
+    spans = load(args.files)
+    by_name = defaultdict(list)
+    by_id = {s["span_id"]: s for s in spans}
+    for s in spans:
+        by_name[(s["service"], s["name"])].append(s["duration_ms"])
+
+    # inference request span whose parent is a frontend "upstream" span
+    for s in spans:
+        parent = by_id.get(s["parent_span_id"])
+        if parent is not None and parent["service"] != s["service"]:
+            by_name[(f"{parent['service']} -> {s['service']}", "network + server queue")].append(
+                parent["duration_ms"] - s["duration_ms"])
+
+    print(f"{len(spans)} spans, {len({s['trace_id'] for s in spans})} traces\n")
+    print(f"{'service':24s} {'span':28s} {'count':>7s} {'mean':>9s} {'p50':>9s} {'p99':>9s}  (ms)")
+    for (service, name), values in sorted(by_name.items()):
+        print(f"{service:24s} {name:28s} {len(values):7d} {statistics.mean(values):9.3f} "
+              f"{percentile(values, 50):9.3f} {percentile(values, 99):9.3f}")
@@ -0,0 +1,83 @@
+"""Throughput of the gunicorn multi-worker mode for 1..N workers.
+
+Starts ``gunicorn -c gunicorn.conf.py src.app:app`` with WEB_CONCURRENCY=n,
+drives POST /predict from several client processes over keep-alive
+connections for a fixed duration, and prints requests/s per worker count.
+
+Run from the inference/ directory:
+    python -m benchmarks.worker_scaling --max-workers 4 --clients 16 --duration 10
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import time
+
+from benchmarks.data import random_record
+
+PORT = 8099
+
+
+def wait_ready(timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+def client(seed: int, duration: float, counter):
+    body = json.dumps(random_record(random.Random(seed)))
+    headers = {"Content-Type": "application/json"}
+    conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=10)
+    done = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        conn.request("POST", "/predict", body=body, headers=headers)
+        conn.getresponse().read()
+        done += 1
+    with counter.get_lock():
+        counter.value += done
+
+
+def measure(workers: int, clients: int, duration: float) -> float:
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), PORT=str(PORT))
+    server = subprocess.Popen(
+        ["gunicorn", "-c", "gunicorn.conf.py", "src.app:app"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready()
+        counter = multiprocessing.Value("i", 0)
+        procs = [multiprocessing.Process(target=client, args=(i, duration, counter)) for i in range(clients)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        return counter.value / duration
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()}, clients: {args.clients}, duration: {args.duration}s")
+    baseline = None
+    for n in range(1, args.max_workers + 1):
+        rps = measure(n, args.clients, args.duration)
+        baseline = baseline or rps
+        print(f"workers={n}: {rps:8,.0f} req/s  ({rps / baseline:.2f}x)")
@@ -0,0 +1,29 @@
+# Multi-process serving: gunicorn master + uvicorn workers.
+#
+#   gunicorn -c gunicorn.conf.py src.app:app
+#
+# The app (and the model) is imported once in the master before forking
+# (preload_app), so every worker shares the model pages copy-on-write.
+import gc
+import os
+
+# One BLAS/OpenMP thread per worker; N workers x M threads would oversubscribe
+# the pod's CPU limit. Must be set before NumPy is imported by the preload.
+for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS"):
+    os.environ.setdefault(var, "1")
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+timeout = int(os.environ.get("WORKER_TIMEOUT", "30"))
+graceful_timeout = int(os.environ.get("WORKER_GRACEFUL_TIMEOUT", "20"))
+keepalive = 5
+
+
+def when_ready(server):
+    # Move everything allocated during preload into the permanent generation
+    # so the cyclic GC in each worker never writes to (and un-shares) it.
+    gc.collect()
+    gc.freeze()
+    server.log.info("model preloaded, gc frozen; forking %s worker(s)", workers)
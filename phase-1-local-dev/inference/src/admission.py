@@ -0,0 +1,211 @@
+"""Admission control for the scoring endpoints.
+
+At most ``max_concurrency`` scoring requests are handled at a time. Up to
+``max_queue`` more wait in FIFO order for a slot, and anything beyond that
+is shed straight away. A waiting request is also shed as soon as it is
+clear it cannot get a slot within its deadline, instead of timing out at
+the client after the work has been done. Shed requests get a JSON error and
+a ``Retry-After`` header and never reach body parsing or the model:
+
+- ``429`` when the queue is full,
+- ``503`` when the expected or actual wait exceeds the deadline.
+
+The deadline is ``queue_timeout_ms``, or the client's ``X-Request-Timeout-Ms``
+header if that is shorter. The expected wait is the request's queue position
+times the mean time a slot is held (an EWMA over admitted requests) divided
+by ``max_concurrency``, so it adapts to whatever the admitted requests cost.
+"""
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from starlette.routing import Match
+from src.config import ADMISSION_MAX_CONCURRENCY, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT_MS
+from src.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_WAIT, SHED
+
+# POST paths that go through admission control
+ADMITTED_PREFIXES = ("/predict", "/models/", "/v2/models/")
+
+_IN_FLIGHT = ADMISSION_IN_FLIGHT.labels()
+_QUEUE_DEPTH = ADMISSION_QUEUE_DEPTH.labels()
+_EWMA_ALPHA = 0.2
+
+
+class Overloaded(Exception):
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Concurrency limit with a bounded, deadline-aware FIFO queue.
+
+    Runs on the event loop only, so no locking is needed.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int = 0, queue_timeout_ms: float = 1000.0):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout_ms / 1000.0
+
+        self.active = 0
+        self._waiters = deque()
+        self._hold_time = 0.0  # EWMA of seconds from admission to release
+
+        # stats
+        self.admitted = 0
+        self.queued = 0
+        self.shed = {"queue_full": 0, "deadline": 0, "timeout": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrency > 0
+
+    def expected_wait(self, position: int) -> float:
+        return (position + 1) * self._hold_time / self.max_concurrency
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.expected_wait(len(self._waiters))))
+
+    async def acquire(self, timeout: float = None):
+        """Take a slot, waiting at most ``timeout`` seconds; raises ``Overloaded`` instead."""
+        if self.active < self.max_concurrency and not self._waiters:
+            self._admit(0.0)
+            return
+
+        timeout = self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+        if len(self._waiters) >= self.max_queue:
+            self._shed("queue_full", 429)
+        if self.expected_wait(len(self._waiters)) > timeout:
+            self._shed("deadline", 503)
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        self.queued += 1
+        _QUEUE_DEPTH.inc()
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if not future.done():
+                self._remove(future)
+                self._shed("timeout", 503)
+            # the slot was handed over just as the wait ran out; keep it
+        except BaseException:
+            # client went away while queued
+            if future.done():
+                self.release()
+            else:
+                self._remove(future)
+            raise
+        self._admit(time.perf_counter() - start, counted=True)
+
+    def release(self, held: float = None):
+        """Give back a slot, held for ``held`` seconds by a request that ran."""
+        if held is not None:
+            self._hold_time += _EWMA_ALPHA * (held - self._hold_time)
+        if self._waiters:
+            # hand the slot straight to the oldest waiter
+            future = self._waiters.popleft()
+            _QUEUE_DEPTH.dec()
+            future.set_result(None)
+        else:
+            self.active -= 1
+            _IN_FLIGHT.dec()
+
+    def _admit(self, waited: float, counted: bool = False):
+        if not counted:
+            self.active += 1
+            _IN_FLIGHT.inc()
+        self.admitted += 1
+        ADMISSION_WAIT.labels().observe(waited)
+
+    def _remove(self, future):
+        self._waiters.remove(future)
+        _QUEUE_DEPTH.dec()
+        future.cancel()
+
+    def _shed(self, reason: str, status_code: int):
+        self.shed[reason] += 1
+        SHED.labels(reason).inc()
+        raise Overloaded(status_code, reason, self.retry_after())
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency":     self.max_concurrency,
+            "max_queue":           self.max_queue,
+            "queue_timeout_ms":    self.queue_timeout * 1000.0,
+            "active":              self.active,
+            "queue_depth":         len(self._waiters),
+            "mean_hold_ms":        round(self._hold_time * 1000.0, 3),
+            "admitted":            self.admitted,
+            "queued":              self.queued,
+            "shed":                dict(self.shed),
+        }
+
+
+ADMISSION = AdmissionController(ADMISSION_MAX_CONCURRENCY, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT_MS)
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware applying ``AdmissionController`` to scoring POSTs.
+
+    The slot is held until the response has been sent, so it also covers
+    serialization and streamed bodies.
+    """
+
+    def __init__(self, app, controller: AdmissionController = None):
+        self.app = app
+        self.controller = controller or ADMISSION
+
+    async def __call__(self, scope, receive, send):
+        controller = self.controller
+        if (not controller.enabled or scope["type"] != "http" or scope["method"] != "POST"
+                or not scope["path"].startswith(ADMITTED_PREFIXES)):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await controller.acquire(_client_timeout(scope))
+        except Overloaded as e:
+            await self._reject(scope, send, e)
+            return
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(time.perf_counter() - start)
+
+    @staticmethod
+    async def _reject(scope, send, e: Overloaded):
+        # the router never sees this request; match the route so the
+        # metrics and tracing middlewares still label it by endpoint
+        for route in scope["app"].router.routes:
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                scope["route"] = route
+                break
+
+        body = json.dumps({"detail": f"Overloaded ({e.reason}), retry after {e.retry_after}s"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": e.status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(e.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def _client_timeout(scope):
+    for name, value in scope["headers"]:
+        if name == b"x-request-timeout-ms":
+            try:
+                return max(0.0, float(value) / 1000.0)
+            except ValueError:
+                return None
+    return None
@@ -1,9 +1,174 @@
-from fastapi import FastAPI
-from src.schemas import EmployeeFeatures, PredictionResponse
-from src.predictor import Predictor
+import time
+_IMPORT_START = time.perf_counter()
 
-app = FastAPI(title="Attrition Prediction Service", version="1.0.0")
+import logging
+from contextlib import asynccontextmanager
+from pathlib import Path
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
+from src.schemas import EmployeeFeatures, PredictionResponse, BatchPredictionRequest, BatchPredictionResponse
+from src.predictor import Predictor, load_model
+from src.batcher import MicroBatcher
+from src.fastjson import FastJSONResponse, json_body, request_body
+from src.admission import ADMISSION, AdmissionMiddleware
+from src.middleware import MetricsMiddleware, ProfilingMiddleware
+from src.profiler import PROFILER
+from src.registry import ModelRegistry, UnknownModel
+from src.reloader import ModelWatcher
+from src.shadow import ShadowScorer
+from src.streaming import BodyStreamingResponse, score_ndjson, gzip_stream
+from src.v2 import V2Error, create_router, v2_error_handler
+from src.warmup import warm_up
+from src import metrics, columnar, tracing
+from src.features import FEATURE_ORDER
+from src.config import (
+    MODEL_PATH, MAX_BATCH_SIZE, MICRO_BATCH_ENABLED, MICRO_BATCH_WINDOW_MS, MICRO_BATCH_MAX_SIZE,
+    MODEL_RELOAD_INTERVAL_S, MAX_COLUMNAR_ROWS, STREAM_CHUNK_ROWS, MAX_STREAM_LINE_BYTES, EXPLAIN_TOP_K,
+    SHADOW_MODEL_PATH, SHADOW_QUEUE_ROWS, SHADOW_BATCH_SIZE,
+    MODEL_NAME, MODEL_REGISTRY_PATH, MODEL_MEMORY_BUDGET_MB, MODEL_IDLE_TTL_S,
+)
+
+_t = time.perf_counter()
 predictor = Predictor()
+_model_load_ms = round((time.perf_counter() - _t) * 1000, 2)
+registry = ModelRegistry(predictor, MODEL_NAME, MODEL_MEMORY_BUDGET_MB, MODEL_IDLE_TTL_S)
+if MODEL_REGISTRY_PATH:
+    registry.load_file(Path(MODEL_REGISTRY_PATH))
+
+
+def _score_queued(records: list) -> list:
+    """Score micro-batched ``(row, model)`` records, one model call per model.
+
+    Requests resolve their model before queueing, so the worker thread never
+    loads one. A batch holds more than one model only across a hot reload.
+    """
+    model = records[0][1]
+    if all(m is model for _, m in records):
+        return predictor.predict_raw([row for row, _ in records], 0, model)
+    groups = {}
+    for i, (_, m) in enumerate(records):
+        groups.setdefault(id(m), (m, []))[1].append(i)
+    results = [None] * len(records)
+    for m, indices in groups.values():
+        for i, result in zip(indices, predictor.predict_raw([records[i][0] for i in indices], 0, m)):
+            results[i] = result
+    return results
+
+
+def _drop_batcher(name: str):
+    """Registry callback: ``name``'s model was evicted or unconfigured."""
+    b = batchers.pop(name, None)
+    if b is not None:
+        b.stop()
+
+
+batcher = MicroBatcher(_score_queued, MICRO_BATCH_WINDOW_MS, MICRO_BATCH_MAX_SIZE) if MICRO_BATCH_ENABLED else None
+batchers = {MODEL_NAME: batcher}  # model name -> MicroBatcher, created on first use, dropped on eviction
+registry.on_unload = _drop_batcher
+watcher = ModelWatcher(predictor, Path(MODEL_PATH), MODEL_RELOAD_INTERVAL_S)
+shadow = ShadowScorer(load_model(Path(SHADOW_MODEL_PATH)), SHADOW_QUEUE_ROWS, SHADOW_BATCH_SIZE) if SHADOW_MODEL_PATH else None
+
+logger = logging.getLogger(__name__)
+startup = {"model_load_ms": _model_load_ms}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # runs per worker process, after any gunicorn fork; the server only
+    # accepts connections once this has yielded
+    startup.update(await run_in_threadpool(warm_up, predictor))
+    if batcher is not None:
+        await batcher.start()
+    logger.info("startup: %s", startup)
+
+    if MODEL_RELOAD_INTERVAL_S > 0:
+        watcher.start()
+    registry.start()
+    if shadow is not None:
+        # after warm-up, so only live traffic is compared
+        shadow.start()
+        predictor.shadow = shadow
+    yield
+    watcher.stop()
+    registry.stop()
+    if predictor.shadow is not None:
+        predictor.shadow.stop()
+    for b in list(batchers.values()):
+        if b is not None:
+            await b.close()
+
+
+app = FastAPI(title="Attrition Prediction Service", version="1.0.0", lifespan=lifespan)
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(tracing.TracingMiddleware)
+app.include_router(create_router(predictor, registry))
+app.add_exception_handler(V2Error, v2_error_handler)
+startup["import_ms"] = round((time.perf_counter() - _IMPORT_START) * 1000, 2)
+
+_PARSE_STAGE  = metrics.STAGE_LATENCY.labels("parse")
+_DERIVE_STAGE = metrics.STAGE_LATENCY.labels("derive")
+
+
+def _parsed(request: Request):
+    """Record body read + validation time; FastAPI has done both by handler entry."""
+    start = getattr(request.state, "t_start", None)
+    if start is not None:
+        now = time.perf_counter()
+        _PARSE_STAGE.observe(now - start)
+        tracing.record("parse", start, now)
+
+
+def _handled(request: Request):
+    request.state.t_handler_done = time.perf_counter()
+
+
+def _top_k(explain: bool, top_k: int, model) -> int:
+    """Number of contributions to return; 0 when not explaining."""
+    if not explain:
+        return 0
+    if model.explain_fn is None:
+        raise HTTPException(
+            status_code=501,
+            detail=f"explain=true needs a linear model.json artifact; serving {model.path}",
+        )
+    return top_k
+
+
+def _resolve(request: Request, model_name: str = None) -> str:
+    """Model for a request: the path name, else X-Model-Name, else the registry default."""
+    try:
+        return registry.resolve(model_name or request.headers.get("x-model-name"), request.headers.get("x-routing-key"))
+    except UnknownModel as e:
+        raise HTTPException(status_code=404, detail=f"Unknown model '{e.args[0]}'; serving {', '.join(registry.names())}")
+
+
+async def _model(request: Request, model_name: str = None):
+    """``(name, model)`` for a request, loading the model off the event loop if it is not resident."""
+    name = _resolve(request, model_name)
+    try:
+        return name, registry.peek(name) or await run_in_threadpool(registry.get, name)
+    except UnknownModel:
+        # removed by a concurrent /admin/models/reload
+        raise HTTPException(status_code=404, detail=f"Unknown model '{name}'")
+
+
+def _batcher(name: str):
+    """The micro-batcher for ``name``; every model gets its own so batches never mix models."""
+    if not MICRO_BATCH_ENABLED:
+        return None
+    b = batchers.get(name)
+    if b is None:
+        b = batchers[name] = MicroBatcher(_score_queued, MICRO_BATCH_WINDOW_MS, MICRO_BATCH_MAX_SIZE)
+    return b
+
+
+_EXPLAIN = Query(False, description="Add the top_k per-feature log-odds contributions to each prediction")
+_TOP_K = Query(EXPLAIN_TOP_K, ge=1, le=len(FEATURE_ORDER))
+_FEATURES = Depends(json_body(EmployeeFeatures))
+_BATCH = Depends(json_body(BatchPredictionRequest))
 
 
 @app.get("/health")
@@ -13,10 +178,263 @@ def health():
 
 @app.get("/ready")
 def ready():
-    return {"status": "ready", "model_loaded": predictor.is_loaded()}
+    if not predictor.is_ready():
+        return JSONResponse({"status": "starting", "model_loaded": predictor.is_loaded()}, status_code=503)
+
+    model = predictor.model
+    return {
+        "status":            "ready",
+        "model_loaded":      predictor.is_loaded(),
+        "startup_ms":        startup,
+        "model_version":     model.version,
+        "model_path":        model.path,
+        "model_loaded_at":   model.loaded_at,
+        "last_reload_error": watcher.last_error,
+    }
+
+
+@app.post("/admin/reload")
+def reload_model():
+    """Load, warm up and swap in the artifact at MODEL_PATH; in-flight requests finish on the old model."""
+    try:
+        return watcher.reload()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Reload failed, still serving {predictor.model_version}: {e}")
+
+
+@app.post("/admin/shadow")
+def start_shadow(model_path: str):
+    """Load a candidate model and compare it against live traffic from now on."""
+    try:
+        candidate = load_model(Path(model_path))
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Could not load {model_path}: {e}")
+    scorer = ShadowScorer(candidate, SHADOW_QUEUE_ROWS, SHADOW_BATCH_SIZE)
+    scorer.start()
+    previous, predictor.shadow = predictor.shadow, scorer
+    if previous is not None:
+        previous.stop()
+    return scorer.stats()
+
+
+@app.delete("/admin/shadow")
+def stop_shadow():
+    """Stop shadow scoring; returns the final comparison."""
+    scorer, predictor.shadow = predictor.shadow, None
+    if scorer is None:
+        return {"enabled": False}
+    scorer.stop()
+    return {"enabled": False, **scorer.stats()}
+
+
+@app.get("/admin/profile")
+def profile_stats():
+    return PROFILER.stats()
+
+
+@app.post("/admin/profile")
+def configure_profile(sample_rate: float, interval_ms: float = None, include_idle: bool = None, reset: bool = False):
+    """Turn request sampling on (``sample_rate`` > 0) or off (0) without a restart."""
+    try:
+        PROFILER.configure(sample_rate, interval_ms, include_idle)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if reset:
+        PROFILER.reset()
+    return PROFILER.stats()
+
+
+@app.get("/admin/profile/collapsed", response_class=PlainTextResponse)
+def download_profile(reset: bool = False):
+    """Collapsed stacks for flamegraph.pl / speedscope; ``reset=true`` starts a fresh profile."""
+    body = PROFILER.collapsed()
+    if reset:
+        PROFILER.reset()
+    filename = f"profile-{predictor.model_version}-{time.strftime('%Y%m%dT%H%M%S')}.folded"
+    return PlainTextResponse(body, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/stats/batcher")
+def batcher_stats():
+    if batcher is None:
+        return {"enabled": False}
+    stats = {"enabled": True, **batcher.stats()}
+    if len(batchers) > 1:
+        stats["models"] = {name: b.stats() for name, b in list(batchers.items())}
+    return stats
+
+
+@app.get("/models")
+def list_models():
+    """Named models and splits, which are loaded, and the registry's memory use."""
+    return registry.stats()
+
+
+@app.post("/admin/models/reload")
+def reload_models():
+    """Re-read MODEL_REGISTRY_PATH; resident models that are no longer named are unloaded."""
+    if not MODEL_REGISTRY_PATH:
+        raise HTTPException(status_code=409, detail="MODEL_REGISTRY_PATH is not set")
+    try:
+        registry.load_file(Path(MODEL_REGISTRY_PATH))
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Registry reload failed, configuration unchanged: {e}")
+    return registry.stats()
+
+
+@app.get("/stats/admission")
+def admission_stats():
+    if not ADMISSION.enabled:
+        return {"enabled": False}
+    return {"enabled": True, **ADMISSION.stats()}
+
+
+@app.get("/stats/shadow")
+def shadow_stats(reset: bool = False):
+    scorer = predictor.shadow
+    if scorer is None:
+        return {"enabled": False}
+    stats = {"enabled": True, **scorer.stats()}
+    if reset:
+        scorer.reset()
+    return stats
+
+
+@app.get("/stats/cache")
+def cache_stats():
+    if predictor.cache is None:
+        return {"enabled": False}
+    return {"enabled": True, "model_version": predictor.model_version, **predictor.cache.stats()}
+
+
+# The scoring routes parse their bodies with json_body and return FastJSONResponse
+# (see src/fastjson.py); response_model only documents the response.
+@app.post("/predict", response_model=PredictionResponse, openapi_extra=request_body(EmployeeFeatures))
+async def predict(request: Request, features: EmployeeFeatures = _FEATURES,
+                  explain: bool = _EXPLAIN, top_k: int = _TOP_K):
+    return await _predict(features, request, None, explain, top_k)
+
+
+@app.post("/models/{model_name}/predict", response_model=PredictionResponse,
+          openapi_extra=request_body(EmployeeFeatures))
+async def predict_model(model_name: str, request: Request, features: EmployeeFeatures = _FEATURES,
+                        explain: bool = _EXPLAIN, top_k: int = _TOP_K):
+    return await _predict(features, request, model_name, explain, top_k)
+
+
+async def _predict(features: EmployeeFeatures, request: Request, model_name: str, explain: bool, top_k: int):
+    _parsed(request)
+    name, model = await _model(request, model_name)
+    row = features.to_row()
+    k = _top_k(explain, top_k, model)
+    b = _batcher(name)
+
+    if k:
+        # explained rows skip the micro-batcher and the cache
+        result = (await run_in_threadpool(predictor.predict_raw, [row], k, model))[0]
+    elif b is not None:
+        result = await b.submit((row, model))
+    else:
+        result = (await run_in_threadpool(predictor.predict_raw, [row], 0, model))[0]
+
+    _handled(request)
+    return FastJSONResponse(result, headers={"X-Model-Name": name})
+
+
+@app.post("/predict/batch", response_model=BatchPredictionResponse, openapi_extra=request_body(BatchPredictionRequest))
+async def predict_batch(request: Request, batch: BatchPredictionRequest = _BATCH,
+                        explain: bool = _EXPLAIN, top_k: int = _TOP_K):
+    return await _predict_batch(batch, request, None, explain, top_k)
+
+
+@app.post("/models/{model_name}/predict/batch", response_model=BatchPredictionResponse,
+          openapi_extra=request_body(BatchPredictionRequest))
+async def predict_batch_model(model_name: str, request: Request, batch: BatchPredictionRequest = _BATCH,
+                              explain: bool = _EXPLAIN, top_k: int = _TOP_K):
+    return await _predict_batch(batch, request, model_name, explain, top_k)
+
+
+async def _predict_batch(batch: BatchPredictionRequest, request: Request, model_name: str, explain: bool, top_k: int):
+    _parsed(request)
+    if len(batch.instances) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(batch.instances)} exceeds MAX_BATCH_SIZE={MAX_BATCH_SIZE}",
+        )
+    name, model = await _model(request, model_name)
+    rows = [f.to_row() for f in batch.instances]
+    results = await run_in_threadpool(predictor.predict_raw, rows, _top_k(explain, top_k, model), model)
+    _handled(request)
+    return FastJSONResponse({"predictions": results}, headers={"X-Model-Name": name})
+
+
+@app.post(
+    "/predict/columnar",
+    response_class=Response,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {t: {"schema": {"type": "string", "format": "binary"}} for t in columnar.MEDIA_TYPES},
+        }
+    },
+)
+async def predict_columnar(request: Request):
+    """Bulk scoring from a .npy matrix or an Arrow IPC stream; answers in the same format."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in columnar.MEDIA_TYPES:
+        raise HTTPException(status_code=415, detail=f"Content-Type must be one of {', '.join(columnar.MEDIA_TYPES)}")
+
+    body = await request.body()
+    try:
+        with _PARSE_STAGE.time():
+            data = columnar.read_npy(body) if content_type == columnar.NPY_TYPE else columnar.read_arrow(body)
+        with _DERIVE_STAGE.time():
+            X = columnar.to_matrix(data)
+    except columnar.ColumnarError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    if len(X) > MAX_COLUMNAR_ROWS:
+        raise HTTPException(status_code=413, detail=f"{len(X)} rows exceeds MAX_COLUMNAR_ROWS={MAX_COLUMNAR_ROWS}")
+
+    name, model = await _model(request)
+    probs, version = await run_in_threadpool(predictor.score_matrix, X, model)
+    _handled(request)
+
+    if content_type == columnar.NPY_TYPE:
+        content = columnar.write_npy(probs)
+    else:
+        content = columnar.write_arrow(probs, version)
+    return Response(content=content, media_type=content_type, headers={"X-Model-Version": version, "X-Model-Name": name})
+
+
+@app.post(
+    "/predict/stream",
+    response_class=BodyStreamingResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string", "format": "binary"}}},
+        }
+    },
+)
+async def predict_stream(request: Request):
+    """Score newline-delimited EmployeeFeatures records, streaming NDJSON results back.
 
+    Send ``Content-Encoding: gzip`` for a gzipped body and ``Accept-Encoding: gzip``
+    for a gzipped response. Invalid rows are reported inline.
+    """
+    name, model = await _model(request)
+    gzipped_in = request.headers.get("content-encoding", "").lower() == "gzip"
+    results = score_ndjson(request.stream(), predictor, STREAM_CHUNK_ROWS, gzipped=gzipped_in, model=model,
+                           max_line_bytes=MAX_STREAM_LINE_BYTES)
 
-@app.post("/predict", response_model=PredictionResponse)
-def predict(features: EmployeeFeatures):
-    result = predictor.predict(features.to_model_input())
-    return result
\ No newline at end of file
+    headers = {"X-Model-Version": model.version, "X-Model-Name": name}
+    if "gzip" in request.headers.get("accept-encoding", "").lower():
+        results = gzip_stream(results)
+        headers["Content-Encoding"] = "gzip"
+    return BodyStreamingResponse(results, media_type="application/x-ndjson", headers=headers)
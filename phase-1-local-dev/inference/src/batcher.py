@@ -0,0 +1,164 @@
+import asyncio
+import time
+from typing import Callable, Optional
+from src.metrics import STAGE_LATENCY, QUEUE_DEPTH
+from src import tracing
+
+_QUEUE_STAGE = STAGE_LATENCY.labels("queue")
+_QUEUE_DEPTH = QUEUE_DEPTH.labels()
+
+_STOP = object()  # queued by stop(); the task ends once it reaches an empty queue
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-record requests into one matrix call.
+
+    Callers ``await submit(record)``; a background task collects queued
+    records for up to ``window_ms`` or ``max_batch_size`` items, scores them
+    with one ``score_fn(records)`` call in a worker thread and resolves each
+    caller's future with its own row.
+
+    The window is adaptive: when the previous batch held a single request
+    (light load) the batch is flushed as soon as the queue is drained, so an
+    idle service does not pay the window on every call.
+    """
+
+    def __init__(self, score_fn: Callable[[list], list], window_ms: float = 2.0, max_batch_size: int = 64):
+        self.score_fn = score_fn
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_batch_size = 0
+        self._stopping = False
+
+        # stats
+        self.batches = 0
+        self.requests = 0
+        self.max_seen = 0
+        self.size_histogram = {}
+
+    async def start(self):
+        """Start the collecting task and the worker thread ahead of the first request."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._start(loop)
+        await asyncio.to_thread(lambda: None)
+
+    async def submit(self, record) -> dict:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._start(loop)
+        future = loop.create_future()
+        _QUEUE_DEPTH.inc()
+        await self._queue.put((record, future, time.perf_counter(), tracing.current()))
+        return await future
+
+    def _start(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._stopping = False
+        self._task = loop.create_task(self._run())
+
+    def stop(self):
+        """End the task after the records already queued are scored; callable from any thread.
+
+        A later ``submit`` starts it again.
+        """
+        if self._task is not None and not self._task.done():
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, _STOP)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+        if self._last_batch_size > 1 and self.window > 0:
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+        return batch
+
+    async def _run(self):
+        # the task was created inside the first caller's request context
+        tracing.detach()
+        while not (self._stopping and self._queue.empty()):
+            batch = await self._collect()
+            if any(item is _STOP for item in batch):
+                self._stopping = True
+                batch = [item for item in batch if item is not _STOP]
+                if not batch:
+                    continue
+            now = time.perf_counter()
+            records, futures, spans = [], [], []
+            for record, future, enqueued, span in batch:
+                records.append(record)
+                futures.append(future)
+                _QUEUE_STAGE.observe(now - enqueued)
+                if span is not None:
+                    span.record("queue", enqueued, now)
+                    spans.append(span)
+            _QUEUE_DEPTH.dec(len(batch))
+            self._record(len(batch))
+
+            try:
+                if spans:
+                    # one derive/predict for the whole batch, copied into every traced request
+                    results, stages = await asyncio.to_thread(tracing.collecting, self.score_fn, records)
+                    attributes = {"batch_size": len(batch)}
+                    for span in spans:
+                        for name, start, end, _ in stages:
+                            span.record(name, start, end, attributes)
+                else:
+                    results = await asyncio.to_thread(self.score_fn, records)
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for future, result in zip(futures, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _record(self, size: int):
+        self._last_batch_size = size
+        self.batches += 1
+        self.requests += size
+        self.max_seen = max(self.max_seen, size)
+
+        bucket = 1
+        while bucket < size:
+            bucket *= 2
+        self.size_histogram[bucket] = self.size_histogram.get(bucket, 0) + 1
+
+    def stats(self) -> dict:
+        return {
+            "window_ms":       self.window * 1000.0,
+            "max_batch_size":  self.max_batch_size,
+            "batches":         self.batches,
+            "requests":        self.requests,
+            "mean_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "max_batch_seen":  self.max_seen,
+            # bucket "n" counts batches with size in (n/2, n]
+            "batch_size_histogram": {str(k): v for k, v in sorted(self.size_histogram.items())},
+        }
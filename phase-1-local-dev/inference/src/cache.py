@@ -0,0 +1,93 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+import numpy as np
+
+
+class PredictionCache:
+    """Bounded LRU + TTL cache of prediction results, keyed on the model input vector.
+
+    Concurrent lookups for a key that is already being computed do not
+    recompute it: the first caller claims the key and the others wait on
+    the same future (single-flight).
+    """
+
+    def __init__(self, max_size: int, ttl_s: float, decimals: int = 4):
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self.decimals = decimals
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, result)
+        self._inflight = {}            # key -> Future
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def keys(self, X: np.ndarray) -> list:
+        """Quantize each row of a FEATURE_ORDER matrix so float noise maps to one entry."""
+        return [tuple(row) for row in np.round(X, self.decimals).tolist()]
+
+    def get_or_claim(self, key: tuple):
+        """Return ``(result, None, False)`` on a hit, ``(None, future, True)`` when
+        the caller must compute and ``fulfil`` the key, or ``(None, future, False)``
+        when another caller is already computing it."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1], None, False
+                del self._entries[key]
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return None, future, False
+
+            self.misses += 1
+            future = Future()
+            self._inflight[key] = future
+            return None, future, True
+
+    def fulfil(self, key: tuple, future: Future, result: dict):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+                self._entries[key] = (time.monotonic() + self.ttl_s, result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        future.set_result(result)
+
+    def abandon(self, key: tuple, future: Future, exc: BaseException):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        future.set_exception(exc)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            # pending computations finish for their waiters but are not stored
+            self._inflight.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "max_size":  self.max_size,
+                "ttl_s":     self.ttl_s,
+                "size":      len(self._entries),
+                "hits":      self.hits,
+                "misses":    self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            }
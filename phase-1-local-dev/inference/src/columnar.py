@@ -0,0 +1,165 @@
+"""Binary columnar request/response formats for bulk scoring.
+
+Two formats, chosen by Content-Type:
+
+* ``application/x-npy`` — a NumPy ``.npy`` matrix with one row per employee,
+  either the 19 model columns in FEATURE_ORDER or the 15 EmployeeFeatures
+  fields in schema order (derived features are then computed here).
+* ``application/vnd.apache.arrow.stream`` — an Arrow IPC stream whose columns
+  are named either by FEATURE_ORDER or by the EmployeeFeatures field names.
+  Needs the optional ``pyarrow`` package.
+
+Inputs go straight into one float64 matrix without per-row dicts, and the
+EmployeeFeatures type rules are applied as vectorized column checks.
+"""
+import io
+import numpy as np
+from src.features import FEATURE_ORDER, FIELD_TO_FEATURE, RAW_FIELDS, build_matrix
+from src.predictor import THRESHOLD, TIER_NAMES, tier_index
+from src.schemas import EmployeeFeatures
+
+NPY_TYPE = "application/x-npy"
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+MEDIA_TYPES = (NPY_TYPE, ARROW_TYPE)
+
+INT_FIELDS = {name for name, f in EmployeeFeatures.model_fields.items() if f.annotation is int}
+
+# model columns that must hold whole numbers
+INT_FEATURES = {FIELD_TO_FEATURE[f] for f in INT_FIELDS} | {"EarlyCompanyTenureRisk", "LongTenureLowRoleRisk"}
+_INT_FEATURE_IDX = [i for i, name in enumerate(FEATURE_ORDER) if name in INT_FEATURES]
+_INT_FIELD_IDX = [i for i, name in enumerate(RAW_FIELDS) if name in INT_FIELDS]
+
+
+class ColumnarError(ValueError):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+# ------------------------------------------------------------
+# Decoding
+# ------------------------------------------------------------
+def read_npy(body: bytes) -> np.ndarray:
+    """View the .npy payload in place (no copy for C-ordered little-endian data)."""
+    stream = io.BytesIO(body)
+    try:
+        version = np.lib.format.read_magic(stream)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+    except ValueError as e:
+        raise ColumnarError(400, f"invalid .npy payload: {e}")
+    if dtype.hasobject:
+        raise ColumnarError(422, "object arrays are not accepted")
+
+    count = int(np.prod(shape)) if shape else 1
+    try:
+        array = np.frombuffer(body, dtype=dtype, count=count, offset=stream.tell())
+        return array.reshape(shape, order="F" if fortran_order else "C")
+    except ValueError as e:
+        raise ColumnarError(400, f"invalid .npy payload: {e}")
+
+
+def read_arrow(body: bytes) -> dict:
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ColumnarError(415, "Arrow IPC needs the optional 'pyarrow' package")
+
+    try:
+        table = pa.ipc.open_stream(body).read_all()
+    except pa.ArrowInvalid as e:
+        raise ColumnarError(400, f"invalid Arrow IPC stream: {e}")
+
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if column.null_count:
+            raise ColumnarError(422, f"column '{name}' has {column.null_count} null value(s)")
+        # zero-copy for single-chunk primitive columns
+        columns[name] = column.to_numpy()
+    return columns
+
+
+# ------------------------------------------------------------
+# Matrix building + vectorized validation
+# ------------------------------------------------------------
+def _check(matrix: np.ndarray, names: list, int_idx: list):
+    finite = np.isfinite(matrix)
+    if not finite.all():
+        bad = [f"{names[i]} ({int((~finite[:, i]).sum())} rows)" for i in np.flatnonzero(~finite.all(axis=0))]
+        raise ColumnarError(422, f"non-finite values in: {', '.join(bad)}")
+
+    ints = matrix[:, int_idx]
+    whole = ints == np.floor(ints)
+    if not whole.all():
+        bad = [f"{names[int_idx[i]]} ({int((~whole[:, i]).sum())} rows)" for i in np.flatnonzero(~whole.all(axis=0))]
+        raise ColumnarError(422, f"non-integer values in integer fields: {', '.join(bad)}")
+
+
+def to_matrix(data) -> np.ndarray:
+    """Turn a decoded npy array or Arrow column dict into the validated model matrix."""
+    if isinstance(data, dict):
+        if all(name in data for name in FEATURE_ORDER):
+            names = FEATURE_ORDER
+        elif all(name in data for name in RAW_FIELDS):
+            names = RAW_FIELDS
+        else:
+            missing = [n for n in RAW_FIELDS if n not in data]
+            raise ColumnarError(422, f"missing columns: {', '.join(missing)}")
+        columns = [np.asarray(data[n]) for n in names]
+        for name, column in zip(names, columns):
+            if column.dtype.kind not in "biuf":
+                raise ColumnarError(422, f"column '{name}' is not numeric (dtype {column.dtype})")
+        array = np.column_stack([column.astype(np.float64, copy=False) for column in columns])
+    else:
+        array = data
+
+    if array.ndim != 2 or array.shape[1] not in (len(FEATURE_ORDER), len(RAW_FIELDS)):
+        raise ColumnarError(
+            422, f"expected shape (n, {len(FEATURE_ORDER)}) or (n, {len(RAW_FIELDS)}), got {array.shape}")
+    if array.dtype.kind not in "biuf":
+        raise ColumnarError(422, f"expected a numeric matrix, got dtype {array.dtype}")
+
+    # no copy when the payload is already C-ordered float64
+    array = np.ascontiguousarray(array, dtype=np.float64)
+
+    if array.shape[1] == len(RAW_FIELDS):
+        _check(array, RAW_FIELDS, _INT_FIELD_IDX)
+        return build_matrix(array)
+
+    _check(array, FEATURE_ORDER, _INT_FEATURE_IDX)
+    return array
+
+
+# ------------------------------------------------------------
+# Encoding
+# ------------------------------------------------------------
+def write_npy(probs: np.ndarray) -> bytes:
+    """(n, 2) float64 matrix of [p_stay, p_leave]."""
+    out = io.BytesIO()
+    np.save(out, np.ascontiguousarray(probs, dtype=np.float64), allow_pickle=False)
+    return out.getvalue()
+
+
+def write_arrow(probs: np.ndarray, model_version: str) -> bytes:
+    import pyarrow as pa
+
+    p_leave = np.ascontiguousarray(probs[:, 1])
+    risk = pa.DictionaryArray.from_arrays(
+        pa.array(tier_index(p_leave).astype(np.int8)), pa.array(TIER_NAMES.tolist()))
+    table = pa.table(
+        {
+            "prediction": pa.array((p_leave >= THRESHOLD).astype(np.int8)),
+            "p_leave":    pa.array(p_leave),
+            "p_stay":     pa.array(np.ascontiguousarray(probs[:, 0])),
+            "risk":       risk,
+        },
+        metadata={"model_version": model_version, "threshold": str(THRESHOLD)},
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,63 @@
+import os
+
+# Model artifact, backend chosen by suffix: model.json (NumPy-only),
+# model.onnx (needs onnxruntime) or model.pkl (needs joblib + scikit-learn)
+MODEL_PATH = os.environ.get("MODEL_PATH", "artifacts/model.json")
+
+# ONNX Runtime threads per scoring call (keep at 1 with several gunicorn workers)
+ONNX_INTRA_OP_THREADS = int(os.environ.get("ONNX_INTRA_OP_THREADS", "1"))
+
+# Batch scoring
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", "10000"))
+
+# explain=true: contributions returned per prediction unless top_k is given
+EXPLAIN_TOP_K = int(os.environ.get("EXPLAIN_TOP_K", "5"))
+
+# Micro-batching of concurrent /predict calls
+MICRO_BATCH_ENABLED = os.environ.get("MICRO_BATCH_ENABLED", "true").lower() == "true"
+MICRO_BATCH_WINDOW_MS = float(os.environ.get("MICRO_BATCH_WINDOW_MS", "2"))
+MICRO_BATCH_MAX_SIZE = int(os.environ.get("MICRO_BATCH_MAX_SIZE", "64"))
+
+# Prediction cache (0 disables it)
+PREDICTION_CACHE_SIZE = int(os.environ.get("PREDICTION_CACHE_SIZE", "0"))
+PREDICTION_CACHE_TTL_S = float(os.environ.get("PREDICTION_CACHE_TTL_S", "300"))
+
+# Model hot reload: poll MODEL_PATH every N seconds (0 disables the watcher)
+MODEL_RELOAD_INTERVAL_S = float(os.environ.get("MODEL_RELOAD_INTERVAL_S", "0"))
+
+# Columnar (.npy / Arrow IPC) bulk scoring
+MAX_COLUMNAR_ROWS = int(os.environ.get("MAX_COLUMNAR_ROWS", "1000000"))
+
+# Streaming NDJSON scoring: rows scored per model call
+STREAM_CHUNK_ROWS = int(os.environ.get("STREAM_CHUNK_ROWS", "1000"))
+# Longest NDJSON line accepted (a record is ~500 bytes): 413 before the first results, an error line after
+MAX_STREAM_LINE_BYTES = int(os.environ.get("MAX_STREAM_LINE_BYTES", "65536"))
+
+# Name MODEL_PATH is served under: V2 (Open Inference Protocol) endpoints, X-Model-Name, the registry
+MODEL_NAME = os.environ.get("MODEL_NAME", "employee-attrition")
+
+# Sampling profiler: fraction of requests profiled (0 disables it) and stack sampling interval
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "5"))
+
+# Tracing: console (stderr), file:<path> or none; fraction of new traces recorded
+TRACE_EXPORTER = os.environ.get("TRACE_EXPORTER", "console")
+TRACE_SAMPLE_RATE = float(os.environ.get("TRACE_SAMPLE_RATE", "1.0"))
+
+# Admission control for the scoring POSTs: concurrent requests (0 disables it),
+# requests allowed to wait for a slot, and the longest wait before a 503
+ADMISSION_MAX_CONCURRENCY = int(os.environ.get("ADMISSION_MAX_CONCURRENCY", "64"))
+ADMISSION_MAX_QUEUE = int(os.environ.get("ADMISSION_MAX_QUEUE", "128"))
+ADMISSION_QUEUE_TIMEOUT_MS = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT_MS", "250"))
+
+# Shadow scoring: candidate model compared against live traffic off the request
+# path (empty disables it); rows allowed to wait and rows per candidate call
+SHADOW_MODEL_PATH = os.environ.get("SHADOW_MODEL_PATH", "")
+SHADOW_QUEUE_ROWS = int(os.environ.get("SHADOW_QUEUE_ROWS", "10000"))
+SHADOW_BATCH_SIZE = int(os.environ.get("SHADOW_BATCH_SIZE", "1024"))
+
+# Model registry: JSON file naming more models and weighted splits (empty: MODEL_NAME only),
+# total artifact bytes kept loaded, and idle time before a model is unloaded (0: never)
+MODEL_REGISTRY_PATH = os.environ.get("MODEL_REGISTRY_PATH", "")
+MODEL_MEMORY_BUDGET_MB = float(os.environ.get("MODEL_MEMORY_BUDGET_MB", "256"))
+MODEL_IDLE_TTL_S = float(os.environ.get("MODEL_IDLE_TTL_S", "0"))
@@ -0,0 +1,83 @@
+"""JSON in and out of the scoring endpoints without the generic FastAPI path.
+
+By default FastAPI decodes a body with ``json.loads``, validates the dict,
+then validates the returned dict again against ``response_model`` before
+serializing it. The scoring routes instead:
+
+- parse and validate the body in one pass with pydantic's JSON parser
+  (``json_body``), and
+- return a ``FastJSONResponse`` built from the trusted result dicts, which
+  FastAPI sends as-is.
+
+``response_model`` stays on those routes for the OpenAPI docs only.
+``dumps``/``loads`` use orjson when it is installed and otherwise fall back
+to the stdlib with compact separators.
+"""
+import json
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from pydantic import BaseModel, ValidationError
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib is ~7x slower on large responses
+    orjson = None
+
+
+if orjson is not None:
+    dumps = orjson.dumps
+    loads = orjson.loads
+else:
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    loads = json.loads
+
+
+class FastJSONResponse(Response):
+    """JSON response for dicts and lists of plain Python types; no response_model validation."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def json_body(model: type):
+    """Dependency returning the request body parsed straight into ``model``.
+
+    Validation errors are raised as ``RequestValidationError`` with ``body``
+    locations, so clients get the same 422 as from a declared body parameter.
+    """
+    async def parse(request: Request) -> BaseModel:
+        body = await request.body()
+        try:
+            return model.model_validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError([_body_error(err) for err in e.errors(include_url=False)], body=body)
+    return parse
+
+
+def _body_error(err: dict) -> dict:
+    err = {**err, "loc": ("body", *err["loc"])}
+    if err["type"] == "finite_number":
+        del err["input"]  # NaN/Infinity cannot be written back out as JSON
+    return err
+
+
+def request_body(model: type) -> dict:
+    """``openapi_extra`` documenting ``model`` as the JSON body of a route that uses ``json_body``."""
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+
+    def inline(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return inline(defs[node["$ref"].rsplit("/", 1)[-1]])
+            return {k: inline(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [inline(v) for v in node]
+        return node
+
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": inline(schema)}}}}
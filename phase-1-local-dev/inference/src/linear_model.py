@@ -0,0 +1,77 @@
+import json
+import hashlib
+import numpy as np
+from pathlib import Path
+
+SUPPORTED_FORMAT_VERSIONS = {1, 2}
+
+
+class LinearModel:
+    """Logistic regression scored with plain NumPy.
+
+    Loads the compact artifact written by ``model_training/05_export.py``:
+    the StandardScaler is already folded into ``coef``/``intercept``, so the
+    raw feature matrix goes straight into one dot product.
+
+    ``baseline`` (format 2) is the scaler mean of each column, 0 for
+    unscaled ones. ``coef * (x - baseline)`` is then the classifier's
+    coefficient times the scaled value, i.e. each feature's exact share of
+    the log-odds. Format 1 artifacts have no baseline and explain against 0.
+    """
+
+    def __init__(self, feature_order: list, coef: np.ndarray, intercept: float, sha256: str,
+                 baseline: np.ndarray = None):
+        self.feature_order = feature_order
+        self.coef = coef
+        self.intercept = intercept
+        self.sha256 = sha256
+        self.baseline = baseline if baseline is not None else np.zeros_like(coef)
+        # log-odds of an employee at the baseline
+        self.base_log_odds = float(intercept + coef @ self.baseline)
+
+    @classmethod
+    def load(cls, path: Path) -> "LinearModel":
+        with open(path) as f:
+            artifact = json.load(f)
+
+        if artifact.get("format") != "linear-logistic":
+            raise ValueError(f"{path}: not a linear-logistic artifact")
+        if artifact.get("format_version") not in SUPPORTED_FORMAT_VERSIONS:
+            raise ValueError(f"{path}: unsupported format_version {artifact.get('format_version')}")
+
+        keys = ("feature_order", "coef", "intercept")
+        if artifact["format_version"] >= 2:
+            keys += ("baseline",)
+        payload = json.dumps({k: artifact[k] for k in keys}, sort_keys=True)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        if digest != artifact["sha256"]:
+            raise ValueError(f"{path}: content hash mismatch")
+
+        return cls(
+            feature_order=artifact["feature_order"],
+            coef=np.asarray(artifact["coef"], dtype=np.float64),
+            intercept=float(artifact["intercept"]),
+            sha256=digest,
+            baseline=np.asarray(artifact["baseline"], dtype=np.float64) if "baseline" in keys else None,
+        )
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        return X @ self.coef + self.intercept
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Return [[p_stay, p_leave], ...] like sklearn's predict_proba."""
+        z = self.decision_function(np.asarray(X, dtype=np.float64))
+        return _proba(z)
+
+    def contributions(self, X):
+        """Return ``(probs, C)``: predict_proba and the (n, features) log-odds contributions.
+
+        One pass: the rows of C plus ``base_log_odds`` sum to the decision function.
+        """
+        C = (np.asarray(X, dtype=np.float64) - self.baseline) * self.coef
+        return _proba(C.sum(axis=1) + self.base_log_odds), C
+
+
+def _proba(z: np.ndarray) -> np.ndarray:
+    p_leave = np.exp(-np.logaddexp(0.0, -z))
+    return np.column_stack((1.0 - p_leave, p_leave))
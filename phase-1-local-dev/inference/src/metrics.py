@@ -0,0 +1,210 @@
+"""Minimal in-process Prometheus metrics.
+
+Counters, gauges and fixed-bucket histograms rendered in the Prometheus text
+exposition format at ``GET /metrics``. Observing a value is a dict lookup,
+a bisect and a few additions under a lock, so it is cheap enough to call
+several times per request. Counter and histogram updates made inside
+``suppressed()`` are dropped.
+"""
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# seconds; tuned for a service whose model call is tens of microseconds
+LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001,
+                   0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384)
+
+REGISTRY = []
+
+_suppressed = contextvars.ContextVar("metrics_suppressed", default=False)
+
+
+@contextmanager
+def suppressed():
+    """Drop counter and histogram updates made in this context, e.g. by warm-up requests.
+
+    Gauges are left alone: they track current state, not traffic.
+    """
+    token = _suppressed.set(True)
+    try:
+        yield
+    finally:
+        _suppressed.reset(token)
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(child.render(self.name, self.labelnames, values))
+        return lines
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+    def render(self, name, labelnames, values):
+        return [f"{name}{_labels(labelnames, values)} {self.value:g}"]
+
+
+class _CounterValue(_Value):
+    def inc(self, amount: float = 1.0):
+        if not _suppressed.get():
+            super().inc(amount)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterValue()
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+
+class _HistogramValue:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        if _suppressed.get():
+            return
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    def observe_many(self, values):
+        if _suppressed.get():
+            return
+        indices = [bisect_left(self.buckets, v) for v in values]
+        with self._lock:
+            for i in indices:
+                self.counts[i] += 1
+            self.sum += sum(values)
+
+    def time(self):
+        return _Timer(self)
+
+    def render(self, name, labelnames, values):
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(labelnames, values, [('le', f'{bound:g}')])} {cumulative}")
+        cumulative += self.counts[-1]
+        lines.append(f"{name}_bucket{_labels(labelnames, values, [('le', '+Inf')])} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labelnames, values)} {self.sum:.9g}")
+        lines.append(f"{name}_count{_labels(labelnames, values)} {cumulative}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: _HistogramValue):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(name, help, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ------------------------------------------------------------
+# Service metrics
+# ------------------------------------------------------------
+REQUEST_LATENCY = Histogram(
+    "inference_request_duration_seconds", "End-to-end request latency inside the app", ["endpoint"])
+STAGE_LATENCY = Histogram(
+    "inference_stage_duration_seconds",
+    "Latency per stage: parse (body read + pydantic), derive (src.features.build_matrix), "
+    "queue (micro-batch wait), predict (predict_fn), serialize (response model + JSON)",
+    ["stage"])
+REQUESTS = Counter("inference_requests_total", "Requests by endpoint and status code", ["endpoint", "status"])
+ERRORS = Counter("inference_errors_total", "Failed requests by error type", ["endpoint", "type"])
+IN_FLIGHT = Gauge("inference_in_flight_requests", "Requests currently being handled")
+QUEUE_DEPTH = Gauge("inference_batcher_queue_depth", "Requests waiting in the micro-batcher queue")
+ROWS_SCORED = Counter("inference_rows_scored_total", "Rows scored by the model")
+MODEL_CALLS = Counter("inference_model_calls_total", "Invocations of predict_fn")
+BATCH_SIZE = Histogram("inference_model_batch_size", "Rows per predict_fn call", buckets=SIZE_BUCKETS)
+ADMISSION_IN_FLIGHT = Gauge("inference_admission_active_requests", "Scoring requests holding an admission slot")
+ADMISSION_QUEUE_DEPTH = Gauge("inference_admission_queue_depth", "Scoring requests waiting for an admission slot")
+ADMISSION_WAIT = Histogram("inference_admission_wait_seconds", "Time admitted requests waited for a slot")
+SHED = Counter("inference_shed_total", "Requests rejected by admission control: queue_full (429), deadline or timeout (503)", ["reason"])
+SHADOW_ROWS = Counter("inference_shadow_rows_total", "Rows offered to the shadow model: scored, dropped (queue full) or failed", ["outcome"])
+SHADOW_DISAGREEMENTS = Counter("inference_shadow_disagreements_total", "Shadow-scored rows whose 0/1 prediction differs from the primary's")
+SHADOW_TIER_FLIPS = Counter("inference_shadow_tier_flips_total", "Shadow-scored rows whose risk tier differs from the primary's", ["from_tier", "to_tier"])
+SHADOW_DELTA = Histogram(
+    "inference_shadow_p_leave_delta", "|candidate p_leave - primary p_leave| per shadow-scored row",
+    buckets=(0.0001, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5))
+SHADOW_QUEUE_ROWS = Gauge("inference_shadow_queue_rows", "Rows waiting for the shadow model")
+MODELS_RESIDENT = Gauge("inference_registry_resident_models", "Registry models currently loaded, besides MODEL_NAME")
+MODEL_LOADS = Counter("inference_registry_loads_total", "Registry artifact loads: loaded, or deduplicated by content hash", ["outcome"])
+MODEL_EVICTIONS = Counter("inference_registry_evictions_total", "Registry models unloaded, by reason (budget, idle)", ["reason"])
+MODEL_ROUTED = Counter("inference_routed_requests_total", "Scoring requests by the model they were routed to", ["model"])
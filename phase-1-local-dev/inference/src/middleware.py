@@ -0,0 +1,84 @@
+import time
+from src.metrics import REQUEST_LATENCY, STAGE_LATENCY, REQUESTS, ERRORS, IN_FLIGHT
+from src.profiler import PROFILER
+
+# status codes we raise on purpose, reported by name in inference_errors_total
+ERROR_TYPES = {413: "batch_too_large", 422: "validation_error", 429: "overloaded"}
+
+_SERIALIZE = STAGE_LATENCY.labels("serialize")
+_IN_FLIGHT = IN_FLIGHT.labels()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request latency, status and in-flight counts.
+
+    It stamps ``request.state.t_start`` for the handlers (so they can report
+    the parse stage) and records the serialize stage from
+    ``request.state.t_handler_done`` to the start of the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        state = scope.setdefault("state", {})
+        state["t_start"] = start
+        status = 500
+        raised = False
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                handler_done = state.get("t_handler_done")
+                if handler_done is not None:
+                    _SERIALIZE.observe(time.perf_counter() - handler_done)
+            await send(message)
+
+        _IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            raised = True
+            ERRORS.labels(self._endpoint(scope), type(e).__name__).inc()
+            raise
+        finally:
+            _IN_FLIGHT.dec()
+            endpoint = self._endpoint(scope)
+            REQUEST_LATENCY.labels(endpoint).observe(time.perf_counter() - start)
+            REQUESTS.labels(endpoint, status).inc()
+            if status >= 400 and not raised:
+                ERRORS.labels(endpoint, ERROR_TYPES.get(status, f"http_{status}")).inc()
+
+    @staticmethod
+    def _endpoint(scope) -> str:
+        # the route template keeps label cardinality bounded
+        route = scope.get("route")
+        return getattr(route, "path", "unmatched")
+
+
+class ProfilingMiddleware:
+    """Runs the sampling profiler while a randomly picked fraction of requests are in flight.
+
+    Costs one attribute check per request while ``PROFILER.sample_rate`` is 0.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (not PROFILER.sample_rate or scope["type"] != "http"
+                or scope["path"].startswith("/admin/profile") or not PROFILER.should_sample()):
+            await self.app(scope, receive, send)
+            return
+
+        PROFILER.begin()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            PROFILER.end()
@@ -0,0 +1,50 @@
+import hashlib
+import json
+import numpy as np
+from pathlib import Path
+
+
+class OnnxModel:
+    """The exported sklearn pipeline scored with ONNX Runtime on CPU.
+
+    Loads the ``model.onnx`` written by ``model_training/05_export.py --onnx``.
+    The graph contains the StandardScaler and the LogisticRegression, takes a
+    float64 ``input`` matrix in FEATURE_ORDER and returns ``probabilities``.
+    Needs only ``onnxruntime`` (and NumPy) at serving time, not scikit-learn.
+    """
+
+    def __init__(self, session, feature_order: list, sha256: str):
+        self.session = session
+        self.feature_order = feature_order
+        self.sha256 = sha256
+        inp = session.get_inputs()[0]
+        self._input_name = inp.name
+        self._dtype = np.float64 if inp.type == "tensor(double)" else np.float32
+
+    @classmethod
+    def load(cls, path: Path, intra_op_threads: int = 1) -> "OnnxModel":
+        import onnxruntime as ort
+
+        data = Path(path).read_bytes()
+        options = ort.SessionOptions()
+        # one scoring thread, like OMP_NUM_THREADS=1 for the NumPy engine;
+        # concurrency comes from gunicorn workers
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(data, options, providers=["CPUExecutionProvider"])
+
+        meta = session.get_modelmeta().custom_metadata_map
+        if "feature_order" not in meta:
+            raise ValueError(f"{path}: no feature_order metadata; re-export with 05_export.py --onnx")
+        outputs = [o.name for o in session.get_outputs()]
+        if "probabilities" not in outputs:
+            raise ValueError(f"{path}: no 'probabilities' output (exported with ZipMap?)")
+
+        return cls(session, json.loads(meta["feature_order"]), hashlib.sha256(data).hexdigest())
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Return [[p_stay, p_leave], ...] like sklearn's predict_proba."""
+        X = np.ascontiguousarray(X, dtype=self._dtype)
+        probs = self.session.run(["probabilities"], {self._input_name: X})[0]
+        return probs.astype(np.float64, copy=False)
@@ -1,43 +1,278 @@
-import joblib
+import contextvars
+import hashlib
+import threading
+import time
+import numpy as np
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-
-FEATURE_ORDER = [
-    "Years at Company", "Performance Rating", "Number of Promotions",
-    "Overtime", "Education Level", "Number of Dependents",
-    "Job Level", "Company Size", "Company Tenure", "Remote Work",
-    "Company Reputation", "OverallSatisfaction", "Opportunities",
-    "AnnualIncome", "AgeGroup", "RoleStagnationRatio", "TenureGap",
-    "EarlyCompanyTenureRisk", "LongTenureLowRoleRisk"
-]
+from typing import Callable, Optional
+from src.config import MODEL_PATH, PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL_S, ONNX_INTRA_OP_THREADS
+from src.linear_model import LinearModel
+from src.cache import PredictionCache
+from src.metrics import STAGE_LATENCY, ROWS_SCORED, MODEL_CALLS, BATCH_SIZE, suppressed
+from src.features import FEATURE_ORDER, build_matrix
+from src import tracing
 
 THRESHOLD = 0.50
 
+# Lower bounds of LOW / MEDIUM / HIGH; anything below the first is VERY_LOW
+TIER_BOUNDS = np.array([0.25, 0.45, 0.65])
+TIER_NAMES  = np.array(["VERY_LOW", "LOW", "MEDIUM", "HIGH"])
+
+# A typical mid-level employee, in FEATURE_ORDER; used to warm up new models
+WARMUP_ROW = [3.0, 3, 1, 0, 2, 0, 2, 2, 5.0, 0, 3, 3, 2, 2, 2, 0.5, 2.0, 0, 0]
+
+
+def tier_index(p_leave: np.ndarray) -> np.ndarray:
+    """Index into TIER_NAMES for each probability."""
+    return np.searchsorted(TIER_BOUNDS, p_leave, side="right")
+
+
+_DERIVE_STAGE  = STAGE_LATENCY.labels("derive")
+_PREDICT_STAGE = STAGE_LATENCY.labels("predict")
+_ROWS_SCORED   = ROWS_SCORED.labels()
+_MODEL_CALLS   = MODEL_CALLS.labels()
+_BATCH_SIZE    = BATCH_SIZE.labels()
+
+_FEATURE_NAMES = np.array(FEATURE_ORDER)
+
+# set inside Predictor.warming_up(); per context, so concurrent requests are unaffected
+_WARMING_UP = contextvars.ContextVar("warming_up", default=False)
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """Everything a request needs from one model version.
+
+    Requests read ``Predictor.model`` once and use that snapshot throughout,
+    so a concurrent swap never mixes two versions within one request.
+    """
+    predict_fn: Callable
+    version: str
+    path: str
+    loaded_at: float
+    # (X) -> (probs, per-feature log-odds contributions); linear artifacts only
+    explain_fn: Optional[Callable] = None
+    base_log_odds: Optional[float] = None
+
+
+def load_model(model_path: Path) -> LoadedModel:
+    explain_fn = base_log_odds = None
+    if model_path.suffix == ".json":
+        # compact NumPy-only artifact from model_training/05_export.py
+        model = LinearModel.load(model_path)
+        if model.feature_order != FEATURE_ORDER:
+            raise ValueError(f"{model_path}: feature order does not match FEATURE_ORDER")
+        predict_fn = model.predict_proba
+        version = model.sha256[:12]
+        explain_fn, base_log_odds = model.contributions, model.base_log_odds
+    elif model_path.suffix == ".onnx":
+        # full pipeline exported by 05_export.py --onnx — needs onnxruntime
+        from src.onnx_model import OnnxModel
+        model = OnnxModel.load(model_path, ONNX_INTRA_OP_THREADS)
+        if model.feature_order != FEATURE_ORDER:
+            raise ValueError(f"{model_path}: feature order does not match FEATURE_ORDER")
+        predict_fn = model.predict_proba
+        version = model.sha256[:12]
+    else:
+        # legacy pickle — needs joblib and scikit-learn installed
+        import joblib
+        obj = joblib.load(model_path)
+        predict_fn = obj.predict  # bound method — not the full sklearn object
+        version = hashlib.sha256(model_path.read_bytes()).hexdigest()[:12]
+
+    return LoadedModel(predict_fn, version, str(model_path), time.time(), explain_fn, base_log_odds)
+
 
 class Predictor:
     def __init__(self):
-        model_path = Path("artifacts/model.pkl")
-        obj = joblib.load(model_path)
-        self.predict_fn = obj.predict  # bound method — not the full sklearn object
+        self.cache = PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL_S) if PREDICTION_CACHE_SIZE > 0 else None
+        self._reload_lock = threading.Lock()
+        self.model = None
+        self.warmed = False  # set by src.warmup.warm_up
+        self.shadow = None   # src.shadow.ShadowScorer comparing a candidate model
+        self.load(Path(MODEL_PATH))
+
+    @property
+    def predict_fn(self):
+        return self.model.predict_fn
+
+    @property
+    def model_version(self) -> str:
+        return self.model.version
+
+    def load(self, model_path: Path) -> bool:
+        """Load, warm up and atomically swap in the model at ``model_path``.
+
+        Returns False when the artifact is the version already being served.
+        In-flight requests keep the snapshot they started with.
+        """
+        with self._reload_lock:
+            model = load_model(model_path)
+            if self.model is not None and model.version == self.model.version:
+                return False
+
+            model.predict_fn(np.array([WARMUP_ROW], dtype=np.float64))
+            self.model = model
+
+            # entries are keyed by version; drop the old ones to free memory
+            if self.cache is not None:
+                self.cache.clear()
+            return True
+
+    @contextmanager
+    def warming_up(self):
+        """Score synthetic rows without caching them, counting them in metrics or shadow-scoring them."""
+        token = _WARMING_UP.set(True)
+        try:
+            with suppressed():
+                yield
+        finally:
+            _WARMING_UP.reset(token)
 
     def is_loaded(self) -> bool:
-        return self.predict_fn is not None
+        return self.model is not None
+
+    def is_ready(self) -> bool:
+        return self.is_loaded() and self.warmed
 
     def predict(self, features: dict) -> dict:
-        values  = [[features[k] for k in FEATURE_ORDER]]
-        probs   = self.predict_fn(values)[0]
-        p_stay  = float(probs[0])
-        p_leave = float(probs[1])
-
-        return {
-            "prediction": int(p_leave >= THRESHOLD),
-            "p_leave":    round(p_leave, 4),
-            "p_stay":     round(p_stay, 4),
-            "risk":       self._tier(p_leave),
-            "threshold":  THRESHOLD,
-        }
-
-    def _tier(self, prob: float) -> str:
-        if prob >= 0.65: return "HIGH"
-        if prob >= 0.45: return "MEDIUM"
-        if prob >= 0.25: return "LOW"
-        return "VERY_LOW"
\ No newline at end of file
+        return self.predict_batch([features])[0]
+
+    def predict_batch(self, records: list) -> list:
+        """Score full FEATURE_ORDER records (derived features included) in one model call."""
+        X = np.array([[r[k] for k in FEATURE_ORDER] for r in records], dtype=np.float64)
+        return self._predict(X, self.model)
+
+    def predict_raw(self, rows: list, top_k: int = 0, model: LoadedModel = None) -> list:
+        """Score raw rows in RAW_FIELDS order (``EmployeeFeatures.to_row``).
+
+        The derived features are computed for the whole batch at once. With
+        ``top_k`` each result also carries its ``top_k`` largest feature
+        contributions (see ``explain_matrix``). ``model`` defaults to the
+        served model; the registry passes others.
+        """
+        model = model or self.model
+        with _DERIVE_STAGE.time(), tracing.stage("derive"):
+            X = build_matrix(rows)
+        if top_k:
+            return self.explain_matrix(X, top_k, model)
+        return self._predict(X, model)
+
+    def _predict(self, X: np.ndarray, model: LoadedModel) -> list:
+        if self.cache is not None and not _WARMING_UP.get():
+            return self._predict_cached(X, model)
+        return self.predict_matrix(X, model)
+
+    def _predict_cached(self, X: np.ndarray, model: LoadedModel) -> list:
+        results = [None] * len(X)
+        claimed = {}   # key -> (future, [row indices])
+        waiting = []   # (row index, future owned by another caller or an earlier row)
+
+        for i, row_key in enumerate(self.cache.keys(X)):
+            key = (model.version,) + row_key
+            if key in claimed:
+                claimed[key][1].append(i)
+                continue
+            hit, future, owner = self.cache.get_or_claim(key)
+            if hit is not None:
+                results[i] = dict(hit)
+            elif owner:
+                claimed[key] = (future, [i])
+            else:
+                waiting.append((i, future))
+
+        # compute our own claims before waiting on anyone else's, so two
+        # overlapping batches can never wait on each other
+        if claimed:
+            keys = list(claimed)
+            try:
+                computed = self.predict_matrix(np.array([k[1:] for k in keys], dtype=np.float64), model)
+            except Exception as e:
+                for key in keys:
+                    self.cache.abandon(key, claimed[key][0], e)
+                raise
+            for key, result in zip(keys, computed):
+                future, indices = claimed[key]
+                self.cache.fulfil(key, future, result)
+                for i in indices:
+                    results[i] = dict(result)
+
+        for i, future in waiting:
+            results[i] = dict(future.result())
+
+        return results
+
+    def score_matrix(self, X: np.ndarray, model: LoadedModel = None):
+        """Return ``(probs, version)`` where probs is the (n, 2) [p_stay, p_leave] array."""
+        model = model or self.model
+        with _PREDICT_STAGE.time(), tracing.stage("predict"):
+            probs = np.asarray(model.predict_fn(X))
+        self._offer_shadow(X, probs, model)
+        _MODEL_CALLS.inc()
+        _ROWS_SCORED.inc(len(X))
+        _BATCH_SIZE.observe(len(X))
+        return probs, model.version
+
+    def predict_matrix(self, X: np.ndarray, model: LoadedModel = None) -> list:
+        """Score an (n, len(FEATURE_ORDER)) matrix already in FEATURE_ORDER."""
+        return self._results(*self.score_matrix(X, model))
+
+    def explain_matrix(self, X: np.ndarray, top_k: int, model: LoadedModel = None) -> list:
+        """Score X and attach each row's ``top_k`` log-odds contributions by magnitude.
+
+        The contributions come out of the same vectorized pass as the
+        probabilities; they are not cached.
+        """
+        model = model or self.model
+        if model.explain_fn is None:
+            raise ValueError(f"model {model.version} ({Path(model.path).suffix}) does not support explanations")
+
+        with _PREDICT_STAGE.time(), tracing.stage("predict"):
+            probs, C = model.explain_fn(X)
+            top = np.argsort(-np.abs(C), axis=1)[:, :top_k]
+            contributions = np.round(np.take_along_axis(C, top, axis=1), 4).tolist()
+            values = np.take_along_axis(X, top, axis=1).tolist()
+            names = _FEATURE_NAMES[top].tolist()
+        self._offer_shadow(X, probs, model)
+        _MODEL_CALLS.inc()
+        _ROWS_SCORED.inc(len(X))
+        _BATCH_SIZE.observe(len(X))
+
+        results = self._results(probs, model.version)
+        base = round(model.base_log_odds, 4)
+        for result, row_names, row_values, row_contribs in zip(results, names, values, contributions):
+            result["base_log_odds"] = base
+            result["contributions"] = [
+                {"feature": n, "value": v, "contribution": c}
+                for n, v, c in zip(row_names, row_values, row_contribs)
+            ]
+        return results
+
+    def _offer_shadow(self, X: np.ndarray, probs: np.ndarray, model: LoadedModel):
+        shadow = self.shadow
+        # only traffic for the served model; registry models are not what the candidate would replace
+        if shadow is not None and model is self.model and not _WARMING_UP.get():
+            shadow.offer(X, probs[:, 1], model.version)
+
+    def _results(self, probs: np.ndarray, version: str) -> list:
+        p_stay  = probs[:, 0]
+        p_leave = probs[:, 1]
+
+        return [
+            {
+                "prediction":    int(pred),
+                "p_leave":       pl,
+                "p_stay":        ps,
+                "risk":          risk,
+                "threshold":     THRESHOLD,
+                "model_version": version,
+            }
+            for pred, pl, ps, risk in zip(
+                (p_leave >= THRESHOLD).tolist(),
+                np.round(p_leave, 4).tolist(),
+                np.round(p_stay, 4).tolist(),
+                TIER_NAMES[tier_index(p_leave)].tolist(),
+            )
+        ]
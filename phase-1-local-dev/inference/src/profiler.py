@@ -0,0 +1,136 @@
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from src.config import PROFILE_SAMPLE_RATE, PROFILE_INTERVAL_MS
+
+# leaf frames of threads that are parked, not working (event loop select,
+# idle threadpool workers); dropped unless include_idle is set
+IDLE_LEAVES = {("selectors.py", "select"), ("threading.py", "wait"), ("queue.py", "get"), ("thread.py", "_worker")}
+
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler for a random fraction of requests.
+
+    ``ProfilingMiddleware`` calls ``should_sample`` once per request. For the
+    requests it picks, it brackets them with ``begin``/``end``. While any
+    picked request is in flight, a daemon thread snapshots every thread's
+    stack with ``sys._current_frames()`` every ``interval_ms``. The snapshots
+    are counted as collapsed stacks (``thread;outer;...;leaf count``), the
+    input format of flamegraph.pl and speedscope.
+
+    With ``sample_rate == 0`` the only cost is one attribute check per
+    request, and the thread is never started.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, interval_ms: float = 5.0, max_stacks: int = 20000):
+        self.sample_rate = sample_rate
+        self.interval_s = interval_ms / 1000
+        self.max_stacks = max_stacks
+        self.include_idle = False
+
+        self._lock = threading.Lock()
+        self._active = 0
+        self._wake = threading.Event()
+        self._thread = None
+        self._stacks = Counter()
+        self.samples = 0
+        self.sampled_requests = 0
+        self.dropped_stacks = 0
+        self.started_at = time.time()
+
+    def configure(self, sample_rate: float, interval_ms: float = None, include_idle: bool = None):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.sample_rate = sample_rate
+        if interval_ms is not None:
+            if interval_ms <= 0:
+                raise ValueError("interval_ms must be positive")
+            self.interval_s = interval_ms / 1000
+        if include_idle is not None:
+            self.include_idle = include_idle
+
+    def should_sample(self) -> bool:
+        return random.random() < self.sample_rate
+
+    def begin(self):
+        with self._lock:
+            self._active += 1
+            self.sampled_requests += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def end(self):
+        with self._lock:
+            self._active -= 1
+            if self._active == 0:
+                self._wake.clear()
+
+    def _run(self):
+        me = threading.get_ident()
+        while True:
+            self._wake.wait()
+            self._sample(me)
+            time.sleep(self.interval_s)
+
+    def _sample(self, skip_ident: int):
+        names = {t.ident: t.name for t in threading.enumerate()}
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == skip_ident:
+                continue
+            code = frame.f_code
+            if not self.include_idle and (code.co_filename.rsplit("/", 1)[-1], code.co_name) in IDLE_LEAVES:
+                continue
+            parts = []
+            while frame is not None:
+                code = frame.f_code
+                parts.append(f"{code.co_name} ({_short(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            parts.append(names.get(ident, f"thread-{ident}").replace(" ", "_"))
+            stacks.append(";".join(reversed(parts)))
+
+        with self._lock:
+            self.samples += 1
+            for stack in stacks:
+                if stack in self._stacks or len(self._stacks) < self.max_stacks:
+                    self._stacks[stack] += 1
+                else:
+                    self.dropped_stacks += 1
+
+    def collapsed(self) -> str:
+        """Aggregated stacks, one ``frame;frame;... count`` line each, hottest first."""
+        with self._lock:
+            return "".join(f"{stack} {n}\n" for stack, n in self._stacks.most_common())
+
+    def reset(self):
+        with self._lock:
+            self._stacks.clear()
+            self.samples = self.sampled_requests = self.dropped_stacks = 0
+            self.started_at = time.time()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled":          self.sample_rate > 0,
+                "sample_rate":      self.sample_rate,
+                "interval_ms":      self.interval_s * 1000,
+                "include_idle":     self.include_idle,
+                "sampled_requests": self.sampled_requests,
+                "in_flight":        self._active,
+                "samples":          self.samples,
+                "distinct_stacks":  len(self._stacks),
+                "dropped_stacks":   self.dropped_stacks,
+                "since":            self.started_at,
+            }
+
+
+def _short(filename: str) -> str:
+    """Last two path components, e.g. ``src/predictor.py`` or ``fastapi/routing.py``."""
+    return "/".join(filename.replace("\\", "/").rsplit("/", 2)[-2:])
+
+
+PROFILER = SamplingProfiler(PROFILE_SAMPLE_RATE, PROFILE_INTERVAL_MS)
@@ -0,0 +1,280 @@
+"""Several named models in one service, routed per request.
+
+``MODEL_NAME`` always serves ``MODEL_PATH`` through the Predictor, with hot
+reload and warm-up. ``MODEL_REGISTRY_PATH`` can name more artifacts, and
+weighted splits across them, in a JSON file:
+
+    {
+      "models":  {"attrition-eu": "artifacts/eu/model.json",
+                  "attrition-candidate": "artifacts/candidate.json"},
+      "splits":  {"ab-test": {"employee-attrition": 90, "attrition-candidate": 10}},
+      "default": "ab-test"
+    }
+
+A request picks a name with the ``X-Model-Name`` header or the
+``/models/{name}/...`` path, or else uses ``default``. A split name picks
+one of its models by weight, stably per ``X-Routing-Key`` when the caller
+sends one. Artifacts are loaded on first use and warmed up. Two names whose
+artifacts have the same content hash share one loaded model. Models other
+than ``MODEL_NAME`` are evicted, least recently used first, when their
+artifact sizes exceed ``MODEL_MEMORY_BUDGET_MB`` or when they have been
+idle for ``MODEL_IDLE_TTL_S``. An evicted model is loaded again on its
+next request.
+"""
+import json
+import logging
+import random
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+from src.metrics import MODELS_RESIDENT, MODEL_LOADS, MODEL_EVICTIONS, MODEL_ROUTED
+from src.predictor import WARMUP_ROW, load_model
+
+logger = logging.getLogger(__name__)
+
+_RESIDENT = MODELS_RESIDENT.labels()
+
+
+class UnknownModel(KeyError):
+    pass
+
+
+class _Resident:
+    __slots__ = ("model", "size", "names", "last_used")
+
+    def __init__(self, model, size: int):
+        self.model = model
+        self.size = size
+        self.names = set()
+        self.last_used = time.monotonic()
+
+
+class ModelRegistry:
+    def __init__(self, predictor, default_name: str, memory_budget_mb: float = 256, idle_ttl_s: float = 0):
+        self.predictor = predictor
+        self.default_name = default_name
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.idle_ttl_s = idle_ttl_s
+
+        self._lock = threading.Lock()
+        self._paths = {}                 # name -> artifact path
+        self._splits = {}                # name -> (model names, cumulative weights)
+        self._route_default = default_name
+        self._resident = OrderedDict()   # model version -> _Resident, least recently used first
+        self._versions = {}              # name -> version of its resident model
+
+        self._stop = threading.Event()
+        self._thread = None
+        # called with each name whose model is evicted or unconfigured, from whichever thread did it
+        self.on_unload = None
+
+        # stats
+        self.loads = 0
+        self.deduplicated = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------
+    def configure(self, config: dict, base_dir: Path = Path(".")):
+        """Replace the named models and splits; resident models no longer named are dropped."""
+        paths = {}
+        for name, path in (config.get("models") or {}).items():
+            if name == self.default_name:
+                raise ValueError(f"'{name}' is MODEL_NAME; it always serves MODEL_PATH")
+            path = Path(path) if Path(path).is_absolute() else base_dir / path
+            if not path.exists():
+                raise ValueError(f"model '{name}': {path} does not exist")
+            paths[name] = path
+
+        known = set(paths) | {self.default_name}
+        splits = {}
+        for name, weights in (config.get("splits") or {}).items():
+            if name in known:
+                raise ValueError(f"split '{name}' has the same name as a model")
+            missing = [m for m in weights if m not in known]
+            if missing:
+                raise ValueError(f"split '{name}' refers to unknown model(s) {missing}")
+            if not weights or any(w <= 0 for w in weights.values()):
+                raise ValueError(f"split '{name}' needs positive weights")
+            cumulative = np.cumsum(list(weights.values()), dtype=np.float64)
+            splits[name] = (list(weights), cumulative / cumulative[-1])
+
+        default = config.get("default", self.default_name)
+        if default not in known and default not in splits:
+            raise ValueError(f"default '{default}' is neither a model nor a split")
+
+        with self._lock:
+            for name in set(self._versions) - set(paths):
+                self._unname(name)
+            for name, path in paths.items():
+                if name in self._versions and self._paths.get(name) != path:
+                    self._unname(name)
+            self._paths, self._splits, self._route_default = paths, splits, default
+
+    def load_file(self, path: Path):
+        path = Path(path)
+        with open(path) as f:
+            self.configure(json.load(f), base_dir=path.parent)
+
+    # ------------------------------------------------------------
+    # Routing and lookup
+    # ------------------------------------------------------------
+    def resolve(self, name: str = None, routing_key: str = None) -> str:
+        """Turn a requested name (or None for the default) into a model name."""
+        name = name or self._route_default
+        split = self._splits.get(name)
+        if split is not None:
+            names, cumulative = split
+            if routing_key:
+                u = zlib.crc32(routing_key.encode()) / 2 ** 32
+            else:
+                u = random.random()
+            name = names[min(int(np.searchsorted(cumulative, u, side="right")), len(names) - 1)]
+        if name != self.default_name and name not in self._paths:
+            raise UnknownModel(name)
+        MODEL_ROUTED.labels(name).inc()
+        return name
+
+    def peek(self, name: str):
+        """The resident model for ``name``, or None if it has to be loaded first."""
+        if name == self.default_name:
+            return self.predictor.model
+        entry = self._resident.get(self._versions.get(name))
+        if entry is not None:
+            entry.last_used = time.monotonic()
+        return entry.model if entry is not None else None
+
+    def get(self, name: str):
+        """The model for ``name``, loading it if needed (blocking; call from a thread)."""
+        model = self.peek(name)
+        if model is not None:
+            return model
+        with self._lock:
+            model = self.peek(name)
+            if model is not None:
+                return model
+            if name not in self._paths:
+                raise UnknownModel(name)
+            return self._load(name)
+
+    def _load(self, name: str):
+        path = self._paths[name]
+        start = time.perf_counter()
+        model = load_model(path)
+
+        entry = self._resident.get(model.version)
+        if entry is None and model.version == self.predictor.model.version:
+            # same content as MODEL_PATH: share the Predictor's copy
+            entry = self._resident[model.version] = _Resident(self.predictor.model, path.stat().st_size)
+        if entry is None:
+            model.predict_fn(np.array([WARMUP_ROW], dtype=np.float64))
+            entry = self._resident[model.version] = _Resident(model, path.stat().st_size)
+            self.loads += 1
+            MODEL_LOADS.labels("loaded").inc()
+            logger.info("loaded model '%s' (%s) from %s in %.1f ms",
+                        name, model.version, path, (time.perf_counter() - start) * 1000)
+        else:
+            self.deduplicated += 1
+            MODEL_LOADS.labels("deduplicated").inc()
+
+        entry.names.add(name)
+        entry.last_used = time.monotonic()
+        self._resident.move_to_end(model.version)
+        self._versions[name] = model.version
+        self._evict(keep=model.version)
+        _RESIDENT.set(len(self._resident))
+        return entry.model
+
+    # ------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------
+    def _unloaded(self, names):
+        if self.on_unload is not None:
+            for name in names:
+                self.on_unload(name)
+
+    def _unname(self, name: str):
+        version = self._versions.pop(name, None)
+        self._unloaded([name])
+        entry = self._resident.get(version)
+        if entry is not None:
+            entry.names.discard(name)
+            if not entry.names:
+                del self._resident[version]
+                _RESIDENT.set(len(self._resident))
+
+    def _drop(self, version: str, reason: str):
+        entry = self._resident.pop(version)
+        for name in entry.names:
+            self._versions.pop(name, None)
+        self._unloaded(entry.names)
+        self.evictions += 1
+        MODEL_EVICTIONS.labels(reason).inc()
+        logger.info("evicted model %s (%s): %s", version, ", ".join(sorted(entry.names)), reason)
+
+    def _evict(self, keep: str = None):
+        if self.idle_ttl_s > 0:
+            cutoff = time.monotonic() - self.idle_ttl_s
+            for version in [v for v, e in self._resident.items() if e.last_used < cutoff and v != keep]:
+                self._drop(version, "idle")
+
+        total = sum(e.size for e in self._resident.values())
+        for version in list(self._resident):
+            if total <= self.memory_budget:
+                break
+            if version == keep:
+                continue
+            total -= self._resident[version].size
+            self._drop(version, "budget")
+
+        # peek() updates last_used without reordering; restore LRU order
+        self._resident = OrderedDict(sorted(self._resident.items(), key=lambda item: item[1].last_used))
+        _RESIDENT.set(len(self._resident))
+
+    def start(self):
+        """Evict idle models in the background (only with an idle TTL)."""
+        if self.idle_ttl_s > 0:
+            self._thread = threading.Thread(target=self._run, name="model-registry", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    def _run(self):
+        while not self._stop.wait(max(self.idle_ttl_s / 2, 1.0)):
+            with self._lock:
+                self._evict()
+
+    # ------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------
+    def names(self) -> list:
+        return [self.default_name, *self._paths, *self._splits]
+
+    def stats(self) -> dict:
+        with self._lock:
+            models = {self.default_name: {
+                "path": self.predictor.model.path, "resident": True, "version": self.predictor.model_version,
+            }}
+            for name, path in self._paths.items():
+                version = self._versions.get(name)
+                models[name] = {"path": str(path), "resident": version is not None, "version": version}
+            return {
+                "default":         self._route_default,
+                "models":          models,
+                "splits":          {n: dict(zip(names, np.diff(cum, prepend=0.0).round(4).tolist()))
+                                    for n, (names, cum) in self._splits.items()},
+                "resident":        len(self._resident),
+                "resident_bytes":  sum(e.size for e in self._resident.values()),
+                "memory_budget":   self.memory_budget,
+                "idle_ttl_s":      self.idle_ttl_s,
+                "loads":           self.loads,
+                "deduplicated":    self.deduplicated,
+                "evictions":       self.evictions,
+            }
@@ -0,0 +1,69 @@
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class ModelWatcher:
+    """Poll the model artifact and hot-swap it into the Predictor when it changes.
+
+    A change in mtime or size triggers ``Predictor.load``, which loads and
+    warms the new model before swapping it in. A failed load keeps the
+    current model serving and is reported through ``last_error``.
+    """
+
+    def __init__(self, predictor, path: Path, interval_s: float):
+        self.predictor = predictor
+        self.path = Path(path)
+        self.interval_s = interval_s
+        self.last_error = None
+        self.last_reload_at = None
+
+        self._stamp = self._stat()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_s + 1)
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            stamp = self._stat()
+            if stamp is None or stamp == self._stamp:
+                continue
+            self._stamp = stamp
+            try:
+                self.reload()
+            except Exception:
+                pass  # logged in reload(); retried on the next change
+
+    def reload(self) -> dict:
+        previous = self.predictor.model_version
+        try:
+            changed = self.predictor.load(self.path)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            logger.error("model reload from %s failed, keeping %s: %s", self.path, previous, self.last_error)
+            raise
+
+        self.last_error = None
+        self.last_reload_at = time.time()
+        if changed:
+            logger.info("model reloaded from %s: %s -> %s", self.path, previous, self.predictor.model_version)
+        return {"previous": previous, "current": self.predictor.model_version, "changed": changed}
@@ -1,7 +1,12 @@
-from pydantic import BaseModel, Field
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from src.features import FEATURE_ORDER, RAW_FIELDS, build_matrix
 
 
 class EmployeeFeatures(BaseModel):
+    # NaN/Infinity would score as p_leave null with risk HIGH; columnar.to_matrix rejects them too
+    model_config = ConfigDict(allow_inf_nan=False)
+
     years_at_company:     float = Field(..., example=3.0)
     performance_rating:   float = Field(..., example=3.0,  description="1=Low, 2=Below Avg, 3=Avg, 4=High")
     no_of_promotions:     int   = Field(..., example=1)
@@ -18,33 +23,19 @@ class EmployeeFeatures(BaseModel):
     annual_income:        int   = Field(..., example=2,    description="0=Under 2.4L, 1=2.4-4.2L, 2=4.2-6L, 3=6-20L, 4=Above 20L")
     age_group:            int   = Field(..., example=2,    description="1=18-25, 2=25-35, 3=35-45, 4=45-60, 5=60-65")
 
+    def to_row(self) -> tuple:
+        """Raw feature values in RAW_FIELDS order, ready for ``Predictor.predict_raw``."""
+        return tuple(getattr(self, f) for f in RAW_FIELDS)
+
     def to_model_input(self) -> dict:
         """Compute derived features and return the full ordered record."""
-        yac = self.years_at_company
-        ct  = self.company_tenure
-        jl  = self.job_level
-
-        return {
-            "Years at Company":        yac,
-            "Performance Rating":      self.performance_rating,
-            "Number of Promotions":    self.no_of_promotions,
-            "Overtime":                self.overtime,
-            "Education Level":         self.edu_level,
-            "Number of Dependents":    self.no_of_dependents,
-            "Job Level":               jl,
-            "Company Size":            self.company_size,
-            "Company Tenure":          ct,
-            "Remote Work":             self.remote_work,
-            "Company Reputation":      self.company_reputation,
-            "OverallSatisfaction":     self.overall_satisfaction,
-            "Opportunities":           self.opportunities,
-            "AnnualIncome":            self.annual_income,
-            "AgeGroup":                self.age_group,
-            "RoleStagnationRatio":     round(yac / (ct + 1), 3),
-            "TenureGap":               round(ct - yac, 2),
-            "EarlyCompanyTenureRisk":  1 if yac <= 2 else 0,
-            "LongTenureLowRoleRisk":   1 if (ct > 5 and jl <= 2) else 0,
-        }
+        return dict(zip(FEATURE_ORDER, build_matrix([self.to_row()])[0].tolist()))
+
+
+class Contribution(BaseModel):
+    feature:      str   = Field(..., example="Overtime", description="Name from FEATURE_ORDER")
+    value:        float = Field(..., example=1.0,        description="The feature's value for this employee")
+    contribution: float = Field(..., example=0.2910,     description="Log-odds added to base_log_odds; positive pushes towards Leave")
 
 
 class PredictionResponse(BaseModel):
@@ -52,4 +43,16 @@ class PredictionResponse(BaseModel):
     p_leave:    float = Field(..., example=0.73)
     p_stay:     float = Field(..., example=0.27)
     risk:       str   = Field(..., example="HIGH",   description="VERY_LOW / LOW / MEDIUM / HIGH")
-    threshold:  float = Field(..., example=0.50)
\ No newline at end of file
+    threshold:  float = Field(..., example=0.50)
+    model_version: str = Field(..., example="cc3c986801e9", description="Content hash of the model that scored this row")
+    base_log_odds: Optional[float] = Field(None, example=-0.41, description="explain=true: log-odds of the baseline employee")
+    contributions: Optional[List[Contribution]] = Field(
+        None, description="explain=true: the top_k features by |contribution|, largest first")
+
+
+class BatchPredictionRequest(BaseModel):
+    instances: List[EmployeeFeatures] = Field(..., min_length=1, description="Employee records to score in one call")
+
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[PredictionResponse] = Field(..., description="One result per instance, in request order")
@@ -0,0 +1,172 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+import numpy as np
+from src.predictor import THRESHOLD, TIER_NAMES, tier_index
+from src.metrics import SHADOW_ROWS, SHADOW_DISAGREEMENTS, SHADOW_TIER_FLIPS, SHADOW_DELTA, SHADOW_QUEUE_ROWS
+
+logger = logging.getLogger(__name__)
+
+_SCORED = SHADOW_ROWS.labels("scored")
+_DROPPED = SHADOW_ROWS.labels("dropped")
+_FAILED = SHADOW_ROWS.labels("failed")
+_DISAGREEMENTS = SHADOW_DISAGREEMENTS.labels()
+_QUEUE_ROWS = SHADOW_QUEUE_ROWS.labels()
+_DELTA = SHADOW_DELTA.labels()
+
+
+class ShadowScorer:
+    """Score live traffic with a candidate model off the request path.
+
+    ``Predictor.score_matrix`` calls ``offer`` with every matrix it scored
+    and the primary model's probabilities. ``offer`` only appends references
+    to a bounded queue. When ``max_queue_rows`` are already waiting, the work
+    is dropped and counted. A daemon thread, at the lowest CPU priority,
+    scores queued rows with the candidate in batches of up to
+    ``batch_size``. It then compares the results with the primary's:
+    agreement on the 0/1 prediction, the size of the p_leave delta, and
+    risk-tier flips.
+    """
+
+    def __init__(self, candidate, max_queue_rows: int = 10000, batch_size: int = 1024):
+        self.candidate = candidate  # a LoadedModel
+        self.max_queue_rows = max_queue_rows
+        self.batch_size = batch_size
+
+        self._cond = threading.Condition()
+        self._queue = deque()  # (X, primary p_leave, primary version)
+        self._queued_rows = 0
+        self._stop = False
+        self._thread = None
+
+        self._reset_stats()
+
+    def _reset_stats(self):
+        n_tiers = len(TIER_NAMES)
+        self.rows = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.agreements = 0
+        self.delta_sum = 0.0
+        self.delta_max = 0.0
+        self.tier_flips = np.zeros((n_tiers, n_tiers), dtype=np.int64)
+        self.primary_versions = set()
+        self.busy_s = 0.0
+        self.started_at = time.time()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def offer(self, X: np.ndarray, p_leave: np.ndarray, primary_version: str):
+        """Queue a scored matrix for the candidate; never blocks."""
+        n = len(X)
+        with self._cond:
+            if self._queued_rows + n > self.max_queue_rows:
+                self.dropped += n
+                _DROPPED.inc(n)
+                return
+            self._queue.append((X, p_leave, primary_version))
+            self._queued_rows += n
+            _QUEUE_ROWS.set(self._queued_rows)
+            self._cond.notify()
+
+    def _take(self):
+        """Block until rows are queued; return up to batch_size of them (whole matrices)."""
+        with self._cond:
+            while not self._queue and not self._stop:
+                self._cond.wait()
+            if self._stop:
+                return None
+            items = [self._queue.popleft()]
+            rows = len(items[0][0])
+            while self._queue and rows + len(self._queue[0][0]) <= self.batch_size:
+                items.append(self._queue.popleft())
+                rows += len(items[-1][0])
+            self._queued_rows -= rows
+            _QUEUE_ROWS.set(self._queued_rows)
+        return items
+
+    def _run(self):
+        try:
+            # yield the CPU to the request threads (Linux applies nice per thread)
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except (AttributeError, OSError):
+            pass
+
+        while True:
+            items = self._take()
+            if items is None:
+                return
+            start = time.perf_counter()
+            X = items[0][0] if len(items) == 1 else np.concatenate([x for x, _, _ in items])
+            primary = items[0][1] if len(items) == 1 else np.concatenate([p for _, p, _ in items])
+            try:
+                candidate = np.asarray(self.candidate.predict_fn(X))[:, 1]
+            except Exception as e:
+                self.failed += len(X)
+                _FAILED.inc(len(X))
+                logger.warning("shadow model %s failed on %d rows: %s", self.candidate.version, len(X), e)
+                continue
+            self._compare(primary, candidate, {v for _, _, v in items})
+            self.busy_s += time.perf_counter() - start
+
+    def _compare(self, primary: np.ndarray, candidate: np.ndarray, primary_versions: set):
+        agree = (primary >= THRESHOLD) == (candidate >= THRESHOLD)
+        delta = np.abs(candidate - primary)
+        tiers_from = tier_index(primary)
+        tiers_to = tier_index(candidate)
+        flipped = tiers_from != tiers_to
+
+        n = len(primary)
+        n_agree = int(agree.sum())
+        self.rows += n
+        self.batches += 1
+        self.agreements += n_agree
+        self.delta_sum += float(delta.sum())
+        self.delta_max = max(self.delta_max, float(delta.max()))
+        np.add.at(self.tier_flips, (tiers_from[flipped], tiers_to[flipped]), 1)
+        self.primary_versions |= primary_versions
+
+        _SCORED.inc(n)
+        _DISAGREEMENTS.inc(n - n_agree)
+        _DELTA.observe_many(delta.tolist())
+        for i, j in zip(tiers_from[flipped].tolist(), tiers_to[flipped].tolist()):
+            SHADOW_TIER_FLIPS.labels(TIER_NAMES[i], TIER_NAMES[j]).inc()
+
+    def reset(self):
+        self._reset_stats()
+
+    def stats(self) -> dict:
+        flips = {
+            f"{TIER_NAMES[i]}->{TIER_NAMES[j]}": int(self.tier_flips[i, j])
+            for i, j in zip(*np.nonzero(self.tier_flips))
+        }
+        return {
+            "candidate_version":   self.candidate.version,
+            "candidate_path":      self.candidate.path,
+            "primary_versions":    sorted(self.primary_versions),
+            "rows":                self.rows,
+            "dropped_rows":        self.dropped,
+            "failed_rows":         self.failed,
+            "queued_rows":         self._queued_rows,
+            "batches":             self.batches,
+            "agreement":           round(self.agreements / self.rows, 6) if self.rows else None,
+            "mean_abs_delta":      round(self.delta_sum / self.rows, 6) if self.rows else None,
+            "max_abs_delta":       round(self.delta_max, 6),
+            "tier_flips":          flips,
+            "tier_flip_rate":      round(sum(flips.values()) / self.rows, 6) if self.rows else None,
+            "busy_s":              round(self.busy_s, 3),
+            "since":               self.started_at,
+        }
+
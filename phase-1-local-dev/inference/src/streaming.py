@@ -0,0 +1,185 @@
+"""Streaming NDJSON bulk scoring with bounded memory.
+
+The request body is consumed chunk by chunk, split into lines and scored
+``chunk_rows`` records at a time; each scored chunk is written out before
+the next one is read. Because the response is pulled by the client,
+a slow reader stops the input from being read (backpressure), so memory
+stays at roughly one chunk of rows regardless of the stream length.
+A line longer than ``max_line_bytes`` or a broken gzip body stops the
+stream (see StreamError).
+"""
+import zlib
+from typing import AsyncIterator
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from src.fastjson import dumps, loads
+from src.schemas import EmployeeFeatures
+
+
+class StreamError(ValueError):
+    """The request body cannot be read any further.
+
+    Raised out of the result stream only if nothing has been written yet, so
+    BodyStreamingResponse can still answer ``status_code``; later it ends the
+    stream with an error line instead.
+    """
+    status_code = 400
+
+
+class LineTooLong(StreamError):
+    """An input line is longer than ``max_line_bytes``."""
+    status_code = 413
+
+
+class InvalidGzip(StreamError):
+    """A ``Content-Encoding: gzip`` body that is not valid gzip or ends early."""
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """StreamingResponse that leaves ``receive`` to the request body reader.
+
+    On ASGI servers older than spec 2.4, Starlette's StreamingResponse reads
+    ``receive`` in the background to notice disconnects. That would swallow
+    the request body chunks that are still being scored. A disconnect still
+    ends the stream, because the next ``send`` fails.
+
+    The response starts once the first chunk of results is ready, so a
+    StreamError before then becomes its status code (413 or 400).
+    """
+
+    async def __call__(self, scope, receive, send):
+        body = self.body_iterator
+        try:
+            first = await body.__anext__()
+        except StopAsyncIteration:
+            first = None
+        except StreamError as e:
+            await JSONResponse({"detail": str(e)}, status_code=e.status_code)(scope, receive, send)
+            return
+
+        async def resumed():
+            if first is not None:
+                yield first
+            async for chunk in body:
+                yield chunk
+
+        self.body_iterator = resumed()
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def _lines(chunks: AsyncIterator[bytes], gzipped: bool, max_line_bytes: int) -> AsyncIterator[bytes]:
+    decoder = zlib.decompressobj(wbits=31) if gzipped else None
+    pending = b""
+
+    def split(data: bytes):
+        nonlocal pending
+        *complete, pending = (pending + data).split(b"\n")
+        if len(pending) > max_line_bytes or any(len(line) > max_line_bytes for line in complete):
+            raise LineTooLong(f"line longer than {max_line_bytes} bytes")
+        return complete
+
+    async for chunk in chunks:
+        if decoder is None:
+            for line in split(chunk):
+                yield line
+            continue
+        # inflate in bounded pieces, so a small gzipped body cannot expand past the line limit in memory
+        while chunk:
+            try:
+                data = decoder.decompress(chunk, max_line_bytes + 1)
+            except zlib.error as e:
+                raise InvalidGzip(f"invalid gzip body: {e}")
+            chunk = decoder.unconsumed_tail
+            for line in split(data):
+                yield line
+    if decoder is not None:
+        try:
+            data = decoder.flush()
+        except zlib.error as e:
+            raise InvalidGzip(f"invalid gzip body: {e}")
+        if not decoder.eof:
+            raise InvalidGzip("invalid gzip body: it ends before the end of the compressed stream")
+        for line in split(data):
+            yield line
+    if pending:
+        yield pending
+
+
+def _error(line_no: int, message: str) -> dict:
+    return {"line": line_no, "error": message}
+
+
+async def score_ndjson(chunks: AsyncIterator[bytes], predictor, chunk_rows: int, gzipped: bool = False,
+                       model=None, max_line_bytes: int = 65536) -> AsyncIterator[bytes]:
+    """Yield NDJSON result lines, one per non-empty input line, in input order.
+
+    A row that is not valid JSON or fails EmployeeFeatures validation yields
+    ``{"line": n, "error": ...}`` instead of failing the stream. An ``id`` key
+    on the input row is echoed back to help callers join results. ``model``
+    scores with a registry model instead of the served one.
+
+    A line longer than ``max_line_bytes`` or an invalid gzip body raises
+    StreamError if no results have been yielded yet. Otherwise the rows
+    before it are scored and the stream ends with an error line for it.
+    """
+    out = []   # results for the current chunk, None where a row is pending scoring
+    rows = []  # (index into out, line_no, id, raw row)
+
+    async def flush():
+        if rows:
+            scored = await run_in_threadpool(predictor.predict_raw, [r[3] for r in rows], 0, model)
+            for (idx, line_no, row_id, _), result in zip(rows, scored):
+                out[idx] = {"line": line_no, **({"id": row_id} if row_id is not None else {}), **result}
+        payload = b"".join(dumps(r) + b"\n" for r in out)
+        out.clear()
+        rows.clear()
+        return payload
+
+    line_no = 0
+    started = False
+    lines = _lines(chunks, gzipped, max_line_bytes)
+    while True:
+        try:
+            line = await lines.__anext__()
+        except StopAsyncIteration:
+            break
+        except StreamError as e:
+            if not started:
+                raise
+            out.append(_error(line_no + 1, f"{e}; stream stopped"))
+            break
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            obj = loads(line)
+            if not isinstance(obj, dict):
+                raise ValueError("expected a JSON object")
+            row_id = obj.pop("id", None)
+            features = EmployeeFeatures.model_validate(obj)
+        except ValidationError as e:
+            out.append(_error(line_no, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())))
+        except ValueError as e:
+            out.append(_error(line_no, f"invalid JSON: {e}"))
+        else:
+            rows.append((len(out), line_no, row_id, features.to_row()))
+            out.append(None)
+
+        if len(out) >= chunk_rows:
+            started = True
+            yield await flush()
+
+    if out:
+        yield await flush()
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    encoder = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        data = encoder.compress(chunk)
+        if data:
+            yield data
+    yield encoder.flush()
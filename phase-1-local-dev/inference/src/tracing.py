@@ -0,0 +1,240 @@
+"""Request tracing with W3C trace-context propagation and a JSON-lines exporter.
+
+This module has no dependencies, like src/metrics.py. ``TracingMiddleware``
+starts one span per request. It continues the caller's trace when a
+``traceparent`` header is present, so frontend and inference spans share a
+trace id. The request's stages are recorded as child spans: parse, derive,
+queue, predict and serialize, matching the stage names in
+``inference_stage_duration_seconds``.
+
+When a request is finished, all of its spans are written at once, one JSON
+object per line, to ``TRACE_EXPORTER``: ``console`` (stderr),
+``file:/path/traces.jsonl`` or ``none``. The field names follow
+OpenTelemetry (trace_id, span_id, parent_span_id, ...), so the output can
+be loaded into other tools unchanged.
+"""
+import contextvars
+import json
+import random
+import sys
+import threading
+import time
+from src.config import TRACE_EXPORTER, TRACE_SAMPLE_RATE
+
+# perf_counter -> Unix time
+_EPOCH_OFFSET = time.time() - time.perf_counter()
+
+_current = contextvars.ContextVar("trace_span", default=None)
+
+
+class Span:
+    """A request span; its stages are stored as finished child records."""
+
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "parent_id", "start", "attributes", "children")
+
+    def __init__(self, tracer, name: str, trace_id: str, parent_id: str = None, start: float = None):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.start = start if start is not None else time.perf_counter()
+        self.attributes = {}
+        self.children = []  # (name, start, end, attributes)
+
+    def record(self, name: str, start: float, end: float, attributes: dict = None):
+        self.children.append((name, start, end, attributes))
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def finish(self, end: float = None):
+        end = end if end is not None else time.perf_counter()
+        spans = [self._export(self.name, self.span_id, self.parent_id, self.start, end, self.attributes)]
+        for name, start, child_end, attributes in self.children:
+            spans.append(self._export(name, _new_id(8), self.span_id, start, child_end, attributes))
+        self.tracer.export(spans)
+
+    def _export(self, name, span_id, parent_id, start, end, attributes) -> dict:
+        return {
+            "service":        self.tracer.service,
+            "name":           name,
+            "trace_id":       self.trace_id,
+            "span_id":        span_id,
+            "parent_span_id": parent_id,
+            "start_time":     round(start + _EPOCH_OFFSET, 6),
+            "duration_ms":    round((end - start) * 1000, 3),
+            "attributes":     attributes or {},
+        }
+
+
+class Collector:
+    """Stand-in parent for work shared by several requests (a micro-batch).
+
+    Stages recorded into it are copied into each request's span afterwards.
+    """
+
+    def __init__(self):
+        self.children = []
+
+    def record(self, name: str, start: float, end: float, attributes: dict = None):
+        self.children.append((name, start, end, attributes))
+
+
+class Tracer:
+    def __init__(self, service: str, exporter: str = "console", sample_rate: float = 1.0):
+        self.service = service
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        if exporter == "none":
+            self._out = None
+        elif exporter == "console":
+            self._out = sys.stderr
+        elif exporter.startswith("file:"):
+            self._out = open(exporter[len("file:"):], "a", buffering=1)
+        else:
+            raise ValueError(f"TRACE_EXPORTER must be console, file:<path> or none, got {exporter!r}")
+
+    @property
+    def enabled(self) -> bool:
+        return self._out is not None and self.sample_rate > 0
+
+    def start_span(self, name: str, traceparent: str = None, start: float = None):
+        """Continue ``traceparent`` or start a new trace; None when not sampled."""
+        parent = _parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+            if not sampled:
+                return None
+        elif random.random() < self.sample_rate:
+            trace_id, parent_id = _new_id(16), None
+        else:
+            return None
+        return Span(self, name, trace_id, parent_id, start)
+
+    def export(self, spans: list):
+        lines = "".join(json.dumps(s, separators=(",", ":")) + "\n" for s in spans)
+        with self._lock:
+            self._out.write(lines)
+            self._out.flush()
+
+
+def _new_id(n_bytes: int) -> str:
+    return f"{random.getrandbits(n_bytes * 8):0{n_bytes * 2}x}"
+
+
+def _parse_traceparent(value: str):
+    """``00-<32 hex trace id>-<16 hex parent id>-<flags>`` -> (trace_id, parent_id, sampled)."""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or parts[1] == "0" * 32:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+TRACER = Tracer("inference", TRACE_EXPORTER, TRACE_SAMPLE_RATE)
+
+
+# ------------------------------------------------------------
+# Recording helpers; each is a cheap no-op outside a traced request
+# ------------------------------------------------------------
+def current():
+    return _current.get()
+
+
+def detach():
+    """Stop recording into whatever span the calling context inherited."""
+    _current.set(None)
+
+
+def record(name: str, start: float, end: float = None, **attributes):
+    parent = _current.get()
+    if parent is not None:
+        parent.record(name, start, end if end is not None else time.perf_counter(), attributes)
+
+
+class stage:
+    """``with tracing.stage("derive"):`` records the block as a child of the current span."""
+
+    __slots__ = ("name", "parent", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.parent = _current.get()
+        if self.parent is not None:
+            self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        if self.parent is not None:
+            self.parent.record(self.name, self.start, time.perf_counter())
+
+
+def collecting(fn, *args):
+    """Run ``fn(*args)`` with a Collector as the current span; returns ``(result, stages)``."""
+    collector = Collector()
+    token = _current.set(collector)
+    try:
+        return fn(*args), collector.children
+    finally:
+        _current.reset(token)
+
+
+# ------------------------------------------------------------
+# ASGI middleware
+# ------------------------------------------------------------
+# probes, scrapes and admin calls are not traced
+UNTRACED_PREFIXES = ("/health", "/ready", "/metrics", "/admin", "/stats", "/v2/health", "/docs", "/openapi.json")
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware: one span per request, named by its route template."""
+
+    def __init__(self, app, tracer: Tracer = None):
+        self.app = app
+        self.tracer = tracer or TRACER
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.tracer.enabled or scope["path"].startswith(UNTRACED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        span = self.tracer.start_span(scope["method"], traceparent)
+        if span is None:
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                handler_done = state.get("t_handler_done")
+                if handler_done is not None:
+                    span.record("serialize", handler_done, time.perf_counter())
+            await send(message)
+
+        token = _current.set(span)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", scope["path"])
+            span.name = f"{scope['method']} {route}"
+            span.attributes["http.route"] = route
+            span.attributes["http.status_code"] = status
+            span.finish()
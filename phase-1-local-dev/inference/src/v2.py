@@ -0,0 +1,180 @@
+"""KServe Open Inference Protocol (V2) endpoints.
+
+Clients send dense tensors with a leading batch dimension. Either one
+tensor of shape ``[n, 19]`` (FEATURE_ORDER) or ``[n, 15]`` (EmployeeFeatures
+field order), or one ``[n]`` tensor per column named by FEATURE_ORDER or by
+the EmployeeFeatures fields. The rows go straight into the model matrix.
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from pathlib import Path
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+from src import columnar
+from src.fastjson import FastJSONResponse, json_body, request_body
+from src.config import MAX_COLUMNAR_ROWS
+from src.predictor import FEATURE_ORDER, THRESHOLD, TIER_NAMES, tier_index
+from src.registry import UnknownModel
+
+# V2 datatype -> NumPy dtype for numeric input tensors
+DATATYPES = {
+    "BOOL": np.bool_, "UINT8": np.uint8, "UINT16": np.uint16, "UINT32": np.uint32, "UINT64": np.uint64,
+    "INT8": np.int8, "INT16": np.int16, "INT32": np.int32, "INT64": np.int64,
+    "FP16": np.float16, "FP32": np.float32, "FP64": np.float64,
+}
+
+# artifact suffix -> V2 "platform"
+PLATFORMS = {".pkl": "sklearn", ".onnx": "onnxruntime", ".json": "numpy-linear"}
+
+# the models score in float64, and JSON carries the float64 digits, so the outputs are declared FP64
+OUTPUTS = {
+    "probabilities": ("FP64", lambda probs: probs, lambda n: [n, 2]),
+    "prediction":    ("INT64", lambda probs: (probs[:, 1] >= THRESHOLD).astype(np.int64), lambda n: [n]),
+    "p_leave":       ("FP64", lambda probs: probs[:, 1], lambda n: [n]),
+    "risk":          ("BYTES", lambda probs: TIER_NAMES[tier_index(probs[:, 1])], lambda n: [n]),
+}
+
+
+class InferInput(BaseModel):
+    name: str
+    shape: List[int]
+    datatype: str
+    parameters: Optional[Dict[str, Any]] = None
+    # plain list: validating every element with pydantic would dominate for large tensors
+    data: list
+
+
+class RequestedOutput(BaseModel):
+    name: str
+    parameters: Optional[Dict[str, Any]] = None
+
+
+class InferRequest(BaseModel):
+    id: Optional[str] = None
+    parameters: Optional[Dict[str, Any]] = None
+    inputs: List[InferInput] = Field(..., min_length=1)
+    outputs: Optional[List[RequestedOutput]] = None
+
+
+class V2Error(Exception):
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def _tensor(tensor: InferInput) -> np.ndarray:
+    dtype = DATATYPES.get(tensor.datatype)
+    if dtype is None:
+        raise V2Error(f"input '{tensor.name}': unsupported datatype {tensor.datatype}")
+    try:
+        array = np.asarray(tensor.data, dtype=dtype)
+        return array.reshape(tensor.shape)
+    except (TypeError, ValueError) as e:
+        raise V2Error(f"input '{tensor.name}': data does not match shape {tensor.shape}: {e}")
+
+
+def to_matrix(request: InferRequest) -> np.ndarray:
+    if len(request.inputs) == 1 and len(request.inputs[0].shape) == 2:
+        data = _tensor(request.inputs[0])
+    else:
+        data = {}
+        for tensor in request.inputs:
+            array = _tensor(tensor)
+            if array.ndim != 1:
+                raise V2Error(f"input '{tensor.name}': per-column tensors must have shape [n]")
+            data[tensor.name] = array
+        if len({len(a) for a in data.values()}) > 1:
+            raise V2Error("per-column tensors must all have the same batch size")
+
+    try:
+        return columnar.to_matrix(data)
+    except columnar.ColumnarError as e:
+        raise V2Error(e.detail)
+
+
+def create_router(predictor, registry) -> APIRouter:
+    router = APIRouter(prefix="/v2", tags=["v2"])
+
+    def check_model(model_name: str) -> str:
+        """Resolve a model or split name from the path to a registry model name."""
+        try:
+            return registry.resolve(model_name)
+        except UnknownModel:
+            raise V2Error(f"model '{model_name}' not found", status_code=404)
+
+    async def get_model(name: str):
+        try:
+            return registry.peek(name) or await run_in_threadpool(registry.get, name)
+        except UnknownModel:
+            # removed by a concurrent /admin/models/reload
+            raise V2Error(f"model '{name}' not found", status_code=404)
+
+    @router.get("")
+    def server_metadata():
+        return {"name": "attrition-inference", "version": "1.0.0", "extensions": []}
+
+    @router.get("/health/live")
+    def server_live():
+        return {"live": True}
+
+    @router.get("/health/ready")
+    def server_ready():
+        return {"ready": predictor.is_ready()}
+
+    @router.get("/models/{model_name}")
+    async def model_metadata(model_name: str):
+        name = check_model(model_name)
+        model = await get_model(name)
+        return {
+            "name": name,
+            "versions": [model.version],
+            "platform": PLATFORMS.get(Path(model.path).suffix, "unknown"),
+            "inputs": [{"name": "input-0", "datatype": "FP64", "shape": [-1, len(FEATURE_ORDER)]}],
+            "outputs": [{"name": name, "datatype": dt, "shape": shape(-1)} for name, (dt, _, shape) in OUTPUTS.items()],
+            "parameters": {"feature_order": FEATURE_ORDER, "threshold": THRESHOLD},
+        }
+
+    @router.get("/models/{model_name}/ready")
+    def model_ready(model_name: str):
+        name = check_model(model_name)
+        return {"name": name, "ready": predictor.is_ready()}
+
+    @router.post("/models/{model_name}/infer", openapi_extra=request_body(InferRequest))
+    async def infer(model_name: str, request: InferRequest = Depends(json_body(InferRequest))):
+        name = check_model(model_name)
+        X = to_matrix(request)
+        if len(X) > MAX_COLUMNAR_ROWS:
+            raise V2Error(f"{len(X)} rows exceeds MAX_COLUMNAR_ROWS={MAX_COLUMNAR_ROWS}", status_code=413)
+
+        requested = [o.name for o in request.outputs] if request.outputs else list(OUTPUTS)
+        unknown = [output for output in requested if output not in OUTPUTS]
+        if unknown:
+            raise V2Error(f"unknown output(s): {', '.join(unknown)}")
+
+        model = await get_model(name)
+        probs, version = await run_in_threadpool(predictor.score_matrix, X, model)
+        outputs = []
+        for output in requested:
+            datatype, build, shape = OUTPUTS[output]
+            outputs.append({
+                "name": output,
+                "datatype": datatype,
+                "shape": shape(len(X)),
+                "data": build(probs).ravel().tolist(),
+            })
+
+        response = {"model_name": name, "model_version": version, "outputs": outputs}
+        if request.id is not None:
+            response["id"] = request.id
+        return FastJSONResponse(response)
+
+    return router
+
+
+async def v2_error_handler(request, exc: V2Error):
+    return JSONResponse({"error": exc.message}, status_code=exc.status_code)
@@ -21,8 +21,19 @@ PREPROCESSED_TEST_PATH = DATA_PREP_DIR / "test.csv"
 
 # Model artifacts
 ARTIFACT_DIR = BASE_DIR / "artifacts"
+BASE_MODEL_PATH = ARTIFACT_DIR / "model_base.pkl"   # 01_training.py; tuned into MODEL_PATH by 04_tuning.py
 MODEL_PATH = ARTIFACT_DIR / "model.pkl"
 METRICS_PATH = ARTIFACT_DIR / "metrics.json"
+LINEAR_MODEL_PATH = ARTIFACT_DIR / "model.json"
+ONNX_MODEL_PATH = ARTIFACT_DIR / "model.onnx"
+
+# Derived-feature transform shared with the inference service
+FEATURES_MODULE_PATH = BASE_DIR / "inference" / "src" / "features.py"
+# The service's NumPy scorer for LINEAR_MODEL_PATH; 05_export.py checks the artifact with it
+LINEAR_MODEL_MODULE_PATH = BASE_DIR / "inference" / "src" / "linear_model.py"
+
+# Stage cache of pipeline.py: output hashes, stage logs
+PIPELINE_STATE_DIR = BASE_DIR / ".pipeline"
 
 # Ensure directories exist
 os.makedirs(DATA_PREP_DIR, exist_ok=True)
@@ -1,5 +1,5 @@
 import pandas as pd
-from config.paths import EDA_PATH, CLEANING_PATH
+from config.paths import VALIDATION_PATH, CLEANING_PATH
 
 def clean_data(df):
     print("--- Find duplicates ---")
@@ -15,5 +15,6 @@ def clean_data(df):
     return df
 
 if __name__ == "__main__":
-    df = pd.read_csv(EDA_PATH)
+    # 03_eda.py writes its input back unchanged, so cleaning does not wait for the plots
+    df = pd.read_csv(VALIDATION_PATH)
     clean_data(df)
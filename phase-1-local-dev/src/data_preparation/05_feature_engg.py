@@ -6,87 +6,53 @@
 
 import pandas as pd
 from config.paths import CLEANING_PATH, FEATURED_PATH
+from features import DERIVED_FEATURES, derive_features
+from codebook import CODEBOOK_VERSION, CSV_DTYPES, encode, model_inputs
 
-def feature_data(df):
+def build_features(df):
+    """The featured frame 06_preprocessing.py splits, from the cleaned raw frame.
+
+    model_testing/feature_parity.py checks it against the service's build_matrix.
+    """
     df_fe = df.copy()
 
     # Encoding
     # ------------------------------------
-    # 1. Target column
-    df_fe['Attrition'] = df_fe['Attrition'].map({'Stayed': 0, 'Left': 1}).astype('int')
-
-
-    # 2. Binary Encoding
-    binary_cols = ["Remote Work", "Leadership Opportunities", "Innovation Opportunities", "Overtime"]
-    for col in binary_cols:
-        df_fe[col] = df_fe[col].map({"Yes": 1, "No": 0}).astype("Int64")
-
-
-    # ordinal encoding for features
-    ordinal_maps = {
-        "Work-Life Balance": { "Poor": 1, "Fair": 2, "Good": 3, "Excellent": 4 },
-        "Job Satisfaction": { "Low": 1, "Medium": 2, "High": 3, "Very High": 4 },
-        "Performance Rating": { "Low": 1, "Below Average": 2, "Average": 3, "High": 4 },
-        "Employee Recognition": { "Low": 1, "Medium": 2, "High": 3, "Very High": 4 },
-        "Company Reputation": { "Poor": 1, "Fair": 2, "Good": 3, "Excellent": 4 },
-        "Job Level": { "Entry": 1, "Mid": 2, "Senior": 3},
-        "Company Size": { "Small": 1, "Medium": 2, "Large": 3 },
-        "Education Level": {"High School": 1, "Bachelor’s Degree": 2, "Master’s Degree": 3, "Associate Degree": 4, "PhD": 5},
-    }
-
-    for col, mapping in ordinal_maps.items():
-        df_fe[col] = df_fe[col].map(mapping)
-
-
-    # Aggregate satisfaction
-    df_fe["OverallSatisfaction"] = ((df_fe["Work-Life Balance"] + df_fe["Job Satisfaction"] + df_fe["Employee Recognition"]) / 3).round().astype("Int64")
-    df_fe = df_fe.drop(columns=["Work-Life Balance", "Job Satisfaction", "Employee Recognition"])
-
-
-    df_fe['Opportunities'] = df_fe['Leadership Opportunities'] + df_fe['Innovation Opportunities']
-    df_fe = df_fe.drop(columns=['Leadership Opportunities', 'Innovation Opportunities'])
+    # Target, binary (Yes/No) and ordinal columns, with the fixed codes from src/codebook.py
+    df_fe, unknown = encode(df_fe)
+    if unknown:
+        print(f"Levels not in codebook v{CODEBOOK_VERSION} (encoded as missing): {unknown}")
+    df_fe['Attrition'] = df_fe['Attrition'].astype('int')
+
+
+    # 1. Model inputs, built by the same code as the frontend's CSV upload (src/codebook.py):
+    #   Years at Company, Company Tenure converted to proper years (dataset is in months)
+    #   OverallSatisfaction    mean of Work-Life Balance, Job Satisfaction, Employee Recognition
+    #   Opportunities          Leadership + Innovation Opportunities
+    #   AnnualIncome           Monthly Income x 12, binned
+    #   AgeGroup               Age, binned
+    df_fe = df_fe.assign(**model_inputs(df_fe))
+    df_fe = df_fe.drop(columns=["Work-Life Balance", "Job Satisfaction", "Employee Recognition",
+                                "Leadership Opportunities", "Innovation Opportunities", "Monthly Income", "Age"])
+
+    # 2-5. Derived features, computed by the same code the inference service runs:
+    #   RoleStagnationRatio    1 -> same role entire tenure (possible stagnation); low value -> role mobility
+    #   TenureGap              high gap -> role changes/promotion; low gap -> same role for long time
+    #   EarlyCompanyTenureRisk most attrition happens in first 2 years
+    #   LongTenureLowRoleRisk  long tenure while still entry/mid level
+    derived = derive_features(df_fe["Years at Company"], df_fe["Company Tenure"], df_fe["Job Level"])
+    for name in DERIVED_FEATURES:
+        df_fe[name] = derived[name]
+    for name in ("EarlyCompanyTenureRisk", "LongTenureLowRoleRisk"):
+        df_fe[name] = df_fe[name].astype("Int64")
 
 
-    # annual income binning
-    df_fe["AnnualIncome"] = df_fe["Monthly Income"] * 12
-
-    df_fe["AnnualIncome"] = pd.cut(
-        df_fe["AnnualIncome"],
-        bins=[0, 240000, 420000, 600000, 2000000, float("inf")],
-        labels=[0, 1, 2, 3, 4],
-        include_lowest=True
-    ).astype("Int64")
-    df_fe = df_fe.drop(columns=["Monthly Income"])
-
-
-    # age binning
-    df_fe['AgeGroup'] = pd.cut(
-        df_fe['Age'], 
-        bins=[17, 25, 35, 45, 60, 65], 
-        labels=[1, 2, 3, 4, 5]
-    ).astype("Int64")
-    df_fe = df_fe.drop(columns=['Age'])
-
-    # Years At Company and Company Tenure 
-    # 1. Convert to proper years as dataset is in months.
-    df_fe["Years at Company"] = (df_fe["Years at Company"] / 12).round(2)
-    df_fe["Company Tenure"] = (df_fe["Company Tenure"] / 12).round(2)
-
-    # 2. Role Stagnation: 1 -> same role entire tenure (possible stagnation); low value -> role mobility
-    df_fe['RoleStagnationRatio'] = ( df_fe['Years at Company'] / (df_fe['Company Tenure'] + 1) ).round(3)
-
-    # 3. Tenure Gap: high gap -> role changes/promotion; low gap -> same role for long time
-    df_fe['TenureGap'] = df_fe['Company Tenure'] - df_fe['Years at Company']
-
-    # 4. Early Comapny risk: most attrition happens in first 2 years
-    df_fe['EarlyCompanyTenureRisk'] = (df_fe['Years at Company'] <= 2).astype("Int64")
-
-    # 5. Long Term Stagnation
-    df_fe["LongTenureLowRoleRisk"] = ( (df_fe["Company Tenure"] > 5) & (df_fe["Job Level"] <= 2) ).astype("Int64")
+    # drop unnecessary columns
+    return df_fe.drop(columns=['Employee ID', 'Job Role', 'Distance from Home', 'Marital Status', 'Gender', 'dataset_type'])
 
 
-    # drop unnecessary columns
-    df_fe = df_fe.drop(columns=['Employee ID', 'Job Role', 'Distance from Home', 'Marital Status', 'Gender', 'dataset_type'])
+def feature_data(df):
+    df_fe = build_features(df)
 
     print(df_fe.tail(10))
 
@@ -96,5 +62,5 @@ def feature_data(df):
 
 
 if __name__ == "__main__":
-    df = pd.read_csv(CLEANING_PATH)
+    df = pd.read_csv(CLEANING_PATH, dtype=CSV_DTYPES)
     feature_data(df)
\ No newline at end of file
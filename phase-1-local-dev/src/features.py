@@ -0,0 +1,18 @@
+"""Training-side handle on the inference service's feature transform.
+
+``inference/src/features.py`` is the single definition of the derived
+features. It is loaded here by path, so training and serving cannot drift
+apart, and the inference image does not need this tree.
+"""
+import importlib.util
+from config.paths import FEATURES_MODULE_PATH
+
+_spec = importlib.util.spec_from_file_location("attrition_features", FEATURES_MODULE_PATH)
+_features = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_features)
+
+FEATURE_ORDER = _features.FEATURE_ORDER
+FIELD_TO_FEATURE = _features.FIELD_TO_FEATURE
+DERIVED_FEATURES = _features.DERIVED_FEATURES
+derive_features = _features.derive_features
+build_matrix = _features.build_matrix
@@ -0,0 +1,107 @@
+"""Check that the service's build_matrix gives the matrix the model is trained on.
+
+Training side: 05_feature_engg.build_features on a cleaned raw frame, written
+to CSV and read back as 06_preprocessing.py and the training scripts do.
+Serving side: build_matrix on the 15 model inputs of the same rows, after a
+JSON round trip, as a client sends them.
+
+The rows pair every role tenure with every company tenure from 0 to 20 years,
+in months as in the raw data, and cycle the job level. That covers the
+EarlyCompanyTenureRisk and LongTenureLowRoleRisk thresholds, every
+RoleStagnationRatio that falls on a rounding midpoint and every TenureGap
+whose subtraction is inexact in binary. Exits with status 1 on any
+difference. Run from src/:
+    python model_testing/feature_parity.py
+"""
+import importlib.util
+import io
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from codebook import CODEBOOK, CSV_DTYPES
+from features import DERIVED_FEATURES, FEATURE_ORDER, FIELD_TO_FEATURE, build_matrix
+
+MAX_MONTHS = 240
+
+_spec = importlib.util.spec_from_file_location(
+    "feature_engg", Path(__file__).resolve().parents[1] / "data_preparation" / "05_feature_engg.py")
+_feature_engg = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_feature_engg)
+
+
+def raw_rows(seed: int = 42) -> pd.DataFrame:
+    """Cleaned raw rows, read back with CSV_DTYPES as 05_feature_engg.py reads them."""
+    rng = np.random.default_rng(seed)
+    yac, ct = (a.ravel() for a in np.meshgrid(np.arange(MAX_MONTHS + 1), np.arange(MAX_MONTHS + 1)))
+    n = len(yac)
+
+    df = pd.DataFrame({col: rng.choice(list(levels), n) for col, levels in CODEBOOK.items()})
+    df["Job Level"] = np.array(list(CODEBOOK["Job Level"]))[np.arange(n) % 3]
+    df = df.assign(**{
+        "Employee ID":          np.arange(1, n + 1),
+        "Age":                  rng.integers(18, 66, n),
+        "Years at Company":     yac,
+        "Monthly Income":       rng.integers(1000, 200000, n),
+        "Number of Promotions": rng.integers(0, 5, n),
+        "Distance from Home":   rng.integers(1, 100, n),
+        "Number of Dependents": rng.integers(0, 7, n),
+        "Company Tenure":       ct,
+        "dataset_type":         "train",
+    })
+    return pd.read_csv(io.StringIO(df.to_csv(index=False)), dtype=CSV_DTYPES)
+
+
+def training_matrix(raw: pd.DataFrame) -> tuple:
+    """(featured frame, FEATURE_ORDER matrix as the training scripts read it from CSV)."""
+    featured = _feature_engg.build_features(raw)
+    trained_on = pd.read_csv(io.StringIO(featured.to_csv(index=False)))
+    return featured, trained_on[FEATURE_ORDER].to_numpy(dtype=np.float64)
+
+
+def serving_matrix(featured: pd.DataFrame) -> np.ndarray:
+    """build_matrix on the 15 inputs of each row, sent as JSON numbers."""
+    inputs = featured[list(FIELD_TO_FEATURE.values())].to_numpy(dtype=np.float64)
+    return build_matrix(json.loads(json.dumps(inputs.tolist())))
+
+
+def edge_cases(featured: pd.DataFrame) -> dict:
+    yac = featured["Years at Company"].to_numpy(dtype=np.float64)
+    ct = featured["Company Tenure"].to_numpy(dtype=np.float64)
+    ratio = yac / (ct + 1) * 1000
+    gap = ct - yac
+    return {
+        "RoleStagnationRatio on a rounding midpoint": int(np.sum(np.abs(ratio - np.floor(ratio) - 0.5) < 1e-6)),
+        "TenureGap not exact in binary": int(np.sum(gap != np.round(gap, 2))),
+        "Years at Company == 2": int(np.sum(yac == 2)),
+        "Company Tenure == 5": int(np.sum(ct == 5)),
+    }
+
+
+if __name__ == "__main__":
+    featured, expected = training_matrix(raw_rows())
+    actual = serving_matrix(featured)
+    print(f"{len(featured):,} rows")
+
+    failed = False
+    for name, count in edge_cases(featured).items():
+        print(f"  {name:45s} {count:6,d} rows")
+        if count == 0:
+            print("    no rows exercise this edge case")
+            failed = True
+
+    for i, name in enumerate(FEATURE_ORDER):
+        differ = np.flatnonzero(expected[:, i] != actual[:, i])
+        if len(differ):
+            failed = True
+            row = differ[0]
+            print(f"  {name}: {len(differ):,} rows differ, e.g. Years at Company "
+                  f"{featured['Years at Company'].iat[row]}, Company Tenure {featured['Company Tenure'].iat[row]}: "
+                  f"trained on {float(expected[row, i])!r}, served {float(actual[row, i])!r}")
+
+    if failed:
+        sys.exit(1)
+    print(f"build_matrix matches the training features ({', '.join(DERIVED_FEATURES)} included)")
@@ -0,0 +1,52 @@
+"""Check a written model.onnx against the sklearn pipeline it was exported from.
+
+05_export.py --onnx runs the same check before it renames the file into
+place; this one can be re-run on any model.onnx, e.g. the one committed
+under inference/artifacts/, after an onnxruntime or skl2onnx upgrade. The
+ONNX model is loaded with the service's OnnxModel, as the service loads it.
+Exits with status 1 if its feature_order is not FEATURE_ORDER or if any
+probability differs by more than 1e-9 on 10,000 random rows. Needs
+onnxruntime and scikit-learn. Run from src/:
+    python model_testing/onnx_parity.py
+    python model_testing/onnx_parity.py --onnx ../inference/artifacts/model.onnx --pickle ../inference/artifacts/model.pkl
+"""
+import argparse
+import importlib.util
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from config.paths import BASE_DIR, MODEL_PATH, ONNX_MODEL_PATH
+from features import FEATURE_ORDER
+
+PARITY_TOLERANCE = 1e-9
+ROWS = 10000
+
+_spec = importlib.util.spec_from_file_location(
+    "attrition_onnx_model", BASE_DIR / "inference" / "src" / "onnx_model.py")
+_onnx_model = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_onnx_model)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--onnx", type=Path, default=ONNX_MODEL_PATH)
+    parser.add_argument("--pickle", type=Path, default=MODEL_PATH)
+    args = parser.parse_args()
+
+    model = _onnx_model.OnnxModel.load(args.onnx)
+    pipeline = joblib.load(args.pickle)
+    print(f"{args.onnx} (sha256 {model.sha256[:12]}) against {args.pickle}")
+
+    if model.feature_order != FEATURE_ORDER:
+        print(f"  feature_order differs: {model.feature_order} != {FEATURE_ORDER}")
+        sys.exit(1)
+
+    X = np.random.default_rng(42).uniform(0, 10, size=(ROWS, len(FEATURE_ORDER)))
+    diff = np.abs(pipeline.predict(X) - model.predict_proba(X)).max()
+    print(f"  max |p_sklearn - p_onnx| on {ROWS:,} random rows: {diff:.2e}")
+    if diff > PARITY_TOLERANCE:
+        sys.exit(1)
+    print("model.onnx matches the sklearn pipeline")
@@ -1,6 +1,7 @@
 import pandas as pd
 import joblib
 from config.paths import MODEL_PATH
+from features import DERIVED_FEATURES, derive_features
 
 
 def test(input_data: dict):
@@ -60,14 +61,7 @@ if __name__ == "__main__":
     annual_income = int(input('Annual Income (0: Under 2.4L, 1: 2.4L–4.2L, 2: 4.2L–6L, 3: 6L–20L, 4: Above 20L): '))
     age_group = int(input('Age Group (1: 18–25, 2: 25–35, 3: 35–45, 4: 45–60, 5: 60–65): '))
 
-    # Derived features
-    role_stagnation_ratio = round(years_at_company / (company_tenure + 1), 3)
-    tenure_gap = round(company_tenure - years_at_company, 2)
-    early_company_tenure_risk = 1 if years_at_company <= 2 else 0
-    long_tenure_low_role_risk = 1 if (company_tenure > 5 and job_level <= 2) else 0
-
-    # Build input dictionary
-    input_record = {
+    raw_record = {
         "Years at Company": years_at_company,
         "Performance Rating": performance_rating,
         "Number of Promotions": no_of_promotions,
@@ -83,11 +77,13 @@ if __name__ == "__main__":
         "Opportunities": opportunities,
         "AnnualIncome": annual_income,
         "AgeGroup": age_group,
-        "RoleStagnationRatio": role_stagnation_ratio,
-        "TenureGap": tenure_gap,
-        "EarlyCompanyTenureRisk": early_company_tenure_risk,
-        "LongTenureLowRoleRisk": long_tenure_low_role_risk
     }
 
+    # Derived features (shared with training and the inference service)
+    derived = derive_features(years_at_company, company_tenure, job_level)
+
+    # Build input dictionary
+    input_record = {**raw_record, **{name: derived[name].item() for name in DERIVED_FEATURES}}
+
     # Run test
     test(input_record)
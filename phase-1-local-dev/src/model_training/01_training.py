@@ -4,7 +4,7 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
-from config.paths import PREPROCESSED_TRAIN_PATH, MODEL_PATH
+from config.paths import PREPROCESSED_TRAIN_PATH, BASE_MODEL_PATH
 
 # Columns that need scaling - must use integer indices for KServe compatibility
 # (KServe sends raw numpy arrays, not DataFrames)
@@ -32,7 +32,7 @@ def train_data(df):
     pipeline.fit(X_train, y_train)
     print("training completed...")
 
-    joblib.dump(pipeline, MODEL_PATH)
+    joblib.dump(pipeline, BASE_MODEL_PATH)
 
     return True
 
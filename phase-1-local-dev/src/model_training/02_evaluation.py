@@ -5,7 +5,7 @@ import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, precision_score, recall_score, f1_score, roc_auc_score
-from config.paths import PREPROCESSED_TRAIN_PATH, PREPROCESSED_TEST_PATH, MODEL_PATH, ARTIFACT_DIR
+from config.paths import PREPROCESSED_TRAIN_PATH, PREPROCESSED_TEST_PATH, BASE_MODEL_PATH, ARTIFACT_DIR
 
 
 def get_feature_names(pipeline, original_columns):
@@ -22,7 +22,7 @@ def get_feature_names(pipeline, original_columns):
 
 def evaluate_data(X_train, y_train, X_test, y_test):
     # load pipeline
-    pipeline = joblib.load(MODEL_PATH)
+    pipeline = joblib.load(BASE_MODEL_PATH)
 
     y_pred = pipeline.predict(X_test)
 
@@ -1,12 +1,12 @@
 import pandas as pd
 import joblib
 from sklearn.model_selection import cross_val_score, StratifiedKFold
-from config.paths import PREPROCESSED_TRAIN_PATH, MODEL_PATH
+from config.paths import PREPROCESSED_TRAIN_PATH, BASE_MODEL_PATH
 
 
 def cv_data(X_train, y_train):
 
-    pipeline = joblib.load(MODEL_PATH)
+    pipeline = joblib.load(BASE_MODEL_PATH)
 
     strat_cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
     cv_scores = cross_val_score(pipeline, X_train, y_train, cv=strat_cv, scoring='recall')
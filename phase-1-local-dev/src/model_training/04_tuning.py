@@ -5,13 +5,13 @@ import joblib
 from sklearn.model_selection import GridSearchCV
 from sklearn.metrics import accuracy_score, recall_score
 from sklearn.model_selection import cross_val_score, StratifiedKFold
-from config.paths import PREPROCESSED_TRAIN_PATH, PREPROCESSED_TEST_PATH, MODEL_PATH, METRICS_PATH
+from config.paths import PREPROCESSED_TRAIN_PATH, PREPROCESSED_TEST_PATH, BASE_MODEL_PATH, MODEL_PATH, METRICS_PATH
 
 
 def tuning_data(X_train, y_train, X_test, y_test):
 
-    # load pipeline
-    pipeline = joblib.load(MODEL_PATH)
+    # load the untuned pipeline from 01_training.py (MODEL_PATH is this script's output)
+    pipeline = joblib.load(BASE_MODEL_PATH)
 
     # set parameters (classifier__ prefix for Pipeline)
     param_grid = {
@@ -0,0 +1,174 @@
+import os
+import json
+import argparse
+import hashlib
+import importlib.util
+import joblib
+import numpy as np
+from datetime import datetime, timezone
+from config.paths import MODEL_PATH, LINEAR_MODEL_PATH, ONNX_MODEL_PATH, LINEAR_MODEL_MODULE_PATH
+
+# 2 adds the per-feature baseline used for contribution explanations
+FORMAT_VERSION = 2
+
+# largest |difference| from the sklearn pipeline an exported artifact may show
+PARITY_TOLERANCE = 1e-9
+
+
+def unwrap_pipeline(obj):
+    """04_tuning.py saves a SimpleNamespace around the bound predict_proba."""
+    predict = getattr(obj, "predict", None)
+    return getattr(predict, "__self__", obj)
+
+
+def content_hash(feature_order, coef, intercept, baseline) -> str:
+    payload = json.dumps(
+        {"feature_order": feature_order, "coef": coef, "intercept": intercept, "baseline": baseline},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fold_scaler(pipeline):
+    """Fold the StandardScaler into the LogisticRegression weights.
+
+    The ColumnTransformer emits the scaled columns first and the passthrough
+    columns after them, so the classifier coefficients are re-ordered back to
+    the original input column order on the way.
+
+    ``baseline`` holds each column's scaler mean (0 for passthrough columns),
+    so ``coef * (x - baseline)`` is the classifier coefficient times the
+    scaled value: the column's exact log-odds contribution.
+    """
+    ct = pipeline.named_steps['preprocessor']
+    clf = pipeline.named_steps['classifier']
+
+    n_features = ct.n_features_in_
+    feature_order = list(getattr(ct, "feature_names_in_", range(n_features)))
+    feature_order = [str(f) for f in feature_order]
+
+    coef_out = clf.coef_[0]
+    coef = np.zeros(n_features)
+    baseline = np.zeros(n_features)
+    intercept = float(clf.intercept_[0])
+
+    pos = 0
+    for name, transformer, indices in ct.transformers_:
+        if transformer == 'drop' or len(indices) == 0:
+            continue
+        w = coef_out[pos:pos + len(indices)]
+        pos += len(indices)
+
+        if name == 'scaler':
+            mean = transformer.mean_ if transformer.mean_ is not None else np.zeros(len(indices))
+            scale = transformer.scale_ if transformer.scale_ is not None else np.ones(len(indices))
+            w = w / scale
+            intercept -= float(np.dot(w, mean))
+            baseline[indices] = mean
+
+        coef[indices] = w
+
+    return feature_order, coef.tolist(), intercept, baseline.tolist()
+
+
+def load_linear_model(path):
+    """Load ``path`` with the inference service's LinearModel, loaded by path like src/features.py."""
+    spec = importlib.util.spec_from_file_location("attrition_linear_model", LINEAR_MODEL_MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.LinearModel.load(path)
+
+
+def export_model():
+    pipeline = unwrap_pipeline(joblib.load(MODEL_PATH))
+    feature_order, coef, intercept, baseline = fold_scaler(pipeline)
+
+    artifact = {
+        "format": "linear-logistic",
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.now(tz=timezone.utc).isoformat(),
+        "feature_order": feature_order,
+        "coef": coef,
+        "intercept": intercept,
+        "baseline": baseline,
+        "sha256": content_hash(feature_order, coef, intercept, baseline),
+    }
+
+    # write, check, then rename, so a serving pod watching the file never reads half of it or a bad one
+    tmp_path = LINEAR_MODEL_PATH.with_suffix(".json.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(artifact, f, indent=2)
+
+    # parity check: score the written artifact the way the service does, against the sklearn pipeline
+    model = load_linear_model(tmp_path)
+    X = np.random.default_rng(42).uniform(0, 10, size=(1000, len(feature_order)))
+    p_linear, c_linear = model.contributions(X)
+    diff = np.abs(pipeline.predict_proba(X) - p_linear).max()
+    print(f"max |p_sklearn - p_linear|: {diff:.2e}")
+    if diff > PARITY_TOLERANCE:
+        raise ValueError(f"{LINEAR_MODEL_PATH} does not match the sklearn pipeline (max diff {diff:.2e})")
+
+    # contributions: classifier coef times the ColumnTransformer output,
+    # whose columns are in get_feature_names (02_evaluation.py) order
+    ct = pipeline.named_steps['preprocessor']
+    output_order = [i for _, t, indices in ct.transformers_ if t != 'drop' for i in indices]
+    c_sklearn = ct.transform(X) * pipeline.named_steps['classifier'].coef_[0]
+    diff = np.abs(c_sklearn - c_linear[:, output_order]).max()
+    print(f"max |c_sklearn - c_linear|: {diff:.2e}")
+    if diff > PARITY_TOLERANCE:
+        raise ValueError(f"{LINEAR_MODEL_PATH} contributions do not match the sklearn pipeline (max diff {diff:.2e})")
+    os.replace(tmp_path, LINEAR_MODEL_PATH)
+    print(f"exported {LINEAR_MODEL_PATH} (sha256 {artifact['sha256'][:12]})")
+
+    return artifact
+
+
+def export_onnx():
+    """Convert the whole pipeline (scaler included) to ONNX for the onnxruntime backend.
+
+    Needs skl2onnx. The graph takes one float64 ``input`` tensor in the
+    pipeline's column order, which is why the ColumnTransformer uses integer
+    indices, and returns ``probabilities`` as [p_stay, p_leave] (no ZipMap).
+    """
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import DoubleTensorType
+
+    pipeline = unwrap_pipeline(joblib.load(MODEL_PATH))
+    feature_order = fold_scaler(pipeline)[0]
+
+    clf = pipeline.named_steps['classifier']
+    onx = convert_sklearn(
+        pipeline,
+        initial_types=[("input", DoubleTensorType([None, len(feature_order)]))],
+        options={id(clf): {"zipmap": False}},
+        target_opset={"": 17, "ai.onnx.ml": 3},
+    )
+    # the service checks this against its FEATURE_ORDER before serving
+    prop = onx.metadata_props.add()
+    prop.key, prop.value = "feature_order", json.dumps(feature_order)
+
+    tmp_path = ONNX_MODEL_PATH.with_suffix(".onnx.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(onx.SerializeToString())
+
+    # parity check against the sklearn pipeline on random inputs, before the file is swapped in
+    import onnxruntime as ort
+    session = ort.InferenceSession(str(tmp_path), providers=["CPUExecutionProvider"])
+    X = np.random.default_rng(42).uniform(0, 10, size=(1000, len(feature_order)))
+    p_onnx = session.run(["probabilities"], {"input": X})[0]
+    diff = np.abs(pipeline.predict_proba(X) - p_onnx).max()
+    print(f"max |p_sklearn - p_onnx|: {diff:.2e}")
+    if diff > PARITY_TOLERANCE:
+        raise ValueError(f"ONNX export does not match the sklearn pipeline (max diff {diff:.2e})")
+    os.replace(tmp_path, ONNX_MODEL_PATH)
+    print(f"exported {ONNX_MODEL_PATH}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--onnx", action="store_true", help="also write model.onnx (needs skl2onnx + onnxruntime)")
+    args = parser.parse_args()
+
+    export_model()
+    if args.onnx:
+        export_onnx()
@@ -0,0 +1,251 @@
+"""Run the data preparation and model training stages, skipping those that are up to date.
+
+Run from src/ (each stage runs as its own ``python <script>`` process):
+
+    python pipeline.py                      # every stage
+    python pipeline.py tuning               # tuning and what it needs
+    python pipeline.py --force training     # rerun training (and whatever its new output changes)
+    python pipeline.py --onnx               # export also writes model.onnx
+
+``stages()`` declares each script with the files it reads and writes; a stage
+depends on the stages that write its inputs. A stage's key is a hash of
+its script and the repo code it imports, its parameters, and the content of
+its input files. A stage whose key and output hashes match the last run is
+skipped. An upstream stage that reruns but writes the same bytes does not
+invalidate anything below it.
+
+Stages whose inputs are ready run in parallel, ``--jobs`` at a time. Each
+stage's output goes to ``.pipeline/logs/<stage>.log``. A failed stage stops
+the stages below it, but other branches carry on. A per-stage timing report
+is printed at the end.
+
+On a 74,498-row synthetic dataset, one vCPU: a full run takes 44 s, the
+same as running the scripts by hand; 22 s of it is tuning. A rerun with
+nothing changed takes 0.2 s, and after an edit to 04_tuning.py only tuning
+reruns (export stays cached because the tuned model comes out byte for byte
+the same). With more than one CPU, eda, evaluation and cross_validation run
+off the critical path, which is 35 s of the 44. With a single CPU, keep the
+default ``--jobs``: at ``-j 4`` the stages compete for the core and the
+same run takes 53 s.
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from config.paths import (
+    RAW_DATA_PATH, INGESTION_PATH, VALIDATION_PATH, EDA_PATH, CLEANING_PATH, FEATURED_PATH,
+    PREPROCESSED_TRAIN_PATH, PREPROCESSED_TEST_PATH, BASE_MODEL_PATH, MODEL_PATH, METRICS_PATH,
+    LINEAR_MODEL_PATH, ONNX_MODEL_PATH, FEATURES_MODULE_PATH, LINEAR_MODEL_MODULE_PATH, PIPELINE_STATE_DIR,
+)
+
+SRC_DIR = Path(__file__).resolve().parent
+STATE_PATH = PIPELINE_STATE_DIR / "state.json"
+LOG_DIR = PIPELINE_STATE_DIR / "logs"
+
+# bump to invalidate every stage, e.g. after a library upgrade that changes outputs
+CACHE_VERSION = 1
+
+# imported by every stage
+COMMON_CODE = (SRC_DIR / "config/paths.py",)
+FEATURE_CODE = (SRC_DIR / "codebook.py", SRC_DIR / "features.py", FEATURES_MODULE_PATH)
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    script: str                  # relative to src/
+    inputs: tuple = ()
+    outputs: tuple = ()
+    code: tuple = ()             # repo modules the script imports, besides COMMON_CODE
+    params: dict = field(default_factory=dict)  # part of the key; True values are passed as --<name>
+
+
+def stages(onnx: bool = False) -> list:
+    export_outputs = (LINEAR_MODEL_PATH, ONNX_MODEL_PATH) if onnx else (LINEAR_MODEL_PATH,)
+    return [
+        Stage("ingestion", "data_preparation/01_ingestion.py", (RAW_DATA_PATH,), (INGESTION_PATH,)),
+        Stage("validation", "data_preparation/02_validation.py", (INGESTION_PATH,), (VALIDATION_PATH,)),
+        Stage("eda", "data_preparation/03_eda.py", (VALIDATION_PATH,), (EDA_PATH,)),
+        Stage("cleaning", "data_preparation/04_cleaning.py", (VALIDATION_PATH,), (CLEANING_PATH,)),
+        Stage("feature_engg", "data_preparation/05_feature_engg.py", (CLEANING_PATH,), (FEATURED_PATH,),
+              code=FEATURE_CODE),
+        Stage("preprocessing", "data_preparation/06_preprocessing.py", (FEATURED_PATH,),
+              (PREPROCESSED_TRAIN_PATH, PREPROCESSED_TEST_PATH)),
+        Stage("training", "model_training/01_training.py", (PREPROCESSED_TRAIN_PATH,), (BASE_MODEL_PATH,)),
+        Stage("evaluation", "model_training/02_evaluation.py",
+              (PREPROCESSED_TRAIN_PATH, PREPROCESSED_TEST_PATH, BASE_MODEL_PATH)),
+        Stage("cross_validation", "model_training/03_cross_validation.py",
+              (PREPROCESSED_TRAIN_PATH, BASE_MODEL_PATH)),
+        Stage("tuning", "model_training/04_tuning.py",
+              (PREPROCESSED_TRAIN_PATH, PREPROCESSED_TEST_PATH, BASE_MODEL_PATH), (MODEL_PATH, METRICS_PATH)),
+        Stage("export", "model_training/05_export.py", (MODEL_PATH,), export_outputs,
+              code=(LINEAR_MODEL_MODULE_PATH,), params={"onnx": onnx}),
+    ]
+
+
+def dependencies(graph: list) -> dict:
+    """stage name -> names of the stages writing its inputs."""
+    writers = {}
+    for stage in graph:
+        for path in stage.outputs:
+            if path in writers:
+                raise ValueError(f"{path} is written by both {writers[path]} and {stage.name}")
+            writers[path] = stage.name
+    return {stage.name: {writers[p] for p in stage.inputs if p in writers} for stage in graph}
+
+
+class FileHashes:
+    """sha256 of files, remembered by (size, mtime) so unchanged files are not read again."""
+
+    def __init__(self, known: dict):
+        self.known = known
+
+    def __call__(self, path: Path):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        key = str(path)
+        entry = self.known.get(key)
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        self.known[key] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+
+def stage_key(stage: Stage, file_hash) -> str:
+    """Hash of the stage's code, parameters and input data; None while an input is missing."""
+    inputs = {}
+    for path in stage.inputs:
+        inputs[str(path)] = file_hash(path)
+        if inputs[str(path)] is None:
+            return None
+    code = {str(path): file_hash(path) for path in (SRC_DIR / stage.script, *COMMON_CODE, *stage.code)}
+    payload = json.dumps(
+        {"version": CACHE_VERSION, "code": code, "params": stage.params, "inputs": inputs}, sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def run_stage(stage: Stage) -> tuple:
+    """Run one stage script; returns (exit code, seconds)."""
+    args = [f"--{name}" for name, value in stage.params.items() if value is True]
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR), "MPLBACKEND": "Agg"}  # plt.show() must not block
+    start = time.perf_counter()
+    with open(LOG_DIR / f"{stage.name}.log", "w") as log:
+        code = subprocess.call([sys.executable, stage.script, *args], cwd=SRC_DIR, env=env,
+                               stdout=log, stderr=subprocess.STDOUT)
+    return code, time.perf_counter() - start
+
+
+def run(graph: list, targets=None, force=(), jobs: int = None) -> dict:
+    """Run ``targets`` (default: every stage) and the stages they need; returns {name: result}."""
+    deps = dependencies(graph)
+    by_name = {stage.name: stage for stage in graph}
+
+    unknown = [name for name in (*(targets or ()), *force) if name not in by_name]
+    if unknown:
+        raise ValueError(f"unknown stage(s): {', '.join(unknown)}; stages: {', '.join(by_name)}")
+    wanted, todo = set(), list(targets or by_name)
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(deps[name])
+
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    state = json.loads(STATE_PATH.read_text()) if STATE_PATH.exists() else {"files": {}, "stages": {}}
+    file_hash = FileHashes(state["files"])
+
+    results = {}
+    pending = [stage for stage in graph if stage.name in wanted]
+    running = {}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        while pending or running:
+            for stage in list(pending):
+                if any(d not in results for d in deps[stage.name]):
+                    continue
+                pending.remove(stage)
+                if any(results[d]["status"] in ("failed", "blocked") for d in deps[stage.name]):
+                    results[stage.name] = {"status": "blocked", "seconds": 0.0}
+                    continue
+
+                key = stage_key(stage, file_hash)
+                if key is None:
+                    missing = [str(p) for p in stage.inputs if file_hash(p) is None]
+                    print(f"{stage.name}: missing input {', '.join(missing)}")
+                    results[stage.name] = {"status": "failed", "seconds": 0.0}
+                    continue
+                last = state["stages"].get(stage.name, {})
+                if (stage.name not in force and last.get("key") == key
+                        and all(file_hash(p) == last["outputs"].get(str(p)) for p in stage.outputs)):
+                    results[stage.name] = {"status": "cached", "seconds": 0.0, "last_seconds": last["seconds"]}
+                    continue
+
+                print(f"{stage.name}: running {stage.script}")
+                running[pool.submit(run_stage, stage)] = (stage, key)
+
+            if not running:
+                if pending and all(any(d not in results for d in deps[s.name]) for s in pending):
+                    raise ValueError(f"dependency cycle among {', '.join(s.name for s in pending)}")
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, key = running.pop(future)
+                code, seconds = future.result()
+                if code != 0:
+                    print(f"{stage.name}: FAILED (exit {code}), see {LOG_DIR / stage.name}.log")
+                    state["stages"].pop(stage.name, None)
+                    results[stage.name] = {"status": "failed", "seconds": seconds}
+                    continue
+                outputs = {str(p): file_hash(p) for p in stage.outputs}
+                missing = [p for p, digest in outputs.items() if digest is None]
+                if missing:
+                    print(f"{stage.name}: did not write {', '.join(missing)}")
+                    results[stage.name] = {"status": "failed", "seconds": seconds}
+                    continue
+                state["stages"][stage.name] = {"key": key, "outputs": outputs, "seconds": round(seconds, 3)}
+                results[stage.name] = {"status": "ran", "seconds": seconds}
+                # saved after every stage, so an interrupted run keeps what finished
+                STATE_PATH.write_text(json.dumps(state, indent=2))
+
+    STATE_PATH.write_text(json.dumps(state, indent=2))
+    results["_wall"] = time.perf_counter() - start
+    return results
+
+
+def report(graph: list, results: dict):
+    print(f"\n{'stage':18s} {'status':8s} {'seconds':>8s}")
+    for stage in graph:
+        if stage.name not in results:
+            continue
+        r = results[stage.name]
+        note = f"  (last run {r['last_seconds']:.2f} s)" if r["status"] == "cached" else ""
+        print(f"{stage.name:18s} {r['status']:8s} {r['seconds']:8.2f}{note}")
+    total = sum(r["seconds"] for name, r in results.items() if name != "_wall")
+    print(f"{'wall time':18s} {'':8s} {results['_wall']:8.2f}  (stages {total:.2f} s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the pipeline stages that are out of date.")
+    parser.add_argument("targets", nargs="*", help="stages to bring up to date (default: all)")
+    parser.add_argument("--force", action="append", default=[], metavar="STAGE",
+                        help="rerun STAGE even if it is up to date (repeatable)")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="stages run at once (default: CPU count)")
+    parser.add_argument("--onnx", action="store_true", help="export also writes model.onnx")
+    args = parser.parse_args()
+
+    graph = stages(onnx=args.onnx)
+    results = run(graph, args.targets, set(args.force), args.jobs)
+    report(graph, results)
+    sys.exit(1 if any(r["status"] in ("failed", "blocked") for n, r in results.items() if n != "_wall") else 0)
@@ -1,7 +1,14 @@
+import importlib.util
 import pandas as pd
 from pathlib import Path
 from datetime import datetime, timezone
 
+# Categorical codes are shared with the training pipeline
+CODEBOOK_PATH = Path(__file__).resolve().parents[2] / "phase-1-local-dev/src/codebook.py"
+_spec = importlib.util.spec_from_file_location("codebook", CODEBOOK_PATH)
+codebook = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(codebook)
+
 
 def process_data():
     # Paths
@@ -13,8 +20,8 @@ def process_data():
 
     OUTPUT_PATH.parent.mkdir(exist_ok=True)
 
-    # Read CSV
-    df = pd.read_csv(CSV_PATH)
+    # Read CSV (categorical columns parse straight to pandas categories)
+    df = pd.read_csv(CSV_PATH, dtype=codebook.CSV_DTYPES)
     print(f"Loaded {len(df)} rows")
     print(f"Columns: {list(df.columns)}\n")
 
@@ -22,58 +29,11 @@ def process_data():
     # Encode categorical columns
     # ============================================================
 
-    # Binary mappings (Yes/No)
-    binary_map = {"Yes": 1, "No": 0}
-    df["Overtime"] = df["Overtime"].map(binary_map)
-    df["Remote Work"] = df["Remote Work"].map(binary_map)
-    df["Leadership Opportunities"] = df["Leadership Opportunities"].map(binary_map)
-    df["Innovation Opportunities"] = df["Innovation Opportunities"].map(binary_map)
-
-    # Gender
-    df["Gender"] = df["Gender"].map({"Male": 1, "Female": 0})
-
-    # Attrition (target)
-    df["Attrition"] = df["Attrition"].map({"Left": 1, "Stayed": 0})
-
-    # Ordinal mappings (Low → High)
-    rating_map = {"Low": 1, "Medium": 2, "High": 3}
-    df["Job Satisfaction"] = df["Job Satisfaction"].map(rating_map)
-    df["Employee Recognition"] = df["Employee Recognition"].map(rating_map)
-
-    performance_map = {"Low": 1, "Average": 2, "High": 3}
-    df["Performance Rating"] = df["Performance Rating"].map(performance_map)
-
-    balance_map = {"Poor": 1, "Fair": 2, "Good": 3, "Excellent": 4}
-    df["Work-Life Balance"] = df["Work-Life Balance"].map(balance_map)
-    df["Company Reputation"] = df["Company Reputation"].map(balance_map)
-
-    # Education Level
-    education_map = {
-        "High School": 1,
-        "Associate Degree": 2,
-        "Bachelor's Degree": 3,
-        "Master's Degree": 4,
-        "PhD": 5
-    }
-    df["Education Level"] = df["Education Level"].map(education_map)
-
-    # Job Level
-    job_level_map = {"Entry": 1, "Mid": 2, "Senior": 3}
-    df["Job Level"] = df["Job Level"].map(job_level_map)
-
-    # Company Size
-    company_size_map = {"Small": 1, "Medium": 2, "Large": 3}
-    df["Company Size"] = df["Company Size"].map(company_size_map)
-
-    # Marital Status
-    marital_map = {"Single": 1, "Married": 2, "Divorced": 3}
-    df["Marital Status"] = df["Marital Status"].map(marital_map)
-
-    # Job Role - label encode
-    job_roles = df["Job Role"].unique()
-    job_role_map = {role: idx for idx, role in enumerate(job_roles, 1)}
-    df["Job Role"] = df["Job Role"].map(job_role_map)
-    print(f"Job Role mapping: {job_role_map}\n")
+    # One vectorized pass with the fixed codes shared with training
+    df, unknown = codebook.encode(df)
+    print(f"Encoded with codebook v{codebook.CODEBOOK_VERSION}")
+    if unknown:
+        print(f"⚠️  Levels not in the codebook (stored as null): {unknown}\n")
 
     # ============================================================
     # Prepare for Feast
@@ -37,10 +37,10 @@ employee_features = FeatureView(
         Field(name="gender", dtype=Int64, description="Gender (0=Female, 1=Male)"),
         Field(name="marital_status", dtype=Int64, description="Marital status (1=Single, 2=Married, 3=Divorced)"),
         Field(name="num_dependents", dtype=Int64, description="Number of dependents"),
-        Field(name="education_level", dtype=Int64, description="Education (1=HS to 5=PhD)"),
+        Field(name="education_level", dtype=Int64, description="Education (1=HS, 2=Bachelor's, 3=Master's, 4=Associate, 5=PhD)"),
         
         # Job info
-        Field(name="job_role", dtype=Int64, description="Job role (encoded)"),
+        Field(name="job_role", dtype=Int64, description="Job role (1=Education, 2=Finance, 3=Healthcare, 4=Media, 5=Technology)"),
         Field(name="job_level", dtype=Int64, description="Job level (1=Entry, 2=Mid, 3=Senior)"),
         Field(name="monthly_income", dtype=Int64, description="Monthly income"),
         Field(name="years_at_company", dtype=Int64, description="Years at company"),
@@ -56,9 +56,9 @@ employee_features = FeatureView(
         # Company & satisfaction
         Field(name="company_size", dtype=Int64, description="Company size (1=Small, 2=Medium, 3=Large)"),
         Field(name="company_reputation", dtype=Int64, description="Company reputation (1=Poor to 4=Excellent)"),
-        Field(name="job_satisfaction", dtype=Int64, description="Job satisfaction (1=Low to 3=High)"),
-        Field(name="performance_rating", dtype=Int64, description="Performance (1=Low, 2=Avg, 3=High)"),
-        Field(name="employee_recognition", dtype=Int64, description="Recognition (1=Low to 3=High)"),
+        Field(name="job_satisfaction", dtype=Int64, description="Job satisfaction (1=Low to 4=Very High)"),
+        Field(name="performance_rating", dtype=Int64, description="Performance (1=Low, 2=Below Avg, 3=Avg, 4=High)"),
+        Field(name="employee_recognition", dtype=Int64, description="Recognition (1=Low to 4=Very High)"),
         
         # Opportunities
         Field(name="leadership_opportunities", dtype=Int64, description="Leadership opportunities (0=No, 1=Yes)"),
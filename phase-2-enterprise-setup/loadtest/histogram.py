@@ -0,0 +1,87 @@
+"""HdrHistogram-style latency histogram.
+
+Values are recorded in integer microseconds. Values below 128 µs get one
+bucket each. Above that, each power of two is split into 64 buckets, so a
+reported percentile is within 1.6% of the true value. Memory stays bounded
+no matter how many samples are recorded: about 64 buckets per doubling, so
+a few thousand buckets even for hour-long tails.
+"""
+import math
+
+SUB_BITS = 7
+_EXACT = 1 << SUB_BITS        # values below this are exact
+_HALF = 1 << (SUB_BITS - 1)   # buckets per power of two above that
+
+
+def _index(value: int) -> int:
+    if value < _EXACT:
+        return value
+    shift = value.bit_length() - SUB_BITS
+    return shift * _HALF + (value >> shift)
+
+
+def _bounds(index: int) -> tuple:
+    """Lowest and highest value that map to ``index``."""
+    if index < _EXACT:
+        return index, index
+    shift = index // _HALF - 1
+    mantissa = index - shift * _HALF
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = {}   # bucket index -> count
+        self.total = 0
+        self.sum_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def record(self, seconds: float):
+        value = max(0, int(seconds * 1e6))
+        index = _index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.sum_us += value
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+        self.max_us = max(self.max_us, value)
+
+    def merge(self, other: "Histogram"):
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.total += other.total
+        self.sum_us += other.sum_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, p: float) -> float:
+        """Value at percentile ``p`` (0-100) in ms: the highest value of its bucket."""
+        if not self.total:
+            return 0.0
+        rank = max(1, math.ceil(p / 100 * self.total))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(_bounds(index)[1], self.max_us) / 1000
+        return self.max_us / 1000
+
+    def summary(self) -> dict:
+        """min / mean / percentiles / max, in ms."""
+        if not self.total:
+            return {}
+        out = {"min": self.min_us / 1000, "mean": round(self.sum_us / self.total / 1000, 3)}
+        for p in (50, 90, 95, 99, 99.9):
+            out[f"p{p:g}"] = self.percentile(p)
+        out["max"] = self.max_us / 1000
+        return out
+
+    def buckets(self, per_decade: int = 10) -> list:
+        """Coarse ``[upper bound ms, count]`` pairs (log-spaced) for plotting."""
+        out = {}
+        for index, n in self.counts.items():
+            upper_us = max(_bounds(index)[1], 1)
+            edge = 10 ** (math.ceil(math.log10(upper_us) * per_decade) / per_decade) / 1000
+            out[edge] = out.get(edge, 0) + n
+        return [[round(edge, 4), out[edge]] for edge in sorted(out)]
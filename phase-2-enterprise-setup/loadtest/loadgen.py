@@ -0,0 +1,230 @@
+"""Load generator for the Feast online store, the inference service and the frontend.
+
+Two modes:
+
+* closed loop (``--concurrency N``): N workers each send a request as soon as
+  the previous one returns. This finds the maximum throughput.
+* open loop (``--rate R``): requests start on a fixed schedule (constant or
+  Poisson arrivals) whether or not earlier ones have returned. Latency is
+  measured from the *scheduled* start, so time spent queued behind a slow
+  response counts (no coordinated omission). This is the mode for "what
+  does p99 look like at 500 req/s".
+
+Results from the ``--warmup`` period are discarded. Latencies go into an
+HdrHistogram-style histogram. The report lists throughput, error counts
+by kind and latency percentiles, printed as Markdown and optionally saved
+as JSON / Markdown.
+
+Run from phase-2-enterprise-setup/:
+    python -m loadtest.loadgen inference --url http://localhost:8080 --concurrency 32 --duration 30
+    python -m loadtest.loadgen feast --url http://<NODE-IP>:30566 --rate 200 --duration 60
+    python -m loadtest.loadgen inference --stand-in --rate 1000          # no cluster needed
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from loadtest import standin
+from loadtest.client import ConnectionPool, HTTPError
+from loadtest.histogram import Histogram
+from loadtest.scenarios import SCENARIOS, encoded_bodies
+
+
+@dataclass
+class Result:
+    histogram: Histogram = field(default_factory=Histogram)
+    errors: Counter = field(default_factory=Counter)
+    completed: int = 0
+    dropped: int = 0
+    measured_s: float = 0.0
+
+
+class Runner:
+    def __init__(self, pool: ConnectionPool, requests: list, duration: float, warmup: float, timeout: float):
+        self.pool = pool
+        self.requests = itertools.cycle(requests)
+        self.duration = duration
+        self.warmup = warmup
+        self.timeout = timeout
+        self.result = Result()
+        self.loop = asyncio.get_running_loop()
+
+    def _start(self) -> float:
+        now = self.loop.time()
+        self.measure_from = now + self.warmup
+        self.end = self.measure_from + self.duration
+        return now
+
+    async def _one(self, scheduled: float):
+        error = None
+        try:
+            status, _ = await self.pool.request(next(self.requests), self.timeout)
+            if status >= 400:
+                error = f"HTTP {status}"
+        except asyncio.TimeoutError:
+            error = "timeout"
+        except (OSError, HTTPError, asyncio.IncompleteReadError, ValueError) as e:
+            error = type(e).__name__
+        done = self.loop.time()
+
+        if scheduled < self.measure_from or scheduled >= self.end:
+            return
+        if error is None:
+            self.result.completed += 1
+            self.result.histogram.record(done - scheduled)
+        else:
+            self.result.errors[error] += 1
+
+    async def closed_loop(self, concurrency: int) -> Result:
+        self._start()
+
+        async def worker():
+            while (now := self.loop.time()) < self.end:
+                await self._one(now)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        self.result.measured_s = self.duration
+        return self.result
+
+    async def open_loop(self, rate: float, poisson: bool, max_in_flight: int, seed: int = 1) -> Result:
+        rng = random.Random(seed)
+        scheduled = self._start()
+        in_flight = set()
+
+        while True:
+            scheduled += rng.expovariate(rate) if poisson else 1 / rate
+            if scheduled >= self.end:
+                break
+            delay = scheduled - self.loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= max_in_flight:
+                # the target has fallen this far behind; count it rather than queue forever
+                if scheduled >= self.measure_from:
+                    self.result.dropped += 1
+                continue
+            task = asyncio.ensure_future(self._one(scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+
+        if in_flight:
+            await asyncio.wait(in_flight)
+        self.result.measured_s = self.duration
+        return self.result
+
+
+# ------------------------------------------------------------
+# Reporting
+# ------------------------------------------------------------
+def build_report(args, url: str, result: Result) -> dict:
+    failed = sum(result.errors.values()) + result.dropped
+    attempted = result.completed + failed
+    return {
+        "scenario":       args.scenario,
+        "url":            url + SCENARIOS[args.scenario].path,
+        "mode":           "open" if args.rate else "closed",
+        "rate":           args.rate,
+        "arrival":        ("poisson" if args.poisson else "constant") if args.rate else None,
+        "concurrency":    None if args.rate else args.concurrency,
+        "connections":    args.connections,
+        "warmup_s":       args.warmup,
+        "duration_s":     result.measured_s,
+        "requests":       attempted,
+        "completed":      result.completed,
+        "throughput_rps": round(result.completed / result.measured_s, 1) if result.measured_s else 0.0,
+        "errors":         dict(result.errors, **({"dropped": result.dropped} if result.dropped else {})),
+        "error_rate":     round(failed / attempted, 5) if attempted else 0.0,
+        "latency_ms":     result.histogram.summary(),
+        "histogram_ms":   result.histogram.buckets(),
+        "generated_at":   time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def to_markdown(report: dict) -> str:
+    load = (f"{report['rate']:g} req/s open loop ({report['arrival']} arrivals)" if report["mode"] == "open"
+            else f"{report['concurrency']} concurrent clients (closed loop)")
+    lines = [
+        f"### {report['scenario']}: `POST {report['url']}`",
+        "",
+        f"{load}, {report['connections']} connections, {report['duration_s']:g} s after {report['warmup_s']:g} s warm-up",
+        "",
+        "| Requests | Throughput | Error rate | " + " | ".join(report["latency_ms"]) + " |",
+        "|---|---|---|" + "---|" * len(report["latency_ms"]),
+        f"| {report['requests']:,} | {report['throughput_rps']:,.1f} req/s | {report['error_rate']:.2%} | "
+        + " | ".join(f"{v:.2f} ms" for v in report["latency_ms"].values()) + " |",
+    ]
+    if report["errors"]:
+        lines += ["", "Errors: " + ", ".join(f"{kind} × {n}" for kind, n in sorted(report["errors"].items()))]
+    return "\n".join(lines) + "\n"
+
+
+# ------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------
+async def main(args) -> dict:
+    scenario = SCENARIOS[args.scenario]
+    stand_in = None
+    url = args.url or scenario.default_url
+    if args.stand_in:
+        stand_in = standin.StandIn(args.stand_in_latency_ms)
+        url = await stand_in.start()
+
+    pool = ConnectionPool(url, args.connections)
+    requests = [pool.encode("POST", scenario.path, body) for body in encoded_bodies(scenario)]
+    runner = Runner(pool, requests, args.duration, args.warmup, args.timeout)
+    try:
+        if args.rate:
+            result = await runner.open_loop(args.rate, args.poisson, args.max_in_flight)
+        else:
+            result = await runner.closed_loop(args.concurrency)
+    finally:
+        pool.close()
+        if stand_in is not None:
+            await stand_in.stop()
+    return build_report(args, url, result)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("scenario", choices=sorted(SCENARIOS))
+    parser.add_argument("--url", help="base URL of the target (default: the scenario's localhost port)")
+    parser.add_argument("--concurrency", type=int, default=16, help="closed loop: concurrent clients")
+    parser.add_argument("--rate", type=float, help="open loop: requests started per second")
+    parser.add_argument("--poisson", action="store_true", help="open loop: Poisson instead of evenly spaced arrivals")
+    parser.add_argument("--connections", type=int, help="keep-alive connections (default: --concurrency, or 64 in open loop)")
+    parser.add_argument("--max-in-flight", type=int, default=10000, help="open loop: drop arrivals beyond this backlog")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds of load before measuring")
+    parser.add_argument("--timeout", type=float, default=10.0, help="per-request timeout in seconds")
+    parser.add_argument("--stand-in", action="store_true", help="target an in-process stand-in server instead of --url")
+    parser.add_argument("--stand-in-latency-ms", type=float, default=0.0, help="service time of the stand-in")
+    parser.add_argument("--json", help="write the report as JSON to this file")
+    parser.add_argument("--markdown", help="write the report as Markdown to this file")
+    parser.add_argument("--max-error-rate", type=float, help="exit with status 1 if the error rate is higher")
+    args = parser.parse_args(argv)
+    if args.connections is None:
+        args.connections = 64 if args.rate else args.concurrency
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(main(args))
+
+    markdown = to_markdown(report)
+    print(markdown)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.markdown:
+        with open(args.markdown, "w") as f:
+            f.write(markdown)
+
+    if args.max_error_rate is not None and report["error_rate"] > args.max_error_rate:
+        sys.exit(1)
@@ -0,0 +1,88 @@
+"""Request mixes for the services this repo deploys.
+
+Each scenario names a path and a body factory. Bodies are encoded up front
+by the runner (one pool per scenario), so the timed loop does no JSON work.
+"""
+import json
+import random
+from dataclasses import dataclass
+from typing import Callable
+
+# Same features the Feast smoke test reads
+FEAST_FEATURES = [
+    "employee_features:age",
+    "employee_features:job_satisfaction",
+    "employee_features:work_life_balance",
+    "employee_features:overtime",
+]
+FEAST_EMPLOYEE_IDS = [8410, 28098, 30257]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    path: str
+    default_url: str
+    body: Callable[[random.Random], dict]
+
+
+def feast_body(rng: random.Random) -> dict:
+    return {
+        "features": FEAST_FEATURES,
+        "entities": {"employee_id": rng.sample(FEAST_EMPLOYEE_IDS, k=len(FEAST_EMPLOYEE_IDS))},
+    }
+
+
+def predict_body(rng: random.Random) -> dict:
+    """One EmployeeFeatures record for the inference service's POST /predict."""
+    yac = round(rng.uniform(0, 10), 2)
+    return {
+        "years_at_company":     yac,
+        "performance_rating":   rng.randint(1, 4),
+        "no_of_promotions":     rng.randint(0, 4),
+        "overtime":             rng.randint(0, 1),
+        "edu_level":            rng.randint(1, 5),
+        "no_of_dependents":     rng.randint(0, 6),
+        "job_level":            rng.randint(1, 3),
+        "company_size":         rng.randint(1, 3),
+        "company_tenure":       round(yac + rng.uniform(0, 10), 2),
+        "remote_work":          rng.randint(0, 1),
+        "company_reputation":   rng.randint(1, 4),
+        "overall_satisfaction": rng.randint(1, 4),
+        "opportunities":        rng.randint(0, 2),
+        "annual_income":        rng.randint(0, 4),
+        "age_group":            rng.randint(1, 5),
+    }
+
+
+# frontend form field -> inference field
+_FORM_FIELDS = {
+    "Years at Company": "years_at_company", "Performance Rating": "performance_rating",
+    "Number of Promotions": "no_of_promotions", "Overtime": "overtime",
+    "Education Level": "edu_level", "Number of Dependents": "no_of_dependents",
+    "Job Level": "job_level", "Company Size": "company_size",
+    "Company Tenure": "company_tenure", "Remote Work": "remote_work",
+    "Company Reputation": "company_reputation", "OverallSatisfaction": "overall_satisfaction",
+    "Opportunities": "opportunities", "AnnualIncome": "annual_income", "AgeGroup": "age_group",
+}
+
+
+def frontend_body(rng: random.Random) -> dict:
+    """The JSON the frontend's form script posts to Flask's /predict."""
+    record = predict_body(rng)
+    return {form: record[field] for form, field in _FORM_FIELDS.items()}
+
+
+SCENARIOS = {
+    s.name: s for s in (
+        Scenario("feast",     "/get-online-features", "http://localhost:6566", feast_body),
+        Scenario("inference", "/predict",             "http://localhost:8080", predict_body),
+        Scenario("frontend",  "/predict",             "http://localhost:5000", frontend_body),
+    )
+}
+
+
+def encoded_bodies(scenario: Scenario, n: int = 256, seed: int = 42) -> list:
+    """A fixed pool of distinct request bodies, cycled through during a run."""
+    rng = random.Random(seed)
+    return [json.dumps(scenario.body(rng)).encode() for _ in range(n)]
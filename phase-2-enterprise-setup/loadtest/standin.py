@@ -0,0 +1,83 @@
+"""In-process stand-in for the Feast, inference and frontend endpoints.
+
+It is a keep-alive HTTP/1.1 server on asyncio streams that answers each
+scenario path with a canned response of the right shape, after an optional
+fixed service time. Use it to check the generator and the report without a
+cluster, and to find the generator's own ceiling. It runs on the same event
+loop as the generator, so the two share one core.
+"""
+import asyncio
+import json
+
+_PREDICTION = {"prediction": 0, "p_leave": 0.3415, "p_stay": 0.6585, "risk": "LOW",
+               "threshold": 0.5, "model_version": "stand-in"}
+_FEATURES = {
+    "metadata": {"feature_names": ["employee_id", "age", "job_satisfaction", "work_life_balance", "overtime"]},
+    "results": [{"values": [8410, 28098, 30257], "statuses": ["PRESENT"] * 3}] * 5,
+}
+RESPONSES = {
+    "/predict":             json.dumps(_PREDICTION).encode(),
+    "/get-online-features": json.dumps(_FEATURES).encode(),
+}
+
+
+def _response(status: int, body: bytes) -> bytes:
+    reason = {200: "OK", 404: "Not Found"}[status]
+    return (
+        f"HTTP/1.1 {status} {reason}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+
+
+async def _serve(reader, writer, service_s: float):
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            path = line.split(b" ")[1].decode()
+            length = 0
+            while (header := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = header.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+
+            if service_s:
+                await asyncio.sleep(service_s)
+            body = RESPONSES.get(path)
+            writer.write(_response(200, body) if body is not None else _response(404, b'{"detail":"Not Found"}'))
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+class StandIn:
+    """Owns the server and its connection handlers so ``stop`` can drain them."""
+
+    def __init__(self, service_ms: float = 0.0):
+        self.service_s = service_ms / 1000
+        self.server = None
+        self.url = None
+        self._handlers = set()
+
+    def _accept(self, reader, writer):
+        task = asyncio.ensure_future(_serve(reader, writer, self.service_s))
+        self._handlers.add(task)
+        task.add_done_callback(self._handlers.discard)
+
+    async def start(self, host: str = "127.0.0.1") -> str:
+        """Listen on an ephemeral port; returns the base URL."""
+        self.server = await asyncio.start_server(self._accept, host, 0)
+        self.url = f"http://{host}:{self.server.sockets[0].getsockname()[1]}"
+        return self.url
+
+    async def stop(self):
+        self.server.close()
+        # clients have closed their connections by now; let the handlers see EOF
+        if self._handlers:
+            await asyncio.wait(self._handlers, timeout=1)
+        for task in self._handlers:
+            task.cancel()